@@ -5,21 +5,101 @@ Loads and integrates components from various sources and formats
 
 import os
 import json
+import time
 import importlib
-from typing import Dict, List, Any, Optional, Union
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Union, Hashable
 from pathlib import Path
 from dataclasses import asdict
 
 from component_library import ComponentLibrary, ComponentInfo
 from core.components import BaseComponent, ComponentFactory
 
+DEFAULT_CACHE_SIZE = 256
+
+def _freeze(value: Any) -> Hashable:
+    """Hashable, order-independent form of a kwargs value - TypeError if it has none"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    hash(value)
+    return value
+
+class PrototypeCache:
+    """Bounded LRU of prototype components keyed by (name, kwargs)
+
+    Requests whose kwargs can't be frozen get no key and bypass the cache.
+    """
+    
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: 'OrderedDict[Hashable, BaseComponent]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.uncacheable = 0
+        
+    @staticmethod
+    def make_key(component_name: str, kwargs: Dict[str, Any]) -> Optional[Hashable]:
+        try:
+            return (component_name, tuple(sorted((key, _freeze(value)) for key, value in kwargs.items())))
+        except TypeError:
+            return None  # unhashable kwargs value
+        
+    def get(self, key: Optional[Hashable]) -> Optional[BaseComponent]:
+        if key is None:
+            self.uncacheable += 1
+            return None
+        component = self._entries.get(key)
+        if component is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return component
+        
+    def put(self, key: Optional[Hashable], component: BaseComponent):
+        if key is None:
+            return
+        self._entries[key] = component
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+            
+    def resize(self, max_size: int):
+        self.max_size = max_size
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+            
+    def clear(self):
+        self._entries.clear()
+        
+    def reset_statistics(self):
+        self.hits = self.misses = self.evictions = self.uncacheable = 0
+        
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+        
+    def __len__(self) -> int:
+        return len(self._entries)
+        
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
 class ComponentLoader:
     """Loads components from various sources"""
     
-    def __init__(self, component_library: ComponentLibrary):
+    def __init__(self, component_library: ComponentLibrary, cache_size: int = DEFAULT_CACHE_SIZE):
         self.library = component_library
         self.loaded_modules = {}
-        self.component_cache = {}
+        self.component_cache = PrototypeCache(cache_size)  # one prototype per (name, kwargs)
         
     def load_from_directory(self, directory: str) -> List[ComponentInfo]:
         """Load all components from a directory"""
@@ -159,10 +239,10 @@ class ComponentLoader:
     def create_component_instance(self, component_name: str, **kwargs) -> Optional[BaseComponent]:
         """Create an instance of a component"""
         # Check cache first
-        cache_key = f"{component_name}_{hash(str(sorted(kwargs.items())))}"
-        if cache_key in self.component_cache:
+        cache_key = PrototypeCache.make_key(component_name, kwargs)
+        cached = self.component_cache.get(cache_key)
+        if cached is not None:
             # Return a copy of cached component
-            cached = self.component_cache[cache_key]
             return self._clone_component(cached)
             
         # Get component info
@@ -180,15 +260,15 @@ class ComponentLoader:
             )
             
             if component:
-                # Cache the component
-                self.component_cache[cache_key] = component
+                # Cache the component as the prototype for later clones
+                self.component_cache.put(cache_key, self._make_prototype(component))
                 return self._clone_component(component)
                 
             # If factory creation failed, try direct class loading
             component_class = self.library.load_component_class(component_name)
             if component_class:
                 component = component_class(component_info.category, component_name, **kwargs)
-                self.component_cache[cache_key] = component
+                self.component_cache.put(cache_key, self._make_prototype(component))
                 return self._clone_component(component)
                 
         except Exception as e:
@@ -196,15 +276,33 @@ class ComponentLoader:
             
         return None
         
+    @staticmethod
+    def _make_prototype(component: BaseComponent) -> BaseComponent:
+        """Fold built ports into a shared pin table so clones don't copy port records
+
+        A part whose ports can't be folded is cached as built - clones then
+        copy its port records instead.
+        """
+        if component.port_count:
+            try:
+                component.load_pin_table(component.get_pin_table())
+            except Exception as e:
+                print(f"⚠️ Could not share the pin table of {component.name}: {e}")
+        return component
+        
     def _clone_component(self, component: BaseComponent) -> BaseComponent:
         """Create a copy of a component"""
-        # This is a simplified clone - in practice you'd want a proper deep copy
+        # Structural copy - shares the definition and pin table, copies mutable state
+        try:
+            return component.clone()
+        except Exception as e:
+            print(f"⚠️ Fast clone of {component.name} failed, rebuilding: {e}")
         try:
+            # Fallback: round trip through the saved form
             component_data = component.to_dict()
-            cloned = ComponentFactory.create_from_dict(component_data)
-            return cloned
-        except:
-            # Fallback: create new instance
+            return ComponentFactory.create_from_dict(component_data)
+        except Exception:
+            # Last resort: create new instance
             return ComponentFactory.create_component(
                 component.component_type,
                 component.name
@@ -317,6 +415,11 @@ class ComponentLoader:
         """Get loading statistics"""
         return {
             'cached_components': len(self.component_cache),
+            'cache_capacity': self.component_cache.max_size,
+            'cache_hits': self.component_cache.hits,
+            'cache_misses': self.component_cache.misses,
+            'cache_evictions': self.component_cache.evictions,
+            'cache_uncacheable': self.component_cache.uncacheable,
             'loaded_modules': len(self.loaded_modules),
             'total_components': len(self.library.components),
             'cache_hit_rate': self._calculate_cache_hit_rate()
@@ -324,8 +427,7 @@ class ComponentLoader:
         
     def _calculate_cache_hit_rate(self) -> float:
         """Calculate cache hit rate"""
-        # This would need proper tracking in a real implementation
-        return 0.0
+        return self.component_cache.hit_rate
         
     def clear_cache(self):
         """Clear all caches"""
@@ -361,6 +463,24 @@ def create_component(name: str, **kwargs):
     loader = ComponentLoader(component_library)
     return loader.create_component_instance(name, **kwargs)
 
+def benchmark_clone(count: int = 2000, pins: int = 40) -> Dict[str, float]:
+    """Clones per second - old to_dict/create_from_dict round trip vs prototype clone"""
+    prototype = ComponentFactory.create_component("processor", "Benchmark CPU")
+    for i in range(pins):
+        prototype.add_port(f"P{i}", i + 1)
+    prototype.properties['clock_speed'] = 3.5
+    ComponentLoader._make_prototype(prototype)
+    
+    results = {}
+    for label, clone in (('round_trip', lambda: ComponentFactory.create_from_dict(prototype.to_dict())),
+                         ('prototype', prototype.clone)):
+        clones = []
+        start = time.perf_counter()
+        for _ in range(count):
+            clones.append(clone())
+        results[label] = count / (time.perf_counter() - start)
+    return results
+
 # Global loader instance
 _global_loader = None
 
@@ -371,3 +491,10 @@ def get_global_loader():
         from component_library import component_library
         _global_loader = ComponentLoader(component_library)
     return _global_loader
+
+if __name__ == "__main__":
+    # Run with the apps directory on PYTHONPATH
+    results = benchmark_clone()
+    print(f"✓ to_dict round trip: {results['round_trip']:,.0f} clones/s")
+    print(f"✓ prototype clone:    {results['prototype']:,.0f} clones/s "
+          f"({results['prototype'] / results['round_trip']:.1f}x)")
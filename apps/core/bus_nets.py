@@ -0,0 +1,109 @@
+"""
+X-Seti - October18 2026 - Packed Bus Nets
+Pin group detection and bit-slice views over multi-bit nets
+"""
+#this goes in core/
+
+import re
+from typing import Dict, List, Any, Optional, Union
+
+_NUMBERED_PIN = re.compile(r'^(.*?)(\d+)$')
+_RANGE = re.compile(r'^\s*([A-Za-z_]*?)(\d+)\s*-\s*([A-Za-z_]*?)(\d+)\s*$')
+
+# Group prefixes that belong on the shared system buses
+ADDRESS_PREFIXES = ('A', 'AB', 'ADDR', 'ADDRESS')
+DATA_PREFIXES = ('D', 'DB', 'DATA')
+
+def find_pin_groups(names: List[str], min_width: int = 2) -> Dict[str, Dict[int, str]]:
+    """Contiguous numbered names by prefix - {'A': {1: 'A1', ... 23: 'A23'}}
+
+    Groups may start above 0 (the 68000 has no A0); the numbers are the bit
+    positions. Groups with gaps or fewer than min_width members are ignored.
+    """
+    groups: Dict[str, Dict[int, str]] = {}
+    for name in names:
+        match = _NUMBERED_PIN.match(name)
+        if match:
+            groups.setdefault(match.group(1), {})[int(match.group(2))] = name
+
+    result = {}
+    for prefix, members in groups.items():
+        low = min(members)
+        if len(members) >= min_width and sorted(members) == list(range(low, low + len(members))):
+            result[prefix] = members
+    return result
+
+def parse_bus_declaration(declaration: Union[str, List[str]]) -> Dict[int, str]:
+    """Explicit bus declaration - 'A0-A23' or a list of pin names LSB first"""
+    if isinstance(declaration, str):
+        match = _RANGE.match(declaration)
+        if not match:
+            raise ValueError(f"Bad bus declaration: {declaration}")
+        prefix, first, last = match.group(1), int(match.group(2)), int(match.group(4))
+        low, high = min(first, last), max(first, last)
+        return {bit: f"{prefix}{bit}" for bit in range(low, high + 1)}
+    return {bit: name for bit, name in enumerate(declaration)}
+
+def bus_role(prefix: str) -> Optional[str]:
+    """'address' / 'data' for prefixes that belong on the system buses"""
+    # 'CPU_D' / 'cpu.A' count by their last part
+    last = re.split(r'[_.]', prefix.upper().strip('_.'))[-1]
+    if last in ADDRESS_PREFIXES:
+        return 'address'
+    if last in DATA_PREFIXES:
+        return 'data'
+    return None
+
+CLOCK_PREFIXES = ('CLK', 'CLOCK', 'PHI', 'Φ', 'OSC', 'XTAL', 'XIN', 'EXTAL')
+
+def pin_role(name: str) -> str:
+    """'address', 'data', 'clock' or 'control' from a pin name"""
+    match = _NUMBERED_PIN.match(name)
+    if match:
+        role = bus_role(match.group(1))
+        if role:
+            return role
+    upper = name.upper().lstrip('/~!')
+    if upper.startswith(CLOCK_PREFIXES) or 'φ' in name:
+        return 'clock'
+    return 'control'
+
+def group_width(members: Dict[int, str]) -> int:
+    """Bits needed to hold the highest pin of a group"""
+    return max(members) + 1
+
+class NetSlice:
+    """A bit range of a packed net - reads and writes touch only those bits
+
+    Single pins of a bus are 1-bit slices, so per-pin access keeps working
+    while whole-bus transfers go straight to the net as one integer write.
+    """
+
+    __slots__ = ('net', 'lsb', 'width', 'mask')
+
+    def __init__(self, net, lsb: int, width: int = 1):
+        self.net = net
+        self.lsb = lsb
+        self.width = width
+        self.mask = (1 << width) - 1
+
+    @property
+    def name(self) -> str:
+        if self.width == 1:
+            return f"{self.net.name}[{self.lsb}]"
+        return f"{self.net.name}[{self.lsb + self.width - 1}:{self.lsb}]"
+
+    @property
+    def value(self) -> int:
+        return (self.net.value >> self.lsb) & self.mask
+
+    def set_value(self, value: int, timestamp: float):
+        net = self.net
+        cleared = net.value & ~(self.mask << self.lsb)
+        net.set_value(cleared | ((value & self.mask) << self.lsb), timestamp)
+
+    def has_changed(self) -> bool:
+        return ((self.net.value ^ self.net.previous_value) >> self.lsb) & self.mask != 0
+
+__all__ = ['find_pin_groups', 'parse_bus_declaration', 'bus_role', 'pin_role', 'group_width',
+           'NetSlice', 'ADDRESS_PREFIXES', 'DATA_PREFIXES', 'CLOCK_PREFIXES']
@@ -0,0 +1,256 @@
+"""
+X-Seti - October18 2026 - Change Journal
+Append-only write-ahead log of project edits with batched fsync and background compaction
+"""
+#this goes in core/
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Any, Optional
+
+from core.project_archive import PROJECT_EXTENSION
+
+JOURNAL_SUFFIX = ".journal"
+SEGMENT_SUFFIX = ".journal.1"  # journal being folded into the project file
+
+class ChangeJournal:
+    """Write-ahead journal kept next to a project file
+
+    Each edit is one JSON line. Lines are buffered and written + fsynced
+    together once batch_size records are waiting or batch_interval seconds
+    have passed (or on flush()/autosave), so a crash loses at most one batch
+    and a torn last line is simply ignored on replay.
+
+    When the journal of a PROJECT_EXTENSION project passes compact_bytes it
+    is renamed to a segment and a worker thread loads the project file into
+    a fresh ComponentManager, replays the segment, saves it atomically and
+    deletes the segment. The live manager is never touched off the GUI
+    thread. JSON projects don't store positions, so folding moves into
+    them would lose them - their journal is only replayed on load.
+
+    Records carry the resulting state (whole component, new position, new
+    property value), so replaying one twice - e.g. after a crash between
+    saving the project and deleting the segment - is harmless.
+    """
+
+    def __init__(self, project_file: str, batch_size: int = 64, batch_interval: float = 2.0,
+                 compact_bytes: int = 1 << 20):
+        self.project_file = project_file
+        self.path = project_file + JOURNAL_SUFFIX
+        self.segment_path = project_file + SEGMENT_SUFFIX
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.compact_bytes = compact_bytes
+        self.replaying = False
+        self._pending: List[str] = []
+        self._last_flush = time.monotonic()
+        self._file = None
+        self._lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+        self.stats = {'records': 0, 'flushes': 0, 'compactions': 0}
+
+    # Writing
+
+    def record(self, op: str, **data):
+        """Queue one edit - written with the next batch"""
+        if self.replaying:
+            return
+        data['op'] = op
+        self._pending.append(json.dumps(data, separators=(',', ':'), default=str))
+        self.stats['records'] += 1
+        if (len(self._pending) >= self.batch_size or
+                time.monotonic() - self._last_flush >= self.batch_interval):
+            self.flush()
+
+    def flush(self) -> bool:
+        """Write and fsync the pending batch - this is the autosave"""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return True
+        try:
+            with self._lock:
+                if self._file is None:
+                    self._file = open(self.path, 'a', encoding='utf-8')
+                self._file.write("\n".join(self._pending) + "\n")
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                size = self._file.tell()
+            self._pending.clear()
+            self.stats['flushes'] += 1
+        except OSError as e:
+            print(f"⚠️ Error writing change journal: {e}")
+            return False
+        if size >= self.compact_bytes:
+            self.compact()
+        return True
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def discard(self):
+        """Forget all journalled edits - after a full save of the project file"""
+        self._pending.clear()
+        self.wait()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            for path in (self.path, self.segment_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    @contextmanager
+    def paused(self):
+        """Don't journal changes made inside the block (loading, replaying)"""
+        previous = self.replaying
+        self.replaying = True
+        try:
+            yield self
+        finally:
+            self.replaying = previous
+
+    # Connection store observer - every add/remove path is journalled
+
+    def connection_added(self, record: Dict[str, Any]):
+        self.record('connect', connection=dict(record))
+
+    def connection_removed(self, record: Dict[str, Any]):
+        self.record('disconnect', id=record.get('id'))
+
+    def connections_cleared(self):
+        self.record('clear_connections')
+
+    # Compaction
+
+    def compact(self, wait: bool = False) -> bool:
+        """Fold the journal into the project file on a worker thread"""
+        if not self.project_file.endswith(PROJECT_EXTENSION):
+            return False
+        if self._compactor is not None and self._compactor.is_alive():
+            return False
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if not os.path.exists(self.path):
+                return False
+            if os.path.exists(self.segment_path):
+                # An earlier compaction did not finish - keep its records first
+                with open(self.segment_path, 'a', encoding='utf-8') as segment, \
+                        open(self.path, 'r', encoding='utf-8') as journal:
+                    segment.write(journal.read())
+                    segment.flush()
+                    os.fsync(segment.fileno())
+                os.remove(self.path)
+            else:
+                os.replace(self.path, self.segment_path)
+        self._compactor = threading.Thread(target=self._compact_segment, daemon=True,
+                                           name="journal-compactor")
+        self._compactor.start()
+        if wait:
+            self.wait()
+        return True
+
+    def wait(self):
+        if self._compactor is not None:
+            self._compactor.join()
+
+    def _compact_segment(self):
+        from core.components import ComponentManager
+        try:
+            manager = ComponentManager()
+            if os.path.exists(self.project_file):
+                manager.load_from_file(self.project_file, recover=False)
+            replay_file(self.segment_path, manager)
+            root, extension = os.path.splitext(self.project_file)
+            temp_file = f"{root}.compacting{extension}"
+            if not manager.save_to_file(temp_file):
+                return
+            os.replace(temp_file, self.project_file)
+            os.remove(self.segment_path)
+            self.stats['compactions'] += 1
+            print(f"✓ Compacted change journal into {self.project_file}")
+        except Exception as e:
+            print(f"⚠️ Error compacting change journal: {e}")
+
+    def get_status(self) -> Dict[str, Any]:
+        status = dict(self.stats)
+        status['pending'] = len(self._pending)
+        status['journal_bytes'] = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        status['compacting'] = self._compactor is not None and self._compactor.is_alive()
+        return status
+
+def _apply(record: Dict[str, Any], manager):
+    from core.components import ComponentFactory
+    op = record.get('op')
+    if op == 'add_component':
+        component = ComponentFactory.create_from_dict(record['component'])
+        if component is None:
+            return
+        manager.components[component.id] = component
+        if 'pos' in record and hasattr(component, 'setPos'):
+            component.setPos(*record['pos'][:2])
+            component.setRotation(record['pos'][2])
+    elif op == 'remove_component':
+        manager.components.pop(record['id'], None)
+        manager.connections.remove_component(record['id'])
+    elif op == 'move':
+        manager.ensure_geometry()  # the saved position must not overwrite this one later
+        component = manager.components.get(record['id'])
+        if component is not None and hasattr(component, 'setPos'):
+            component.setPos(record['x'], record['y'])
+            if record.get('rotation') is not None:
+                component.setRotation(record['rotation'])
+    elif op == 'set_property':
+        component = manager.components.get(record['id'])
+        if component is not None:
+            component.properties[record['key']] = record['value']
+    elif op == 'connect':
+        manager.connections.append(dict(record['connection']))
+    elif op == 'disconnect':
+        manager.connections.remove(record['id'])
+    elif op == 'clear_connections':
+        manager.connections.clear()
+    elif op == 'clear':
+        manager.components.clear()
+        manager.connections.clear()
+        manager.component_groups.clear()
+    elif op == 'groups':
+        manager.component_groups = record['groups']
+
+def replay_file(path: str, manager) -> int:
+    """Apply a journal file's records to a manager - stops at a torn last line"""
+    if not os.path.exists(path):
+        return 0
+    journal = getattr(manager, 'journal', None)
+    count = 0
+    with journal.paused() if journal is not None else nullcontext():
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    print(f"⚠️ Change journal {path} ends with an incomplete record - ignored")
+                    break
+                _apply(record, manager)
+                count += 1
+    if count:
+        manager.components_changed()
+    return count
+
+def recover(project_file: str, manager) -> int:
+    """Replay edits left behind by a crash or an unfinished compaction"""
+    count = replay_file(project_file + SEGMENT_SUFFIX, manager)
+    count += replay_file(project_file + JOURNAL_SUFFIX, manager)
+    if count:
+        print(f"✓ Recovered {count} journalled changes for {project_file}")
+    return count
+
+__all__ = ['ChangeJournal', 'replay_file', 'recover', 'JOURNAL_SUFFIX']
@@ -0,0 +1,207 @@
+"""
+X-Seti - October18 2026 - Component Definitions
+Shared immutable part definitions with per-instance overrides
+"""
+#this goes in core/
+
+import copy
+import json
+import weakref
+from collections import ChainMap
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional
+
+from core.pin_table import PinTable
+
+# Descriptive fields every placed instance of a part has in common
+DEFINITION_FIELDS = ('component_type', 'category', 'manufacturer', 'part_number', 'package_type',
+                     'pin_count', 'year', 'datasheet_url', 'image_path', 'width', 'height')
+
+FIELD_DEFAULTS = {
+    'category': "Unknown",
+    'manufacturer': "",
+    'part_number': "",
+    'package_type': "DIP",
+    'pin_count': 40,
+    'year': "",
+    'datasheet_url': "",
+    'image_path': "",
+    'width': 120,
+    'height': 80
+}
+
+_EMPTY = MappingProxyType({})
+
+# Definition values of these types can be changed in place, so instances get their own copy
+_MUTABLE_VALUES = (dict, list, set, bytearray)
+
+# Identical definitions are shared while any instance uses them
+_SHARED: 'weakref.WeakValueDictionary[tuple, ComponentDefinition]' = weakref.WeakValueDictionary()
+
+class ComponentDefinition:
+    """Immutable description of a part - placed components reference one of these
+
+    Eight 4116 DRAMs hold one definition (strings, pin table, default
+    properties) between them and keep only their id, name, position,
+    state and whatever they override themselves.
+    """
+
+    __slots__ = DEFINITION_FIELDS + ('pin_table', 'properties', '_key', '__weakref__')
+
+    def __init__(self, component_type: str, pin_table: Optional[PinTable] = None,
+                 properties: Optional[Dict[str, Any]] = None, **fields):
+        unknown = set(fields) - set(DEFINITION_FIELDS)
+        if unknown:
+            raise TypeError(f"Unknown definition fields: {', '.join(sorted(unknown))}")
+        setter = object.__setattr__
+        setter(self, 'component_type', component_type)
+        for name, default in FIELD_DEFAULTS.items():
+            setter(self, name, fields.get(name, default))
+        setter(self, 'pin_table', pin_table)
+        setter(self, 'properties', MappingProxyType(dict(properties)) if properties else _EMPTY)
+        setter(self, '_key', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ComponentDefinition is immutable - use derive()")
+
+    @classmethod
+    def shared(cls, component_type: str, pin_table: Optional[PinTable] = None,
+               properties: Optional[Dict[str, Any]] = None, **fields) -> 'ComponentDefinition':
+        """Definition with these values, reusing an identical one if it is still alive"""
+        key = cls._make_key(component_type, pin_table, properties, fields)
+        existing = _SHARED.get(key)
+        if existing is not None:
+            return existing
+        definition = cls(component_type, pin_table, properties, **fields)
+        object.__setattr__(definition, '_key', key)
+        _SHARED[key] = definition
+        return definition
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ComponentDefinition':
+        """From a saved component dict or a chipset-style entry with 'pins'"""
+        pins = data.get('ports', data.get('pins'))
+        return cls.shared(
+            data.get('component_type', 'base'),
+            PinTable.from_pin_dicts(pins) if pins is not None else None,
+            data.get('properties'),
+            **{name: data[name] for name in FIELD_DEFAULTS if name in data}
+        )
+
+    @staticmethod
+    def _make_key(component_type: str, pin_table: Optional[PinTable],
+                  properties: Optional[Dict[str, Any]], fields: Dict[str, Any]) -> tuple:
+        # Pin tables are shared already, so identity is enough (the definition keeps it alive)
+        values = tuple(fields.get(name, default) for name, default in FIELD_DEFAULTS.items())
+        if not properties:
+            frozen = None
+        else:
+            try:
+                frozen = tuple(sorted(properties.items()))
+                hash(frozen)
+            except TypeError:
+                try:
+                    frozen = json.dumps(dict(properties), sort_keys=True, default=str)
+                except TypeError:
+                    frozen = object()  # unorderable values - never shared
+        return (component_type, values, id(pin_table), frozen)
+
+    def key(self) -> tuple:
+        if self._key is None:
+            fields = {name: getattr(self, name) for name in FIELD_DEFAULTS}
+            object.__setattr__(self, '_key', self._make_key(self.component_type, self.pin_table,
+                                                            self.properties, fields))
+        return self._key
+
+    def derive(self, pin_table: Optional[PinTable] = None,
+               properties: Optional[Dict[str, Any]] = None, **changes) -> 'ComponentDefinition':
+        """Shared definition that differs from this one in the given values"""
+        fields = {name: getattr(self, name) for name in FIELD_DEFAULTS}
+        fields.update(changes)
+        component_type = fields.pop('component_type', self.component_type)
+        return self.shared(component_type, pin_table if pin_table is not None else self.pin_table,
+                           properties if properties is not None else self.properties, **fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {name: getattr(self, name) for name in DEFINITION_FIELDS}
+        data['properties'] = dict(self.properties)
+        data['ports'] = self.pin_table.to_dicts() if self.pin_table is not None else []
+        return data
+
+    def instantiate(self, name: Optional[str] = None, component_id: Optional[str] = None, factory=None):
+        """New component of the registered class for component_type using this definition"""
+        if factory is None:
+            from core.components import ComponentFactory
+            factory = ComponentFactory
+        component = factory.create_component(self.component_type, name)
+        component.use_definition(self)
+        if component_id:
+            component.id = component_id
+        return component
+
+class DefinitionField:
+    """Instance attribute read from the component's definition until it is assigned"""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, component, owner=None):
+        if component is None:
+            return self
+        overrides = component._overrides
+        if overrides and self.name in overrides:
+            return overrides[self.name]
+        return getattr(component.definition, self.name)
+
+    def __set__(self, component, value):
+        overrides = component._overrides
+        if value == getattr(component.definition, self.name):
+            if overrides:
+                overrides.pop(self.name, None)
+            return
+        if overrides is None:
+            overrides = component._overrides = {}
+        overrides[self.name] = value
+
+class PropertyOverlay(ChainMap):
+    """Component properties - writes go to the instance, reads fall through to the definition
+
+    A nested dict or list read from the definition is copied into the instance
+    first, so changing it in place never reaches the parts sharing the definition.
+    """
+
+    def __getitem__(self, key):
+        instance = self.maps[0]
+        if key in instance:
+            return instance[key]
+        value = super().__getitem__(key)
+        if isinstance(value, _MUTABLE_VALUES):
+            value = instance[key] = copy.deepcopy(value)
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def copy(self) -> Dict[str, Any]:
+        """Plain dict snapshot (json-friendly, like the old properties dict)
+
+        Read straight from the maps so a snapshot doesn't copy definition values in.
+        """
+        result = {}
+        for values in reversed(self.maps):
+            result.update(values)
+        return result
+
+    __copy__ = copy
+
+    @property
+    def overrides(self) -> Dict[str, Any]:
+        """Values this instance has changed - nested copies still equal to the definition don't count"""
+        instance = self.maps[0]
+        if len(self.maps) == 1:
+            return instance
+        parent = ChainMap(*self.maps[1:])
+        return {key: value for key, value in instance.items()
+                if key not in parent or parent[key] != value}
+
+__all__ = ['ComponentDefinition', 'DefinitionField', 'PropertyOverlay', 'DEFINITION_FIELDS']
@@ -0,0 +1,412 @@
+"""
+X-Seti - October18 2026 - Component Fuzzer
+Coverage-guided pin fuzzing of single component behaviour models outside the GUI
+
+Crashing sequences are saved as JSON cases under fuzz_regressions/ and
+replayed with --check - they are fuzzer data, not unit tests.
+"""
+#this goes in core/
+
+import os
+import sys
+import json
+import random
+import hashlib
+import inspect
+import importlib
+import traceback
+import multiprocessing
+from typing import Dict, List, Any, Optional, Tuple, Set
+
+from core.components import BaseComponent, ComponentFactory
+from core.simulation import Signal
+
+# A sequence is a list of steps: [cycles to run, {pin: value}]
+Step = List[Any]
+
+REGRESSION_VERSION = 1
+
+def load_component_class(spec: str) -> type:
+    """'package.module:ClassName' or a type registered with ComponentFactory"""
+    if ':' in spec:
+        module_name, class_name = spec.split(':', 1)
+        return getattr(importlib.import_module(module_name), class_name)
+    registry = ComponentFactory._component_registry
+    if spec not in registry:
+        raise ValueError(f"Unknown component: {spec}")
+    return registry[spec]
+
+def create_component(spec: str) -> BaseComponent:
+    component_class = load_component_class(spec)
+    if ':' not in spec:
+        return ComponentFactory.create_component(spec)
+    try:
+        return component_class()
+    except TypeError:
+        return component_class(component_class.__name__.lower())
+
+def _class_code(klass: type) -> List[Any]:
+    """Code objects of the methods defined in a class body"""
+    codes = []
+    for value in vars(klass).values():
+        if isinstance(value, (staticmethod, classmethod)):
+            value = value.__func__
+        functions = (value.fget, value.fset, value.fdel) if isinstance(value, property) else (value,)
+        for function in functions:
+            code = getattr(inspect.unwrap(function), '__code__', None) if function else None
+            if code is not None:
+                codes.append(code)
+    return codes
+
+def model_code(component_class: type) -> Set[Any]:
+    """Code objects of the model's own classes - what coverage is measured over
+
+    Only the class bodies between the model and BaseComponent count (with
+    nested functions and comprehensions), not the rest of their files. A
+    plain BaseComponent is measured over BaseComponent itself.
+    """
+    codes = []
+    for klass in component_class.__mro__:
+        if klass is BaseComponent:
+            break
+        codes.extend(_class_code(klass))
+    if not codes:
+        codes = _class_code(BaseComponent)
+    found = set()
+    while codes:
+        code = codes.pop()
+        if code not in found:
+            found.add(code)
+            codes.extend(const for const in code.co_consts if inspect.iscode(const))
+    return found
+
+class FuzzBench:
+    """Stand-in for the engine's signal API around one component
+
+    Pins are signals named like the engine's - f"{component.id}_{port}" - and
+    the bench sets component.engine to itself, as SimulationEngine does when
+    it connects the component. Each cycle calls simulate_step(cycle) if the
+    model defines it.
+    """
+
+    def __init__(self, component: BaseComponent):
+        self.component = component
+        self.current_cycle = 0
+        self.simulation_time = 0.0
+        self.signals: Dict[str, Signal] = {}
+        for port in component.ports:
+            self.create_signal(f"{component.id}_{port.name}")
+        component.engine = self
+
+    def create_signal(self, name: str, bit_width: int = 1) -> Signal:
+        signal = Signal(name, bit_width)
+        self.signals[name] = signal
+        return signal
+
+    def get_signal_value(self, signal_name: str) -> Optional[int]:
+        signal = self.signals.get(signal_name)
+        return signal.value if signal else None
+
+    def set_signal_value(self, signal_name: str, value: int, source: str = "manual"):
+        signal = self.signals.get(signal_name)
+        if signal:
+            signal.set_value(value, self.simulation_time)
+
+    def emit_event(self, event_type: str, data: Any = None):
+        pass
+
+    def check_pc_trap(self, cpu) -> bool:
+        return False
+
+    def drive(self, pins: Dict[str, int]):
+        for pin, value in pins.items():
+            self.set_signal_value(f"{self.component.id}_{pin}", value)
+
+    def run(self, cycles: int):
+        step = getattr(self.component, 'simulate_step', None)
+        for _ in range(cycles):
+            if step:
+                step(self.current_cycle)
+            self.current_cycle += 1
+            self.simulation_time += 1e-6
+            # Honour sleep requests by simply continuing - the model must not care
+            self.component.sleep_request = None
+
+def drivable_pins(component: BaseComponent) -> List[str]:
+    """Inputs and bidirectional digital pins"""
+    return [port.name for port in component.ports
+            if port.direction in ('input', 'bidirectional') and port.signal_type == 'digital']
+
+def run_sequence(spec: str, sequence: List[Step], codes: Optional[Set[Any]] = None
+                 ) -> Tuple[Set[Tuple[str, int]], Optional[Dict[str, Any]]]:
+    """Run one sequence on a fresh component - returns (covered lines, crash or None)"""
+    lines: Set[Tuple[str, int]] = set()
+
+    def trace_lines(frame, event, arg):
+        if event == 'line':
+            lines.add((frame.f_code.co_filename, frame.f_lineno))
+        return trace_lines
+
+    def trace_calls(frame, event, arg):
+        if frame.f_code in codes:
+            return trace_lines
+        return None
+
+    crash = None
+    if codes:
+        sys.settrace(trace_calls)
+    try:
+        component = create_component(spec)
+        bench = FuzzBench(component)
+        if hasattr(component, 'reset'):
+            component.reset()
+        for cycles, pins in sequence:
+            bench.drive(pins)
+            bench.run(cycles)
+    except Exception as e:
+        crash = _crash_info(e)
+    finally:
+        if codes:
+            sys.settrace(None)
+    return lines, crash
+
+def _crash_info(error: Exception) -> Dict[str, Any]:
+    frames = traceback.extract_tb(error.__traceback__)
+    last = frames[-1] if frames else None
+    return {
+        'type': type(error).__name__,
+        'message': str(error),
+        'file': os.path.basename(last.filename) if last else "",
+        'line': last.lineno if last else 0,
+        'traceback': ''.join(traceback.format_exception(type(error), error, error.__traceback__))
+    }
+
+def crash_signature(crash: Dict[str, Any]) -> str:
+    """Exception type and raising line - sequences with the same signature are one bug"""
+    return f"{crash['type']}@{crash['file']}:{crash['line']}"
+
+class SequenceGenerator:
+    """Random and mutated pin sequences"""
+
+    def __init__(self, pins: List[str], seed: int, max_steps: int = 32, max_cycles: int = 4):
+        self.pins = pins
+        self.random = random.Random(seed)
+        self.max_steps = max_steps
+        self.max_cycles = max_cycles
+
+    def _pins(self) -> Dict[str, int]:
+        if not self.pins:
+            return {}
+        chosen = self.random.sample(self.pins, self.random.randint(1, min(4, len(self.pins))))
+        return {pin: self.random.randint(0, 1) for pin in chosen}
+
+    def _step(self) -> Step:
+        return [self.random.randint(1, self.max_cycles), self._pins()]
+
+    def generate(self) -> List[Step]:
+        return [self._step() for _ in range(self.random.randint(1, self.max_steps))]
+
+    def mutate(self, sequence: List[Step], corpus: List[List[Step]]) -> List[Step]:
+        result = [[cycles, dict(pins)] for cycles, pins in sequence]
+        for _ in range(self.random.randint(1, 3)):
+            operation = self.random.randrange(5)
+            index = self.random.randrange(len(result)) if result else 0
+            if operation == 0 or not result:
+                result.insert(index, self._step())
+            elif operation == 1 and len(result) > 1:
+                del result[index]
+            elif operation == 2 and self.pins:
+                pin = self.random.choice(self.pins)
+                result[index][1][pin] = 1 - result[index][1].get(pin, 0)
+            elif operation == 3:
+                result[index][0] = self.random.randint(1, self.max_cycles * 16)
+            elif corpus:
+                other = self.random.choice(corpus)
+                cut = self.random.randrange(len(other)) if other else 0
+                result = result[:index] + [[c, dict(p)] for c, p in other[cut:]]
+        return result[:self.max_steps * 2] or [self._step()]
+
+def _fuzz_worker(args) -> Dict[str, Any]:
+    """One seed - a coverage-guided loop of its own, results merged by the parent"""
+    spec, seed, iterations, max_steps = args
+    component = create_component(spec)
+    codes = model_code(type(component))
+    generator = SequenceGenerator(drivable_pins(component), seed, max_steps)
+
+    covered: Set[Tuple[str, int]] = set()
+    corpus: List[List[Step]] = []
+    crashes: Dict[str, Tuple[Dict[str, Any], List[Step]]] = {}
+    for iteration in range(iterations):
+        if corpus and generator.random.random() < 0.8:
+            sequence = generator.mutate(generator.random.choice(corpus), corpus)
+        else:
+            sequence = generator.generate()
+        lines, crash = run_sequence(spec, sequence, codes)
+        if lines - covered:
+            covered |= lines
+            corpus.append(sequence)
+        if crash:
+            signature = crash_signature(crash)
+            if signature not in crashes or len(sequence) < len(crashes[signature][1]):
+                crashes[signature] = (crash, sequence)
+    return {'seed': seed, 'covered': sorted(covered), 'corpus': corpus,
+            'crashes': {signature: [crash, sequence] for signature, (crash, sequence) in crashes.items()}}
+
+def minimize(spec: str, sequence: List[Step], signature: str, max_runs: int = 2000) -> List[Step]:
+    """Smallest sequence that still raises the same exception at the same line"""
+    runs = 0
+
+    def still_crashes(candidate: List[Step]) -> bool:
+        nonlocal runs
+        runs += 1
+        _, crash = run_sequence(spec, candidate)
+        return crash is not None and crash_signature(crash) == signature
+
+    current = [[cycles, dict(pins)] for cycles, pins in sequence]
+    # Drop whole steps, halving the chunk size as removals stop working
+    chunk = max(1, len(current) // 2)
+    while chunk >= 1 and runs < max_runs:
+        index = 0
+        removed = False
+        while index < len(current) and runs < max_runs:
+            candidate = current[:index] + current[index + chunk:]
+            if candidate and still_crashes(candidate):
+                current = candidate
+                removed = True
+            else:
+                index += chunk
+        if not removed:
+            chunk //= 2
+
+    # Then single pin writes and cycle counts
+    for step in current:
+        for pin in list(step[1]):
+            if runs >= max_runs:
+                break
+            value = step[1].pop(pin)
+            if not still_crashes(current):
+                step[1][pin] = value
+        while step[0] > 1 and runs < max_runs:
+            cycles = step[0]
+            step[0] = max(1, cycles // 2)
+            if not still_crashes(current):
+                step[0] = cycles
+                break
+    return current
+
+class ComponentFuzzer:
+    """Fuzzes one component spec over many seeds in a process pool"""
+
+    def __init__(self, spec: str, regression_dir: str = "fuzz_regressions"):
+        self.spec = spec
+        self.regression_dir = regression_dir
+        self.covered: Set[Tuple[str, int]] = set()
+        self.coverable = 0
+        self.crashes: Dict[str, Tuple[Dict[str, Any], List[Step]]] = {}
+        self.corpus_size = 0
+        self.runs = 0
+
+    @staticmethod
+    def _count_coverable(codes: Set[Any]) -> int:
+        """Lines with code in the measured class bodies - the coverage denominator"""
+        lines = set()
+        for code in codes:
+            # The def line itself only runs when the class is created
+            lines.update((code.co_filename, line) for _, _, line in code.co_lines()
+                         if line and line != code.co_firstlineno)
+        return len(lines)
+
+    def run(self, seeds: int = 8, iterations: int = 200, max_steps: int = 32,
+            workers: Optional[int] = None, minimize_crashes: bool = True) -> Dict[str, Any]:
+        """Fuzz, merge coverage and crashes, minimize and save regressions"""
+        jobs = [(self.spec, seed, iterations, max_steps) for seed in range(seeds)]
+        workers = workers or min(seeds, os.cpu_count() or 1)
+        if workers > 1:
+            with multiprocessing.Pool(workers) as pool:
+                results = pool.map(_fuzz_worker, jobs)
+        else:
+            results = [_fuzz_worker(job) for job in jobs]
+
+        for result in results:
+            self.covered.update(tuple(line) for line in result['covered'])
+            self.corpus_size += len(result['corpus'])
+            for signature, (crash, sequence) in result['crashes'].items():
+                if signature not in self.crashes or len(sequence) < len(self.crashes[signature][1]):
+                    self.crashes[signature] = (crash, sequence)
+        self.runs += seeds * iterations
+        self.coverable = self._count_coverable(model_code(type(create_component(self.spec))))
+
+        saved = []
+        for signature, (crash, sequence) in self.crashes.items():
+            if minimize_crashes:
+                sequence = minimize(self.spec, sequence, signature)
+                self.crashes[signature] = (crash, sequence)
+            path = self.save_regression(signature, crash, sequence)
+            if path:
+                saved.append(path)
+
+        report = self.get_report()
+        report['saved'] = saved
+        print(f"✓ Fuzzed {self.spec}: {report['runs']} runs, {report['lines_covered']} lines "
+              f"({report['coverage']:.0%}), {report['crashes']} unique crashes")
+        return report
+
+    def save_regression(self, signature: str, crash: Dict[str, Any], sequence: List[Step]) -> Optional[str]:
+        """Write a crashing sequence where check_regressions() will replay it"""
+        directory = os.path.join(self.regression_dir, self.spec.replace(':', '.'))
+        name = hashlib.sha1(signature.encode()).hexdigest()[:12]
+        path = os.path.join(directory, f"crash_{name}.json")
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump({'version': REGRESSION_VERSION, 'spec': self.spec, 'signature': signature,
+                           'message': crash['message'], 'sequence': sequence}, f, indent=1)
+            return path
+        except OSError as e:
+            print(f"⚠️ Could not save regression {path}: {e}")
+            return None
+
+    def get_report(self) -> Dict[str, Any]:
+        return {
+            'spec': self.spec,
+            'runs': self.runs,
+            'lines_covered': len(self.covered),
+            'coverable_lines': self.coverable,
+            'coverage': len(self.covered) / self.coverable if self.coverable else 0.0,
+            'corpus': self.corpus_size,
+            'crashes': len(self.crashes),
+            'signatures': sorted(self.crashes)
+        }
+
+def check_regressions(directory: str = "fuzz_regressions") -> List[Dict[str, Any]]:
+    """Replay saved crash sequences - returns the ones that still fail"""
+    failures = []
+    for root, _, names in os.walk(directory):
+        for name in sorted(names):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(root, name)
+            try:
+                with open(path, 'r') as f:
+                    case = json.load(f)
+                _, crash = run_sequence(case['spec'], case['sequence'])
+            except (OSError, ValueError, KeyError, ImportError, AttributeError) as e:
+                failures.append({'path': path, 'error': f"unreadable: {e}"})
+                continue
+            if crash:
+                failures.append({'path': path, 'error': crash_signature(crash), 'message': crash['message']})
+    status = "✅" if not failures else "❌"
+    print(f"{status} Fuzz regressions: {len(failures)} failing")
+    return failures
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--check":
+        sys.exit(1 if check_regressions(*sys.argv[2:3]) else 0)
+    if len(sys.argv) < 2:
+        print("usage: component_fuzzer.py <module:Class | component type> [seeds] [iterations]")
+        print("       component_fuzzer.py --check [regression dir]")
+        sys.exit(2)
+    ComponentFuzzer(sys.argv[1]).run(*(int(arg) for arg in sys.argv[2:4]))
+
+__all__ = ['ComponentFuzzer', 'FuzzBench', 'SequenceGenerator', 'run_sequence', 'minimize',
+           'check_regressions', 'crash_signature', 'load_component_class', 'drivable_pins']
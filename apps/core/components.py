@@ -4,12 +4,24 @@ Base component system with robust error handling
 """
 #this goes in core/
 import os
+import copy
 import json
-from typing import Dict, List, Any, Optional, Tuple, Union
+from typing import Dict, List, Any, Optional, Tuple, Union, Mapping, Callable
 from dataclasses import dataclass, field
+from collections import deque
 from enum import Enum
+from contextlib import nullcontext
 import uuid
 
+from core.memory import MemoryBlock
+from core.bus_nets import pin_role
+from core.pin_table import PinTable
+from core.component_definition import ComponentDefinition, DefinitionField, PropertyOverlay
+from core.connection_store import ConnectionStore
+from core.net_map import NetMap
+from core.project_archive import write_archive, ProjectArchive, is_project_archive, PROJECT_EXTENSION
+from core.change_journal import ChangeJournal, recover as recover_journal
+
 try:
     from PyQt6.QtCore import QObject, pyqtSignal
     from PyQt6.QtWidgets import QGraphicsRectItem
@@ -44,9 +56,9 @@ class ComponentType(Enum):
     VIDEO = "video"
     STORAGE = "storage"
 
-@dataclass
+@dataclass(slots=True)
 class ComponentPort:
-    """Represents a component port/pin"""
+    """Represents a component port/pin - slotted, boards carry thousands of these"""
     name: str
     pin_number: int
     direction: str = "input"  # input, output, bidirectional
@@ -76,8 +88,35 @@ class ComponentInfo:
     ports: List[ComponentPort] = field(default_factory=list)
     properties: Dict[str, Any] = field(default_factory=dict)
 
+# Attribute values a clone can share with its prototype
+_IMMUTABLE_TYPES = (str, int, float, bool, bytes, tuple, frozenset, type(None), Enum,
+                    PinTable, ComponentDefinition)
+
+# One default definition per component type
+_DEFAULT_DEFINITIONS: Dict[Tuple[str, str], ComponentDefinition] = {}
+
 class BaseComponent(QGraphicsRectItem if QT_AVAILABLE else QObject):
-    """Base component class"""
+    """Base component class
+    
+    Descriptive fields (manufacturer, datasheet_url, size, ...), the pin table
+    and default properties come from a shared ComponentDefinition. Assigning
+    one of them, or writing to properties, only stores an override on this
+    instance.
+    """
+    
+    component_type = DefinitionField()
+    category = DefinitionField()
+    manufacturer = DefinitionField()
+    part_number = DefinitionField()
+    package_type = DefinitionField()
+    pin_count = DefinitionField()
+    year = DefinitionField()
+    datasheet_url = DefinitionField()
+    image_path = DefinitionField()
+    width = DefinitionField()
+    height = DefinitionField()
+    
+    DEFINITION_DEFAULTS: Dict[str, Any] = {}  # category/size of the default definition
     
     def __init__(self, component_type: str, name: str = None, parent=None):
         if QT_AVAILABLE:
@@ -85,56 +124,214 @@ class BaseComponent(QGraphicsRectItem if QT_AVAILABLE else QObject):
         else:
             super().__init__()
         
+        key = (type(self).__name__, component_type)
+        definition = _DEFAULT_DEFINITIONS.get(key)
+        if definition is None:
+            definition = _DEFAULT_DEFINITIONS[key] = ComponentDefinition.shared(
+                component_type, **self.DEFINITION_DEFAULTS)
+        self.definition = definition
+        self._overrides: Optional[Dict[str, Any]] = None
+        self._properties: Optional[PropertyOverlay] = None  # created on first access
+        
         self.id = str(uuid.uuid4())
-        self.component_type = component_type
         self.name = name or f"{component_type}_{self.id[:8]}"
-        self.category = "Unknown"
-        
-        # Component properties
-        self.manufacturer = ""
-        self.part_number = ""
-        self.package_type = "DIP"
-        self.pin_count = 40
-        self.year = ""
-        self.datasheet_url = ""
-        self.image_path = ""
-        
-        # Visual properties
-        self.width = 120
-        self.height = 80
-        
-        # Connection ports
-        self.ports: List[ComponentPort] = []
+        
+        # Connection ports - indexed by name, pin number and type. Parts loaded from a
+        # definition or file share its PinTable until something needs port records.
+        self.pin_table: Optional[PinTable] = None
+        self._ports: Optional[List[ComponentPort]] = []
+        self._ports_by_name: Dict[str, ComponentPort] = {}
+        self._ports_by_pin: Dict[int, ComponentPort] = {}
+        self._ports_by_type: Optional[Dict[str, List[ComponentPort]]] = None  # built on first query
         self.connections: List[Any] = []
         
         # Component state
         self.enabled = True
-        self.properties: Dict[str, Any] = {}
+        self.sleep_request: Optional[Tuple[Optional[int], List[str]]] = None  # consumed by the engine
+        self._simulation_active = False
+        self.engine = None  # simulation engine driving this part - signals are f"{id}_{port}"
         
         # Set initial rectangle if Qt is available
         if QT_AVAILABLE and hasattr(self, 'setRect'):
             self.setRect(0, 0, self.width, self.height)
     
+    @property
+    def properties(self) -> PropertyOverlay:
+        """Instance overrides over the definition's properties (copy-on-write)"""
+        if self._properties is None:
+            self._properties = PropertyOverlay({}, self.definition.properties)
+        return self._properties
+    
+    @properties.setter
+    def properties(self, values: Dict[str, Any]):
+        """Replace all properties - the definition's defaults no longer show through"""
+        self._properties = PropertyOverlay(dict(values))
+        
+    @property
+    def overrides(self) -> Dict[str, Any]:
+        """Fields and properties this instance has changed from its definition"""
+        result = dict(self._overrides or {})
+        if self._properties is not None and self._properties.overrides:
+            result['properties'] = dict(self._properties.overrides)
+        return result
+        
+    def use_definition(self, definition: ComponentDefinition, saved_properties: Optional[Mapping] = None):
+        """Become a plain instance of a shared definition - drops overrides and ports
+
+        saved_properties (e.g. from a project archive) sit between this instance's
+        own values and the definition's defaults.
+        """
+        self.definition = definition
+        self._overrides = None
+        self._properties = (PropertyOverlay({}, saved_properties, definition.properties)
+                            if saved_properties is not None else None)
+        if definition.pin_table is not None:
+            self.load_pin_table(definition.pin_table)
+        else:
+            self.ports = []
+        if QT_AVAILABLE and hasattr(self, 'setRect'):
+            self.setRect(0, 0, self.width, self.height)
+        
+    def clone(self, name: str = None) -> 'BaseComponent':
+        """Structural copy with a new id - shares the definition, pin table and other
+        immutable values and copies only mutable state (overrides, properties, ports)"""
+        cls = type(self)
+        twin = cls.__new__(cls)
+        if QT_AVAILABLE:
+            QGraphicsRectItem.__init__(twin)
+            twin.setRect(self.rect())
+        else:
+            QObject.__init__(twin)
+        
+        state = dict(
+            id=str(uuid.uuid4()),
+            name=name or self.name,
+            _overrides=dict(self._overrides) if self._overrides else None,
+            _properties=PropertyOverlay(copy.deepcopy(self._properties.maps[0]), *self._properties.maps[1:])
+                if self._properties is not None else None,
+            _ports=[copy.copy(port) for port in self._ports] if self._ports is not None else None,
+            _ports_by_name={},
+            _ports_by_pin={},
+            _ports_by_type=None,
+            connections=[],
+            sleep_request=None,
+            engine=None
+        )
+        for key, value in self.__dict__.items():
+            if key not in state:
+                state[key] = value if isinstance(value, _IMMUTABLE_TYPES) else copy.deepcopy(value)
+        twin.__dict__.update(state)
+        if twin._ports is not None:
+            twin.invalidate_port_index()
+        return twin
+    
+    @property
+    def ports(self) -> List[ComponentPort]:
+        if self._ports is None:
+            self._ports = [ComponentPort(*row) for row in self.pin_table.rows()]
+            self.invalidate_port_index()
+        return self._ports
+    
+    @ports.setter
+    def ports(self, ports: List[ComponentPort]):
+        self._ports = list(ports)
+        self.pin_table = None
+        self.invalidate_port_index()
+        
+    @property
+    def port_count(self) -> int:
+        """Number of ports without materializing them"""
+        return len(self.pin_table) if self._ports is None else len(self._ports)
+        
+    def get_pin_table(self) -> PinTable:
+        """Shared pin table for the current ports"""
+        if self._ports is None:
+            return self.pin_table
+        return PinTable.from_ports(self._ports)
+        
+    def load_pin_table(self, table: PinTable):
+        """Use a shared pin table - port records are only created when asked for"""
+        self.pin_table = table
+        self._ports = None
+        self._ports_by_name.clear()
+        self._ports_by_pin.clear()
+        self._ports_by_type = None
+        
     def add_port(self, name: str, pin_number: int, direction: str = "bidirectional", 
                  signal_type: str = "digital", description: str = ""):
         """Add a port to the component"""
         port = ComponentPort(name, pin_number, direction, signal_type, description)
         self.ports.append(port)
+        self._index_port(port)
         return port
+        
+    def _index_port(self, port: ComponentPort):
+        # First port wins on duplicates, as the old linear scans did
+        self._ports_by_name.setdefault(port.name, port)
+        self._ports_by_pin.setdefault(port.pin_number, port)
+        self._ports_by_type = None
+        
+    def invalidate_port_index(self):
+        """Rebuild the indexes - call after changing self.ports or a port's fields directly"""
+        self._ports_by_name.clear()
+        self._ports_by_pin.clear()
+        for port in self.ports:
+            self._index_port(port)
+            
+    def set_port_direction(self, name: str, direction: str) -> bool:
+        port = self.get_port(name)
+        if not port:
+            return False
+        port.direction = direction
+        self._ports_by_type = None
+        return True
+    
+    @property
+    def simulation_active(self) -> bool:
+        return self._simulation_active
+    
+    @simulation_active.setter
+    def simulation_active(self, active: bool):
+        """Taking a part in or out of a running simulation refreshes the engine's active list"""
+        self._simulation_active = active
+        engine = getattr(self, 'engine', None)
+        if engine is not None:
+            engine.active_components = None
+    
+    def request_sleep(self, until_cycle: Optional[int] = None, signals: Optional[List[str]] = None):
+        """Ask the simulation engine to skip this component until a cycle or a signal change
+        
+        Call from simulate_step() when there is nothing to do - e.g. a ROM waiting
+        for its chip select. The engine picks the request up after the step.
+        """
+        self.sleep_request = (until_cycle, list(signals or []))
     
     def get_port(self, name: str) -> Optional[ComponentPort]:
         """Get a port by name"""
-        for port in self.ports:
-            if port.name == name:
-                return port
-        return None
+        if self._ports is None:
+            self.ports  # materialize and index
+        return self._ports_by_name.get(name)
     
     def get_port_by_pin(self, pin_number: int) -> Optional[ComponentPort]:
         """Get a port by pin number"""
-        for port in self.ports:
-            if port.pin_number == pin_number:
-                return port
-        return None
+        if self._ports is None:
+            self.ports
+        return self._ports_by_pin.get(pin_number)
+    
+    def get_ports_of_type(self, port_type: str) -> List[ComponentPort]:
+        """Ports by direction (input/output/bidirectional), signal type
+        (digital/analog/power/ground) or role (data/address/clock/control)"""
+        if self._ports_by_type is None:
+            index: Dict[str, List[ComponentPort]] = {}
+            for port in self.ports:
+                index.setdefault(port.direction, []).append(port)
+                index.setdefault(port.signal_type, []).append(port)
+                if port.signal_type == "digital":
+                    index.setdefault(pin_role(port.name), []).append(port)
+            self._ports_by_type = index
+        return list(self._ports_by_type.get(port_type, ()))
+    
+    getPortsOfType = get_ports_of_type  # name used by the simulation engine
     
     def to_dict(self) -> Dict[str, Any]:
         """Export component to dictionary"""
@@ -153,8 +350,8 @@ class BaseComponent(QGraphicsRectItem if QT_AVAILABLE else QObject):
             'width': self.width,
             'height': self.height,
             'enabled': self.enabled,
-            'properties': self.properties,
-            'ports': [
+            'properties': self.properties.copy(),
+            'ports': self.pin_table.to_dicts() if self._ports is None else [
                 {
                     'name': port.name,
                     'pin_number': port.pin_number,
@@ -162,101 +359,90 @@ class BaseComponent(QGraphicsRectItem if QT_AVAILABLE else QObject):
                     'signal_type': port.signal_type,
                     'description': port.description
                 }
-                for port in self.ports
+                for port in self._ports
             ]
         }
     
     def from_dict(self, data: Dict[str, Any]):
         """Load component from dictionary"""
         self.id = data.get('id', self.id)
-        self.component_type = data.get('component_type', self.component_type)
         self.name = data.get('name', self.name)
-        self.category = data.get('category', self.category)
-        self.manufacturer = data.get('manufacturer', '')
-        self.part_number = data.get('part_number', '')
-        self.package_type = data.get('package_type', 'DIP')
-        self.pin_count = data.get('pin_count', 40)
-        self.year = data.get('year', '')
-        self.datasheet_url = data.get('datasheet_url', '')
-        self.image_path = data.get('image_path', '')
-        self.width = data.get('width', 120)
-        self.height = data.get('height', 80)
         self.enabled = data.get('enabled', True)
-        self.properties = data.get('properties', {})
-        
-        # Load ports
-        self.ports.clear()
-        for port_data in data.get('ports', []):
-            port = ComponentPort(
-                port_data['name'],
-                port_data['pin_number'],
-                port_data.get('direction', 'bidirectional'),
-                port_data.get('signal_type', 'digital'),
-                port_data.get('description', '')
-            )
-            self.ports.append(port)
-        
-        # Update rectangle if Qt is available
-        if QT_AVAILABLE and hasattr(self, 'setRect'):
-            self.setRect(0, 0, self.width, self.height)
+        
+        # Identical parts share one definition (and pin table)
+        data = dict(data)
+        data.setdefault('component_type', self.component_type)
+        data.setdefault('category', self.category)
+        data.setdefault('ports', [])
+        self.use_definition(ComponentDefinition.from_dict(data))
 
 class ProcessorComponent(BaseComponent):
     """Processor component with CPU-specific functionality"""
     
+    # Default dimensions for CPU chips
+    DEFINITION_DEFAULTS = {'category': "Processors", 'width': 120, 'height': 80}
+    
     def __init__(self, component_type: str = "cpu", name: str = None, parent=None):
         super().__init__(component_type, name, parent)
-        self.category = "Processors"
         
         # CPU-specific properties
         self.clock_speed = 1.0  # MHz
         self.data_width = 8     # bits
         self.address_width = 16 # bits
         self.instruction_set = "Unknown"
-        
-        # Set default dimensions for CPU chips
-        self.width = 120
-        self.height = 80
-        
-        # Set rectangle bounds if Qt is available
-        if QT_AVAILABLE and hasattr(self, 'setRect'):
-            self.setRect(0, 0, self.width, self.height)
 
 class MemoryComponent(BaseComponent):
     """Memory component with RAM/ROM functionality"""
     
+    DEFINITION_DEFAULTS = {'category': "Memory", 'width': 100, 'height': 60}
+    
     def __init__(self, component_type: str = "memory", name: str = None, parent=None):
         super().__init__(component_type, name, parent)
-        self.category = "Memory"
         
         # Memory-specific properties
         self.memory_size = 1024  # bytes
         self.memory_type = "RAM"  # RAM, ROM, EPROM, etc.
         self.access_time = 100    # nanoseconds
-        
-        # Set default dimensions
-        self.width = 100
-        self.height = 60
-        
-        if QT_AVAILABLE and hasattr(self, 'setRect'):
-            self.setRect(0, 0, self.width, self.height)
+        self.memory: Optional[MemoryBlock] = None  # allocated on first use
+
+    # Chip select / enable pins - active low, as on most RAMs and ROMs of the era
+    CHIP_SELECT_PORTS = ('/CS', 'CS', '/CE', 'CE', '/CS1', 'CS1')
+
+    def simulate_step(self, cycle: int):
+        """Sleep while deselected - RAM and ROM only react when the chip select goes low
+
+        Without a chip select pin there is no input to wait for, so the part
+        sleeps until the engine wakes it.
+        """
+        select = next((name for name in self.CHIP_SELECT_PORTS if self.get_port(name)), None)
+        if select is None or self.engine is None:
+            self.request_sleep()
+            return
+        signal_name = f"{self.id}_{select}"
+        if self.engine.get_signal_value(signal_name):
+            self.request_sleep(signals=[signal_name])
+
+    def get_memory(self) -> MemoryBlock:
+        """Backing store, (re)allocated when memory_size changes"""
+        if self.memory is None or len(self.memory) != self.memory_size:
+            previous = self.memory
+            self.memory = MemoryBlock(self.memory_size, self.name)
+            if previous is not None:
+                self.memory.load(previous.read_block(0, self.memory_size))
+        self.memory.read_only = self.memory_type.upper() in ("ROM", "EPROM")
+        return self.memory
 
 class HardwareComponent(BaseComponent):
     """Generic hardware component"""
     
+    DEFINITION_DEFAULTS = {'category': "Hardware", 'width': 100, 'height': 60}
+    
     def __init__(self, component_type: str = "hardware", name: str = None, parent=None):
         super().__init__(component_type, name, parent)
-        self.category = "Hardware"
         
         # Generic hardware properties
         self.voltage = 5.0  # volts
         self.current = 0.1  # amps
-        
-        # Set default dimensions
-        self.width = 100
-        self.height = 60
-        
-        if QT_AVAILABLE and hasattr(self, 'setRect'):
-            self.setRect(0, 0, self.width, self.height)
 
 
 
@@ -271,10 +457,10 @@ class GraphicsComponent(HardwareComponent):
         self.video_memory = 16384  # 16KB default
         
         # Common graphics ports
-        self.add_port("VIDEO_OUT", "output", "analog")
-        self.add_port("H_SYNC", "output", "digital")
-        self.add_port("V_SYNC", "output", "digital")
-        self.add_port("PIXEL_CLK", "input", "digital")
+        self.add_port("VIDEO_OUT", 1, "output", "analog")
+        self.add_port("H_SYNC", 2, "output", "digital")
+        self.add_port("V_SYNC", 3, "output", "digital")
+        self.add_port("PIXEL_CLK", 4, "input", "digital")
         
     def set_resolution(self, width: int, height: int):
         """Set display resolution"""
@@ -294,16 +480,31 @@ class AudioComponent(HardwareComponent):
         self.channels = 3  # Default to 3 channels
         self.sample_rate = 44100
         self.bit_depth = 16
+        self.samples: deque = deque(maxlen=self.sample_rate)  # (left, right) output, one second
+        self._sample_index = 0
         
         # Common audio ports
-        self.add_port("AUDIO_L", "output", "analog")
-        self.add_port("AUDIO_R", "output", "analog") 
-        self.add_port("AUDIO_CLK", "input", "digital")
+        self.add_port("AUDIO_L", 1, "output", "analog")
+        self.add_port("AUDIO_R", 2, "output", "analog") 
+        self.add_port("AUDIO_CLK", 3, "input", "digital")
         
     def set_channels(self, channels: int):
         """Set number of audio channels"""
         self.channels = channels
         self.mark_modified()
+        
+    def output_sample(self, left: float, right: Optional[float] = None) -> bool:
+        """Queue one output sample - returns False when warp mode drops it
+        
+        The engine's audio_sample_stride mutes (0) or decimates (keep every Nth)
+        the output while warping, so the buffer never fills faster than real time.
+        """
+        stride = self.engine.audio_sample_stride if self.engine is not None else 1
+        self._sample_index += 1
+        if stride == 0 or self._sample_index % stride:
+            return False
+        self.samples.append((left, left if right is None else right))
+        return True
 
 class IOComponent(HardwareComponent):
     """Input/Output component"""
@@ -314,23 +515,74 @@ class IOComponent(HardwareComponent):
         
         # Create configurable I/O ports
         for i in range(self.io_ports):
-            self.add_port(f"IO_{i}", "bidirectional", "digital")
+            self.add_port(f"IO_{i}", i + 1, "bidirectional", "digital")
         
     def configure_port(self, port_num: int, direction: str):
         """Configure I/O port direction"""
         if 0 <= port_num < self.io_ports:
-            port_name = f"IO_{port_num}"
-            if port_name in self.ports:
-                self.ports[port_name].direction = direction
-                self.mark_modified()
+            self.set_port_direction(f"IO_{port_num}", direction)
 
 class ComponentManager:
     """Manages component instances and connections"""
     
     def __init__(self):
         self.components: Dict[str, BaseComponent] = {}
-        self.connections: List[Dict[str, Any]] = []
+        self._connections = ConnectionStore()
+        self.net_map = NetMap(self._connections)  # live nets - netlist, ERC and ratsnest share it
         self.component_groups: Dict[str, List[str]] = {}
+        self.journal: Optional[ChangeJournal] = None  # crash-safe autosave, see enable_journal()
+        self.revision = 0  # bumped whenever components are added or removed
+        self._pending_geometry: Optional[Callable[[], None]] = None  # see defer_geometry()
+        
+    @property
+    def connections(self) -> ConnectionStore:
+        """Indexed connection records - iterates like the old list of dicts"""
+        return self._connections
+    
+    @connections.setter
+    def connections(self, records: List[Dict[str, Any]]):
+        self._connections = ConnectionStore(records)
+        self.net_map.attach(self._connections)
+        if self.journal is not None:
+            self._connections.add_observer(self.journal)
+            
+    def components_changed(self):
+        """Components were added or removed - the simulation engine rebuilds its active list"""
+        self.revision += 1
+        
+    def enable_journal(self, project_file: str, **options) -> ChangeJournal:
+        """Journal every edit next to project_file - autosave() then only flushes the journal"""
+        self.disable_journal()
+        self.journal = ChangeJournal(project_file, **options)
+        self._connections.add_observer(self.journal)
+        return self.journal
+        
+    def disable_journal(self):
+        if self.journal is not None:
+            self._connections.remove_observer(self.journal)
+            self.journal.close()
+            self.journal = None
+            
+    def autosave(self) -> bool:
+        """Make journalled edits durable - cheap enough to call every few seconds"""
+        return self.journal.flush() if self.journal is not None else False
+        
+    def defer_geometry(self, apply: Callable[[], None]):
+        """Positions to set on first use - a project archive load leaves them undecoded"""
+        self._pending_geometry = apply
+        
+    def ensure_geometry(self):
+        """Apply deferred positions - call before reading or changing component positions"""
+        if self._pending_geometry is not None:
+            apply, self._pending_geometry = self._pending_geometry, None
+            apply()
+        
+    def _journal_component(self, component: BaseComponent):
+        record = {'component': component.to_dict()}
+        if hasattr(component, 'pos') and callable(component.pos):
+            position = component.pos()
+            record['pos'] = [position.x(), position.y(), component.rotation()]
+        self.journal.record('add_component', **record)
         
     def add_component(self, component: BaseComponent) -> bool:
         """Add a component to the manager"""
@@ -338,26 +590,77 @@ class ComponentManager:
             return False
         
         self.components[component.id] = component
+        self.components_changed()
+        if self.journal is not None:
+            self._journal_component(component)
         print(f"✓ Added component: {component.name} ({component.id})")
         return True
     
+    def add_components(self, components: List[BaseComponent]) -> int:
+        """Add many components at once - one summary line instead of one per part
+
+        Components whose id is already in use are skipped rather than replacing it.
+        """
+        added = {}
+        duplicates = 0
+        for component in components:
+            if component is None or not hasattr(component, 'id'):
+                continue
+            if component.id in self.components or component.id in added:
+                duplicates += 1
+                continue
+            added[component.id] = component
+        if duplicates:
+            print(f"⚠️ Skipped {duplicates} components with duplicate ids")
+        self.components.update(added)
+        self.components_changed()
+        if self.journal is not None:
+            for component in added.values():
+                self._journal_component(component)
+        print(f"✓ Added {len(added)} components")
+        return len(added)
+    
     def remove_component(self, component_id: str) -> bool:
         """Remove a component by ID"""
         if component_id in self.components:
             component = self.components[component_id]
             del self.components[component_id]
+            self.components_changed()
             
             # Remove related connections
-            self.connections = [
-                conn for conn in self.connections
-                if conn.get('from_component') != component_id and 
-                conn.get('to_component') != component_id
-            ]
+            self._connections.remove_component(component_id)
+            if self.journal is not None:
+                self.journal.record('remove_component', id=component_id)
             
             print(f"✓ Removed component: {component.name}")
             return True
         return False
     
+    def move_component(self, component_id: str, x: float, y: float,
+                       rotation: Optional[float] = None) -> bool:
+        """Move a placed component"""
+        component = self.components.get(component_id)
+        if component is None:
+            return False
+        self.ensure_geometry()
+        if hasattr(component, 'setPos'):
+            component.setPos(x, y)
+            if rotation is not None:
+                component.setRotation(rotation)
+        if self.journal is not None:
+            self.journal.record('move', id=component_id, x=x, y=y, rotation=rotation)
+        return True
+    
+    def set_component_property(self, component_id: str, key: str, value: Any) -> bool:
+        """Change one entry of a component's properties"""
+        component = self.components.get(component_id)
+        if component is None:
+            return False
+        component.properties[key] = value
+        if self.journal is not None:
+            self.journal.record('set_property', id=component_id, key=key, value=value)
+        return True
+    
     def get_component(self, component_id: str) -> Optional[BaseComponent]:
         """Get a component by ID"""
         return self.components.get(component_id)
@@ -373,30 +676,46 @@ class ComponentManager:
             to_component_id not in self.components):
             return False
         
-        connection = {
-            'from_component': from_component_id,
-            'from_port': from_port,
-            'to_component': to_component_id,
-            'to_port': to_port,
-            'id': str(uuid.uuid4())
-        }
-        
-        self.connections.append(connection)
+        self._connections.add(from_component_id, from_port, to_component_id, to_port)
         print(f"✓ Connected {from_component_id}:{from_port} to {to_component_id}:{to_port}")
         return True
     
-    def save_to_file(self, filename: str) -> bool:
-        """Save system to file"""
+    def remove_connection(self, connection_id: str) -> bool:
+        """Remove a connection by ID"""
+        return self._connections.remove(connection_id) is not None
+    
+    def get_connections(self, component_id: str, port: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Connections of a component, or of one of its ports"""
+        if port is None:
+            return self._connections.for_component(component_id)
+        return self._connections.for_port(component_id, port)
+    
+    def get_neighbours(self, component_id: str) -> List[BaseComponent]:
+        """Components directly connected to this one"""
+        return [self.components[other] for other in self._connections.neighbours(component_id)
+                if other in self.components]
+    
+    def save_to_file(self, filename: str, view: Optional[Dict[str, Any]] = None) -> bool:
+        """Save system to file - a sectioned binary archive for PROJECT_EXTENSION, JSON otherwise"""
+        if self.journal is not None:
+            self.journal.wait()  # a running compaction must not overwrite this save
+        if filename.endswith(PROJECT_EXTENSION):
+            if write_archive(filename, self, view):
+                self._saved(filename)
+                print(f"✓ System saved to {filename}")
+                return True
+            return False
         try:
             data = {
                 'components': [comp.to_dict() for comp in self.components.values()],
-                'connections': self.connections,
+                'connections': self._connections.to_list(),
                 'groups': self.component_groups
             }
             
             with open(filename, 'w') as f:
                 json.dump(data, f, indent=2)
             
+            self._saved(filename)
             print(f"✓ System saved to {filename}")
             return True
             
@@ -404,9 +723,30 @@ class ComponentManager:
             print(f"⚠️ Error saving system: {e}")
             return False
     
-    def load_from_file(self, filename: str) -> bool:
-        """Load system from file"""
+    def _saved(self, filename: str):
+        """A full save supersedes the journal for that file"""
+        if self.journal is not None and self.journal.project_file == filename:
+            self.journal.discard()
+    
+    def load_from_file(self, filename: str, recover: bool = True) -> bool:
+        """Load system from file, then replay any journalled edits left by a crash"""
+        try:
+            with self.journal.paused() if self.journal is not None else nullcontext():
+                return self._load_from_file(filename, recover)
+        finally:
+            self.components_changed()
+        
+    def _load_from_file(self, filename: str, recover: bool) -> bool:
         try:
+            if is_project_archive(filename):
+                self.clear()
+                with ProjectArchive(filename) as archive:
+                    archive.load_into(self)
+                if recover:
+                    recover_journal(filename, self)
+                print(f"✓ System loaded from {filename}")
+                return True
+                
             with open(filename, 'r') as f:
                 data = json.load(f)
             
@@ -425,6 +765,8 @@ class ComponentManager:
             # Load groups
             self.component_groups = data.get('groups', {})
             
+            if recover:
+                recover_journal(filename, self)
             print(f"✓ System loaded from {filename}")
             return True
             
@@ -434,9 +776,14 @@ class ComponentManager:
     
     def clear(self):
         """Clear all components and connections"""
-        self.components.clear()
-        self.connections.clear()
-        self.component_groups.clear()
+        if self.journal is not None:
+            self.journal.record('clear')
+        self._pending_geometry = None
+        with self.journal.paused() if self.journal is not None else nullcontext():
+            self.components.clear()
+            self._connections.clear()
+            self.component_groups.clear()
+        self.components_changed()
         print("✓ System cleared")
 
 class ComponentFactory:
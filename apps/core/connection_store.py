@@ -0,0 +1,150 @@
+"""
+X-Seti - October18 2026 - Connection Store
+Indexed component connections with per-component and per-port adjacency
+"""
+#this goes in core/
+
+import uuid
+from typing import Dict, List, Any, Optional, Tuple, Iterable, Iterator, Set
+
+Record = Dict[str, Any]
+
+class ConnectionStore:
+    """Connection records keyed by id, with adjacency maps for components and ports
+
+    Add and remove are O(1) per connection and removing a component only
+    touches its own connections. It still behaves like the old list of dicts
+    for iteration, len(), indexing, append() and json (via to_list()).
+    Observers (the live NetMap) are told about every add and remove, whichever
+    path made it.
+    """
+
+    def __init__(self, records: Iterable[Record] = ()):
+        self._by_id: Dict[str, Record] = {}
+        self._by_component: Dict[str, Dict[str, None]] = {}  # component -> ordered set of ids
+        self._by_port: Dict[Tuple[str, str], Dict[str, None]] = {}  # (component, port) -> ids
+        self.observers: List[Any] = []  # connection_added / connection_removed / connections_cleared
+        for record in records:
+            self.append(record)
+
+    # List compatibility
+
+    def __iter__(self) -> Iterator[Record]:
+        return iter(list(self._by_id.values()))
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __getitem__(self, index):
+        return list(self._by_id.values())[index]
+
+    def __bool__(self) -> bool:
+        return bool(self._by_id)
+
+    def append(self, record: Record) -> Record:
+        """Index an existing record dict - an id is assigned if it has none"""
+        if not record.get('id'):
+            record['id'] = str(uuid.uuid4())
+        connection_id = record['id']
+        if connection_id in self._by_id:
+            self.remove(connection_id)
+        self._by_id[connection_id] = record
+        for end in ('from', 'to'):
+            component_id = record.get(f'{end}_component')
+            self._by_component.setdefault(component_id, {})[connection_id] = None
+            self._by_port.setdefault((component_id, record.get(f'{end}_port')), {})[connection_id] = None
+        for observer in self.observers:
+            observer.connection_added(record)
+        return record
+
+    def clear(self):
+        self._by_id.clear()
+        self._by_component.clear()
+        self._by_port.clear()
+        for observer in self.observers:
+            observer.connections_cleared()
+            
+    def add_observer(self, observer):
+        if observer not in self.observers:
+            self.observers.append(observer)
+            
+    def remove_observer(self, observer):
+        if observer in self.observers:
+            self.observers.remove(observer)
+
+    def to_list(self) -> List[Record]:
+        return list(self._by_id.values())
+
+    # Indexed operations
+
+    def add(self, from_component: str, from_port: str, to_component: str, to_port: str,
+            connection_id: Optional[str] = None) -> Record:
+        return self.append({
+            'from_component': from_component,
+            'from_port': from_port,
+            'to_component': to_component,
+            'to_port': to_port,
+            'id': connection_id or str(uuid.uuid4())
+        })
+
+    def get(self, connection_id: str) -> Optional[Record]:
+        return self._by_id.get(connection_id)
+
+    def remove(self, connection_id: str) -> Optional[Record]:
+        record = self._by_id.pop(connection_id, None)
+        if record is None:
+            return None
+        for end in ('from', 'to'):
+            component_id = record.get(f'{end}_component')
+            self._discard(self._by_component, component_id, connection_id)
+            self._discard(self._by_port, (component_id, record.get(f'{end}_port')), connection_id)
+        for observer in self.observers:
+            observer.connection_removed(record)
+        return record
+
+    def remove_component(self, component_id: str) -> List[Record]:
+        """Drop every connection touching a component"""
+        return [self.remove(connection_id)
+                for connection_id in list(self._by_component.get(component_id, ()))]
+
+    @staticmethod
+    def _discard(index: Dict, key, connection_id: str):
+        ids = index.get(key)
+        if ids is not None:
+            ids.pop(connection_id, None)
+            if not ids:
+                del index[key]
+
+    def for_component(self, component_id: str) -> List[Record]:
+        return [self._by_id[connection_id] for connection_id in self._by_component.get(component_id, ())]
+
+    def for_port(self, component_id: str, port: str) -> List[Record]:
+        return [self._by_id[connection_id] for connection_id in self._by_port.get((component_id, port), ())]
+
+    def neighbours(self, component_id: str) -> Set[str]:
+        """Components sharing at least one connection with this one"""
+        result = set()
+        for record in self.for_component(component_id):
+            other = record['to_component'] if record['from_component'] == component_id else record['from_component']
+            if other != component_id:
+                result.add(other)
+        return result
+
+    def port_neighbours(self, component_id: str, port: str) -> List[Tuple[str, str]]:
+        """(component, port) at the other end of each connection on a port"""
+        result = []
+        for record in self.for_port(component_id, port):
+            if record['from_component'] == component_id and record['from_port'] == port:
+                result.append((record['to_component'], record['to_port']))
+            else:
+                result.append((record['from_component'], record['from_port']))
+        return result
+
+    def between(self, first: str, second: str) -> List[Record]:
+        """Connections joining two components, in either direction"""
+        smaller, other = (first, second) if len(self._by_component.get(first, ())) <= \
+            len(self._by_component.get(second, ())) else (second, first)
+        return [record for record in self.for_component(smaller)
+                if other in (record['from_component'], record['to_component'])]
+
+__all__ = ['ConnectionStore']
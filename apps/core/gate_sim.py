@@ -0,0 +1,338 @@
+"""
+X-Seti - October18 2026 - Gate Level Simulator
+Levelized, bit-parallel evaluation of combinational glue logic
+"""
+#this goes in core/
+
+import re
+from typing import Dict, List, Any, Optional, Tuple, Iterator
+
+# Gate kinds - every net value is a Python int holding one bit per test vector
+GATE_KINDS = ('AND', 'OR', 'NAND', 'NOR', 'XOR', 'XNOR', 'NOT', 'BUF', 'MUX')
+
+# 74-series parts as gate lists over their pin names - (kind, inputs, output).
+# '~' prefixes an active-low input, MUX inputs are (select, a, b).
+SERIES_74: Dict[str, List[Tuple[str, List[str], str]]] = {
+    '7400': [('NAND', [f'{n}A', f'{n}B'], f'{n}Y') for n in range(1, 5)],
+    '7402': [('NOR', [f'{n}A', f'{n}B'], f'{n}Y') for n in range(1, 5)],
+    '7404': [('NOT', [f'{n}A'], f'{n}Y') for n in range(1, 7)],
+    '7408': [('AND', [f'{n}A', f'{n}B'], f'{n}Y') for n in range(1, 5)],
+    '7410': [('NAND', [f'{n}A', f'{n}B', f'{n}C'], f'{n}Y') for n in range(1, 4)],
+    '7411': [('AND', [f'{n}A', f'{n}B', f'{n}C'], f'{n}Y') for n in range(1, 4)],
+    '7420': [('NAND', [f'{n}A', f'{n}B', f'{n}C', f'{n}D'], f'{n}Y') for n in range(1, 3)],
+    '7427': [('NOR', [f'{n}A', f'{n}B', f'{n}C'], f'{n}Y') for n in range(1, 4)],
+    '7430': [('NAND', ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H'], 'Y')],
+    '7432': [('OR', [f'{n}A', f'{n}B'], f'{n}Y') for n in range(1, 5)],
+    '7486': [('XOR', [f'{n}A', f'{n}B'], f'{n}Y') for n in range(1, 5)],
+    # 3-to-8 decoder - Yn low when G1 high, G2A/G2B low and CBA == n
+    '74138': [('NAND', ['G1', '~G2A', '~G2B'] + [('C', 'B', 'A')[2 - b] if (n >> b) & 1 else
+                                               '~' + ('C', 'B', 'A')[2 - b] for b in range(3)], f'Y{n}')
+              for n in range(8)],
+    # Dual 2-to-4 decoder
+    '74139': [('NAND', [f'~{u}G'] + [f'{u}{s}' if (n >> b) & 1 else f'~{u}{s}'
+                                      for b, s in enumerate(('A', 'B'))], f'{u}Y{n}')
+              for u in (1, 2) for n in range(4)],
+    # Quad 2-to-1 mux with active-low enable
+    '74157': [gate for n in range(1, 5) for gate in (
+        ('MUX', ['SEL', f'{n}A', f'{n}B'], f'{n}Y.mux'),
+        ('AND', ['~G', f'{n}Y.mux'], f'{n}Y'))],
+}
+
+_PART_PATTERN = re.compile(r'(?:SN)?74(?:ALS|ACT|HCT|LS|AS|AC|HC|LVC|F|S|L|H|C)?(\d+)', re.IGNORECASE)
+
+def normalize_part(name: str) -> Optional[str]:
+    """'SN74LS32N' / '74HC138' -> '7432' / '74138', None if not a known 74-series part"""
+    match = _PART_PATTERN.search(name or "")
+    if not match:
+        return None
+    part = '74' + match.group(1)
+    return part if part in SERIES_74 else None
+
+def exhaustive_pattern(input_index: int, vector_count: int, offset: int = 0) -> int:
+    """Packed values of one input across vectors offset..offset+count-1
+
+    Bit v of the result is bit `input_index` of vector number offset + v, so
+    together the inputs enumerate every combination once.
+    """
+    period = 1 << input_index
+    if period >= vector_count and offset % vector_count == 0:
+        # High-order input - constant across an aligned chunk
+        return (1 << vector_count) - 1 if (offset >> input_index) & 1 else 0
+    if offset % (2 * period) == 0 and vector_count % (2 * period) == 0:
+        # Aligned chunk - build by doubling a repeating 0..01..1 block
+        block = ((1 << period) - 1) << period
+        width = 2 * period
+        while width < vector_count:
+            block |= block << width
+            width *= 2
+        return block & ((1 << vector_count) - 1)
+    value = 0
+    for v in range(vector_count):
+        if ((offset + v) >> input_index) & 1:
+            value |= 1 << v
+    return value
+
+class GateNetlist:
+    """Combinational netlist evaluated one levelized pass per batch of vectors
+
+    Nets are named strings. Gates are kept in insertion order until levelize()
+    sorts them so every gate comes after the gates driving its inputs; evaluate()
+    then runs that schedule with bitwise ops on wide ints, computing as many
+    independent test vectors as the ints have bits.
+    """
+
+    def __init__(self, name: str = "netlist"):
+        self.name = name
+        self.inputs: List[str] = []
+        self.outputs: List[str] = []
+        self.gates: List[Tuple[str, List[str], str]] = []
+        self.delays: Dict[str, int] = {}  # output net -> propagation delay, for timed simulation
+        self._drivers: Dict[str, int] = {}  # net -> index of the gate driving it
+        self._schedule: Optional[List[Tuple[str, List[Tuple[int, bool]], int]]] = None
+        self._net_index: Dict[str, int] = {}
+
+    def add_input(self, net: str):
+        if net not in self.inputs:
+            self.inputs.append(net)
+            self._schedule = None
+
+    def add_output(self, net: str):
+        if net not in self.outputs:
+            self.outputs.append(net)
+
+    def add_gate(self, kind: str, inputs: List[str], output: str, delay: int = 1):
+        """Add a gate - input names may start with '~' for an inverted input"""
+        kind = kind.upper()
+        if kind not in GATE_KINDS:
+            raise ValueError(f"Unknown gate kind: {kind}")
+        if output in self._drivers:
+            raise ValueError(f"Net {output} already has a driver")
+        self._drivers[output] = len(self.gates)
+        self.gates.append((kind, list(inputs), output))
+        self.delays[output] = delay
+        self._schedule = None
+
+    def add_part(self, part: str, prefix: str, pin_map: Optional[Dict[str, str]] = None):
+        """Instantiate a 74-series part - nets are prefix + pin unless remapped"""
+        pin_map = pin_map or {}
+        for kind, inputs, output in SERIES_74[part]:
+            net = lambda pin: pin_map.get(pin, f"{prefix}{pin}")
+            mapped = [('~' + net(pin[1:])) if pin.startswith('~') else net(pin) for pin in inputs]
+            self.add_gate(kind, mapped, net(output))
+
+    # === Levelization ===
+
+    def levelize(self) -> List[List[str]]:
+        """Sort gates into dependency order - returns gate outputs grouped by level"""
+        levels: Dict[str, int] = {}
+        order: List[int] = []
+        pending = {i: {pin.lstrip('~') for pin in inputs if pin.lstrip('~') in self._drivers}
+                   for i, (_, inputs, _) in enumerate(self.gates)}
+        fanout: Dict[str, List[int]] = {}
+        for i, waiting in pending.items():
+            for net in waiting:
+                fanout.setdefault(net, []).append(i)
+
+        ready = [i for i, waiting in pending.items() if not waiting]
+        while ready:
+            i = ready.pop()
+            order.append(i)
+            _, inputs, output = self.gates[i]
+            levels[output] = 1 + max((levels.get(pin.lstrip('~'), 0) for pin in inputs), default=0)
+            for consumer in fanout.get(output, []):
+                pending[consumer].discard(output)
+                if not pending[consumer]:
+                    ready.append(consumer)
+
+        if len(order) != len(self.gates):
+            looped = sorted(self.gates[i][2] for i, waiting in pending.items() if waiting)
+            raise ValueError(f"Combinational loop through: {', '.join(looped[:8])}")
+
+        order.sort(key=lambda i: levels[self.gates[i][2]])
+        self._compile(order)
+
+        grouped: Dict[int, List[str]] = {}
+        for net, level in levels.items():
+            grouped.setdefault(level, []).append(net)
+        return [grouped[level] for level in sorted(grouped)]
+
+    def _compile(self, order: List[int]):
+        # Undriven nets that are not declared inputs become implicit inputs
+        for _, inputs, _ in self.gates:
+            for pin in inputs:
+                net = pin.lstrip('~')
+                if net not in self._drivers and net not in self.inputs:
+                    self.inputs.append(net)
+
+        index: Dict[str, int] = {}
+        for net in self.inputs:
+            index[net] = len(index)
+        for i in order:
+            index[self.gates[i][2]] = len(index)
+
+        schedule = []
+        for i in order:
+            kind, inputs, output = self.gates[i]
+            operands = [(index[pin.lstrip('~')], pin.startswith('~')) for pin in inputs]
+            schedule.append((kind, operands, index[output]))
+        self._net_index = index
+        self._schedule = schedule
+
+    # === Evaluation ===
+
+    def evaluate(self, values: Dict[str, int], width: int = 64) -> Dict[str, int]:
+        """Evaluate `width` vectors at once - values and results are packed ints per net"""
+        mask = (1 << width) - 1
+        return self._run({net: value & mask for net, value in values.items()},
+                         lambda value: value ^ mask, 0)
+
+    def evaluate_arrays(self, values: Dict[str, Any], outputs: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Evaluate with one boolean array per net (NumPy bool arrays or anything supporting ~ & | ^)"""
+        zero = next(iter(values.values())) & False if values else False
+        return self._run(values, lambda value: ~value, zero, outputs)
+
+    def _run(self, values: Dict[str, Any], invert, zero, outputs: Optional[List[str]] = None) -> Dict[str, Any]:
+        if self._schedule is None:
+            self.levelize()
+        nets = [zero] * len(self._net_index)
+        for net in self.inputs:
+            nets[self._net_index[net]] = values.get(net, zero)
+
+        for kind, operands, output in self._schedule:
+            args = [invert(nets[i]) if inverted else nets[i] for i, inverted in operands]
+            if kind == 'AND' or kind == 'NAND':
+                result = args[0]
+                for arg in args[1:]:
+                    result = result & arg
+            elif kind == 'OR' or kind == 'NOR':
+                result = args[0]
+                for arg in args[1:]:
+                    result = result | arg
+            elif kind == 'XOR' or kind == 'XNOR':
+                result = args[0]
+                for arg in args[1:]:
+                    result = result ^ arg
+            elif kind == 'MUX':
+                select, a, b = args
+                result = (a & invert(select)) | (b & select)
+            elif kind == 'NOT':
+                result = invert(args[0])
+            else:
+                result = args[0]
+            if kind in ('NAND', 'NOR', 'XNOR'):
+                result = invert(result)
+            nets[output] = result
+
+        index = self._net_index
+        return {net: nets[index[net]] for net in outputs or self.output_nets() if net in index}
+
+    def output_nets(self) -> List[str]:
+        """Declared outputs, or every gate output when none were declared"""
+        return self.outputs or [gate[2] for gate in self.gates]
+
+    def exhaustive(self, inputs: Optional[List[str]] = None,
+                   chunk_bits: int = 16) -> Iterator[Tuple[int, int, Dict[str, int]]]:
+        """Evaluate every input combination - yields (first_vector, count, outputs) per chunk
+
+        Vector v assigns bit i of v to inputs[i]. Each chunk packs up to
+        2**chunk_bits vectors into one pass.
+        """
+        if self._schedule is None:
+            self.levelize()
+        inputs = inputs or self.inputs
+        total = 1 << len(inputs)
+        chunk = min(total, 1 << chunk_bits)
+        for offset in range(0, total, chunk):
+            values = {net: exhaustive_pattern(i, chunk, offset) for i, net in enumerate(inputs)}
+            yield offset, chunk, self.evaluate(values, chunk)
+
+    def truth_table(self, inputs: Optional[List[str]] = None) -> Dict[str, int]:
+        """Full truth table - bit v of each output is its value for input vector v"""
+        table: Dict[str, int] = {}
+        for offset, _, outputs in self.exhaustive(inputs):
+            for net, value in outputs.items():
+                table[net] = table.get(net, 0) | (value << offset)
+        return table
+
+def compare_netlists(reference: GateNetlist, candidate: GateNetlist,
+                     inputs: Optional[List[str]] = None, outputs: Optional[List[str]] = None,
+                     max_mismatches: int = 16) -> List[Dict[str, Any]]:
+    """Exhaustively compare two netlists (e.g. a PAL equation set against the TTL it replaces)
+
+    Returns up to max_mismatches failing vectors as {'inputs', 'expected', 'actual'}.
+    """
+    reference.levelize()
+    candidate.levelize()
+    inputs = inputs or reference.inputs
+    outputs = outputs or reference.output_nets()
+
+    mismatches = []
+    for (offset, _, expected), (_, _, actual) in zip(reference.exhaustive(inputs),
+                                                     candidate.exhaustive(inputs)):
+        diff = 0
+        for net in outputs:
+            diff |= expected.get(net, 0) ^ actual.get(net, 0)
+        while diff and len(mismatches) < max_mismatches:
+            bit = (diff & -diff).bit_length() - 1
+            diff &= diff - 1
+            vector = offset + bit
+            mismatches.append({
+                'inputs': {net: (vector >> i) & 1 for i, net in enumerate(inputs)},
+                'expected': {net: (expected.get(net, 0) >> bit) & 1 for net in outputs},
+                'actual': {net: (actual.get(net, 0) >> bit) & 1 for net in outputs}
+            })
+        if len(mismatches) >= max_mismatches:
+            break
+    return mismatches
+
+def netlist_from_components(component_manager, component_ids: Optional[List[str]] = None) -> GateNetlist:
+    """Build a gate netlist from placed 74-series LOGIC components and their connections
+
+    Connected pins are merged into one net named after its first pin
+    ('component_id.pin'); nets with no driver become netlist inputs.
+    component_ids=None takes every component; an empty list gives an empty netlist.
+    """
+    components = component_manager.components
+    ids = list(components) if component_ids is None else component_ids
+    parts = {}
+    for component_id in ids:
+        component = components.get(component_id)
+        if component is None:
+            continue
+        part = normalize_part(getattr(component, 'part_number', '') or component.name)
+        if part:
+            parts[component_id] = part
+
+    # Connected pins share the name of their net's root pin
+    net_map = getattr(component_manager, 'net_map', None)
+    if net_map is not None:
+        def find(net: str) -> str:
+            component_id, _, port = net.partition('.')
+            root = net_map.find((component_id, port))
+            return f"{root[0]}.{root[1]}" if root else net
+    else:
+        parent: Dict[str, str] = {}
+
+        def find(net: str) -> str:
+            while parent.get(net, net) != net:
+                parent[net] = parent.get(parent[net], parent[net])
+                net = parent[net]
+            return net
+
+        for connection in component_manager.connections:
+            a = f"{connection['from_component']}.{connection['from_port']}"
+            b = f"{connection['to_component']}.{connection['to_port']}"
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[root_b] = root_a
+
+    netlist = GateNetlist("components")
+    for component_id, part in parts.items():
+        pins = {pin for _, inputs, output in SERIES_74[part]
+                for pin in [p.lstrip('~') for p in inputs] + [output]}
+        netlist.add_part(part, f"{component_id}.", {pin: find(f"{component_id}.{pin}") for pin in pins})
+    netlist.levelize()
+    return netlist
+
+__all__ = ['GateNetlist', 'SERIES_74', 'normalize_part', 'exhaustive_pattern',
+           'compare_netlists', 'netlist_from_components']
@@ -0,0 +1,142 @@
+"""
+X-Seti - October18 2026 - Input Journal
+Cycle-stamped stimulus recording, replay and per-frame state hashing
+"""
+#this goes in core/
+
+import json
+import zlib
+from array import array
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional, Tuple
+
+from core.memory import MemoryBlock, PAGE_SHIFT, PAGE_SIZE, get_component_memory
+
+JOURNAL_VERSION = 1
+DEFAULT_FRAME_CYCLES = 20000
+
+@dataclass
+class InputEvent:
+    """One external stimulus - applied before the components run on the cycle it is stamped with
+
+    Inputs that arrive after the components of cycle N have run (event queue
+    handlers such as tape edges, frame callbacks) are stamped N + 1, the first
+    cycle that sees them.
+    """
+    cycle: int
+    kind: str  # signal, bus, state
+    target: str  # signal / bus name or component id
+    value: Any
+    key: str = ""  # bus driver id or component state key
+    source: str = "manual"  # manual, keyboard, joystick, tape...
+
+class StateHasher:
+    """crc32 of net values and component memory at a frame boundary
+
+    Memory is hashed per 256-byte page and only pages written since the
+    previous frame are re-hashed, so a frame costs little more than the
+    signal values when the program is running out of a few pages.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._pages: Dict[str, Tuple[MemoryBlock, int, array]] = {}  # id -> (block, token, page crcs)
+
+    def reset(self):
+        """Forget cached page hashes - the next frame hashes everything"""
+        self._pages.clear()
+
+    def memory_hash(self, key: str, block: MemoryBlock) -> int:
+        """Hash of a memory block, re-hashing only dirty pages"""
+        cached = self._pages.get(key)
+        if cached is None or cached[0] is not block or len(cached[2]) != block.page_count:
+            crcs = array('I', [0]) * block.page_count
+            dirty = range(block.page_count)
+        else:
+            _, token, crcs = cached
+            dirty = block.dirty_pages(token)
+
+        view = block.view
+        for page in dirty:
+            start = page << PAGE_SHIFT
+            crcs[page] = zlib.crc32(view[start:start + PAGE_SIZE])
+        self._pages[key] = (block, block.checkpoint(), crcs)
+        return zlib.crc32(crcs.tobytes())
+
+    def frame_hash(self) -> int:
+        """Combined hash of every signal, bus and component memory"""
+        engine = self.engine
+        crc = 0
+        for name in sorted(engine.signals):
+            crc = zlib.crc32(f"{name}={engine.signals[name].value};".encode(), crc)
+        for name in sorted(engine.buses):
+            crc = zlib.crc32(f"{name}={engine.buses[name].read_bus()};".encode(), crc)
+        components = engine.component_manager.components
+        for component_id in sorted(components):
+            block = get_component_memory(components[component_id])
+            if block is not None:
+                crc = zlib.crc32(self.memory_hash(component_id, block).to_bytes(4, 'little'), crc)
+        return crc
+
+class InputJournal:
+    """Recorded stimulus plus the expected state hash at each frame boundary"""
+
+    def __init__(self, frame_cycles: int = DEFAULT_FRAME_CYCLES):
+        self.frame_cycles = max(1, frame_cycles)
+        self.events: List[InputEvent] = []
+        self.frames: List[Tuple[int, int]] = []  # (cycle, hash)
+        self.metadata: Dict[str, Any] = {}
+
+    def record(self, cycle: int, kind: str, target: str, value: Any, key: str = "",
+               source: str = "manual"):
+        self.events.append(InputEvent(cycle, kind, target, value, key, source))
+
+    def add_frame(self, cycle: int, state_hash: int):
+        self.frames.append((cycle, state_hash))
+
+    def get_summary(self) -> Dict[str, Any]:
+        sources: Dict[str, int] = {}
+        for event in self.events:
+            sources[event.source] = sources.get(event.source, 0) + 1
+        return {
+            'events': len(self.events),
+            'frames': len(self.frames),
+            'frame_cycles': self.frame_cycles,
+            'last_cycle': self.frames[-1][0] if self.frames else 0,
+            'sources': sources
+        }
+
+    def save(self, filename: str) -> bool:
+        """Save as JSON - small enough to attach to a bug report"""
+        try:
+            data = {
+                'version': JOURNAL_VERSION,
+                'frame_cycles': self.frame_cycles,
+                'metadata': self.metadata,
+                'events': [asdict(event) for event in self.events],
+                'frames': [[cycle, f"{state_hash:08x}"] for cycle, state_hash in self.frames]
+            }
+            with open(filename, 'w') as f:
+                json.dump(data, f, indent=1)
+            print(f"✓ Input journal saved to {filename}")
+            return True
+        except (OSError, TypeError) as e:
+            print(f"⚠️ Error saving input journal: {e}")
+            return False
+
+    @classmethod
+    def load(cls, filename: str) -> Optional['InputJournal']:
+        try:
+            with open(filename, 'r') as f:
+                data = json.load(f)
+            journal = cls(data.get('frame_cycles', DEFAULT_FRAME_CYCLES))
+            journal.metadata = data.get('metadata', {})
+            journal.events = [InputEvent(**event) for event in data.get('events', [])]
+            journal.frames = [(cycle, int(state_hash, 16)) for cycle, state_hash in data.get('frames', [])]
+            print(f"✓ Input journal loaded: {len(journal.events)} events, {len(journal.frames)} frames")
+            return journal
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            print(f"⚠️ Error loading input journal: {e}")
+            return None
+
+__all__ = ['InputEvent', 'StateHasher', 'InputJournal', 'DEFAULT_FRAME_CYCLES']
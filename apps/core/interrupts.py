@@ -0,0 +1,164 @@
+"""
+X-Seti - October18 2026 - Interrupt Controller
+Scheduled interrupt sources with a pending mask
+"""
+#this goes in core/
+
+import heapq
+import itertools
+from typing import Dict, List, Any, Optional, Tuple, Callable
+
+NEVER = 1 << 62  # deadline used when nothing is scheduled
+
+# Frame interrupts in CPU cycles
+ULA_48K_FRAME = 69888  # ZX Spectrum 48K 50Hz INT at 3.5MHz
+VIC_PAL_FRAME = 63 * 312  # C64 PAL raster frame
+VIC_NTSC_FRAME = 65 * 263
+
+class InterruptController:
+    """Shared interrupt/timer service for an engine
+
+    Devices register a source once and then either schedule the cycle of the
+    next assertion or assert it directly. The engine compares the current
+    cycle with next_deadline once per cycle, so no device polls its counters.
+    CPUs check a single integer - `pending & enabled`, or pending_for(line).
+    """
+
+    LINES = ('irq', 'nmi', 'firq')
+
+    def __init__(self, engine=None):
+        self.engine = engine
+        self.sources: Dict[str, int] = {}  # name -> bit
+        self.line_masks: Dict[str, int] = {line: 0 for line in self.LINES}
+        self.pending = 0
+        self.enabled = ~0
+        self.next_deadline = NEVER
+        self.periodic: Dict[str, Tuple[int, int]] = {}  # name -> (period, phase)
+        self.handlers: Dict[str, Callable[[int], None]] = {}  # name -> called with the due cycle
+        self.waiters: List[str] = []  # components woken by any new interrupt
+        self.raised = 0
+        self._deadlines: List[Tuple[int, int, str]] = []  # heap of (cycle, sequence, name)
+        self._scheduled: Dict[str, int] = {}  # name -> cycle of its live heap entry
+        self._sequence = itertools.count()
+
+    def register_source(self, name: str, line: str = 'irq',
+                        handler: Optional[Callable[[int], None]] = None) -> int:
+        """Add a source on an interrupt line - returns its pending-mask bit
+        
+        The optional handler runs when a scheduled assertion fires, e.g. to
+        re-arm a timer with its latch value.
+        """
+        if line not in self.line_masks:
+            raise ValueError(f"Unknown interrupt line: {line}")
+        bit = self.sources.get(name)
+        if bit is None:
+            bit = 1 << len(self.sources)
+            self.sources[name] = bit
+        for mask_line in self.line_masks:
+            self.line_masks[mask_line] &= ~bit
+        self.line_masks[line] |= bit
+        if handler:
+            self.handlers[name] = handler
+        return bit
+
+    def _bit(self, name: str) -> int:
+        bit = self.sources.get(name)
+        if bit is None:
+            bit = self.register_source(name)
+        return bit
+
+    # Assertion
+
+    def assert_source(self, name: str):
+        """Raise a source now"""
+        bit = self._bit(name)
+        if not self.pending & bit:
+            self.pending |= bit
+            self.raised += 1
+            if self.engine:
+                for component_id in self.waiters:
+                    self.engine.wake_component(component_id)
+                self.engine.emit_event('interrupt', name)
+
+    def acknowledge(self, name: str):
+        """Drop a source - CPU acknowledge or the device's status register being read"""
+        bit = self.sources.get(name, 0)
+        self.pending &= ~bit
+
+    def pending_for(self, line: str = 'irq') -> int:
+        """Enabled pending sources on one line - zero when nothing is due"""
+        return self.pending & self.enabled & self.line_masks[line]
+
+    def pending_sources(self) -> List[str]:
+        return [name for name, bit in self.sources.items() if self.pending & bit]
+
+    def set_enabled(self, name: str, enabled: bool):
+        bit = self._bit(name)
+        self.enabled = (self.enabled | bit) if enabled else (self.enabled & ~bit)
+
+    def wake_on_interrupt(self, component_id: str):
+        """Wake a sleeping component (a halted CPU) whenever a source is raised"""
+        if component_id not in self.waiters:
+            self.waiters.append(component_id)
+
+    # Scheduling
+
+    def schedule(self, name: str, cycle: int):
+        """Raise a source at an absolute cycle - replaces any earlier schedule for it"""
+        self._bit(name)
+        self._scheduled[name] = cycle
+        heapq.heappush(self._deadlines, (cycle, next(self._sequence), name))
+        if cycle < self.next_deadline:
+            self.next_deadline = cycle
+
+    def cancel(self, name: str):
+        """Drop the pending schedule of a source (a stale heap entry is skipped later)"""
+        self._scheduled.pop(name, None)
+        self.periodic.pop(name, None)
+
+    def schedule_periodic(self, name: str, period: int, phase: int = 0, line: str = 'irq'):
+        """Raise a source every period cycles, first at cycle `phase`"""
+        self.register_source(name, line)
+        self.periodic[name] = (period, phase)
+        current = self.engine.current_cycle if self.engine else 0
+        first = phase if phase >= current else current + (period - (current - phase) % period) % period
+        self.schedule(name, first)
+
+    def service(self, cycle: int):
+        """Raise every source due by `cycle` - called by the engine at next_deadline"""
+        heap = self._deadlines
+        while heap and heap[0][0] <= cycle:
+            due, _, name = heapq.heappop(heap)
+            if self._scheduled.get(name) != due:
+                continue  # rescheduled or cancelled
+            del self._scheduled[name]
+            self.assert_source(name)
+            if name in self.periodic:
+                self.schedule(name, due + self.periodic[name][0])
+            handler = self.handlers.get(name)
+            if handler:
+                handler(due)
+        self.next_deadline = heap[0][0] if heap else NEVER
+
+    def reset(self):
+        """Clear pending state and restart periodic sources from cycle 0"""
+        self.pending = 0
+        self.enabled = ~0
+        self._deadlines.clear()
+        self._scheduled.clear()
+        self.next_deadline = NEVER
+        for name, (period, phase) in self.periodic.items():
+            self._scheduled[name] = phase
+            heapq.heappush(self._deadlines, (phase, next(self._sequence), name))
+        if self._deadlines:
+            self.next_deadline = self._deadlines[0][0]
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            'sources': len(self.sources),
+            'pending': self.pending_sources(),
+            'raised': self.raised,
+            'next_deadline': None if self.next_deadline == NEVER else self.next_deadline
+        }
+
+__all__ = ['InterruptController', 'NEVER', 'ULA_48K_FRAME', 'VIC_PAL_FRAME', 'VIC_NTSC_FRAME']
@@ -0,0 +1,267 @@
+"""
+X-Seti - October18 2026 - Lazy Counters
+Peripheral timers computed from the cycle delta instead of decremented every cycle
+"""
+#this goes in core/
+
+from typing import Dict, List, Any, Optional
+
+from core.interrupts import InterruptController
+
+class LazyCounter:
+    """Free-running down counter evaluated on read
+
+    Stores the value and cycle it started from; the current value, the number
+    of underflows and the cycle of the next underflow are all arithmetic on
+    the cycle delta. With a controller, each underflow is scheduled on it in
+    advance, so the peripheral does no per-cycle work at all.
+
+    The counter steps every `prescale` cycles, counts start_value..0, spends
+    `reload_delay` steps at 0xFFFF (the 6522 quirk), then reloads.
+    """
+
+    def __init__(self, reload: int = 0xFFFF, width: int = 16, prescale: int = 1,
+                 reload_delay: int = 0, controller: Optional[InterruptController] = None,
+                 source: str = "", line: str = 'irq'):
+        self.mask = (1 << width) - 1
+        self.reload = reload & self.mask
+        self.prescale = max(1, prescale)
+        self.reload_delay = reload_delay
+        self.controller = controller
+        self.source = source
+        self.repeat = True  # schedule every underflow, not just the next one
+        self.running = False
+        self.underflow_count = 0  # underflows serviced by the controller
+        self._start_cycle = 0
+        self._start_value = self.reload
+        self._underflow_base = 0  # underflows before the last rebase
+        if controller:
+            controller.register_source(source, line, self._on_scheduled_underflow)
+
+    @property
+    def period(self) -> int:
+        """Steps between underflows once reloading"""
+        return self.reload + 1 + self.reload_delay
+
+    def ticks(self, cycle: int) -> int:
+        """Steps since the start point"""
+        return (cycle - self._start_cycle) // self.prescale
+
+    def value(self, cycle: int) -> int:
+        """Counter value at a cycle"""
+        if not self.running:
+            return self._start_value
+        ticks = self.ticks(cycle)
+        if ticks <= self._start_value:
+            return self._start_value - ticks
+        phase = (ticks - self._start_value - 1) % self.period
+        if phase < self.reload_delay:
+            return (-1 - phase) & self.mask
+        return self.reload - (phase - self.reload_delay)
+
+    def underflows(self, cycle: int) -> int:
+        """Underflows since the counter was last loaded"""
+        if not self.running:
+            return self._underflow_base
+        ticks = self.ticks(cycle)
+        if ticks <= self._start_value:
+            return self._underflow_base
+        return self._underflow_base + 1 + (ticks - self._start_value - 1) // self.period
+
+    def next_underflow(self, after: int) -> Optional[int]:
+        """First cycle after `after` at which the counter underflows"""
+        if not self.running:
+            return None
+        first = self._start_cycle + (self._start_value + 1) * self.prescale
+        if after < first:
+            return first
+        span = self.period * self.prescale
+        return first + ((after - first) // span + 1) * span
+
+    def start(self, cycle: int):
+        if self.running:
+            return
+        self.running = True
+        self._start_cycle = cycle
+        self._schedule(cycle - 1)
+
+    def stop(self, cycle: int):
+        """Freeze the counter at its current value"""
+        if not self.running:
+            return
+        self._rebase(cycle)
+        self.running = False
+        if self.controller:
+            self.controller.cancel(self.source)
+
+    def load(self, cycle: int, value: Optional[int] = None):
+        """Put a new value in the counter (the reload value by default)"""
+        self._underflow_base = 0
+        self._start_cycle = cycle
+        self._start_value = (self.reload if value is None else value) & self.mask
+        if self.running:
+            self._schedule(cycle - 1)
+
+    def set_prescale(self, prescale: int, cycle: int):
+        """Change the step rate without losing the current count"""
+        self._rebase(cycle)
+        self.prescale = max(1, prescale)
+        if self.running:
+            self._schedule(cycle - 1)
+
+    def reset(self):
+        if self.controller:
+            self.controller.cancel(self.source)
+        self.running = False
+        self.underflow_count = 0
+        self._underflow_base = 0
+        self._start_cycle = 0
+        self._start_value = self.reload
+
+    def _rebase(self, cycle: int):
+        """Move the start point to `cycle`, keeping value and underflow count"""
+        if self.running:
+            self._start_value, self._underflow_base = self.value(cycle), self.underflows(cycle)
+            self._start_cycle = cycle
+
+    def _schedule(self, after: int):
+        if self.controller:
+            due = self.next_underflow(after)
+            if due is not None:
+                self.controller.schedule(self.source, due)
+
+    def _on_scheduled_underflow(self, cycle: int):
+        self.underflow_count += 1
+        self.on_underflow(cycle)
+        if self.repeat and self.running:
+            self._schedule(cycle)
+
+    def on_underflow(self, cycle: int):
+        """Hook for subclasses - runs when a scheduled underflow fires"""
+
+class CIATimer(LazyCounter):
+    """6526 timer A/B - one-shot mode stops with the latch loaded"""
+
+    def __init__(self, controller: InterruptController, source: str, line: str = 'irq'):
+        super().__init__(0xFFFF, controller=controller, source=source, line=line)
+
+    @property
+    def latch(self) -> int:
+        return self.reload
+
+    @property
+    def continuous(self) -> bool:
+        return self.repeat
+
+    def read(self, cycle: int) -> int:
+        return self.value(cycle)
+
+    def value(self, cycle: int) -> int:
+        if self.running and not self.repeat and self.ticks(cycle) > self._start_value:
+            return self.reload  # one-shot underflow reloads and stops
+        return super().value(cycle)
+
+    def write_latch(self, value: int, cycle: int):
+        """Set the reload value - a stopped timer also loads it (as the 6526 does)"""
+        self.reload = value & 0xFFFF
+        if not self.running:
+            self._start_value = self.reload
+
+    def start(self, cycle: int, continuous: Optional[bool] = None):
+        if continuous is not None:
+            self.repeat = continuous
+        super().start(cycle)
+
+    def on_underflow(self, cycle: int):
+        if not self.repeat:
+            self.running = False
+            self._start_value = self.reload
+
+class VIATimer(LazyCounter):
+    """6522 timer 1 or 2
+
+    T1 counts N..0, 0xFFFF, then reloads the latch (N+2 cycles a period) and
+    interrupts once or on every underflow (free-run). T2 interrupts once and
+    keeps rolling down through 0xFFFF without reloading.
+    """
+
+    def __init__(self, controller: InterruptController, source: str, timer: int = 1,
+                 line: str = 'irq'):
+        super().__init__(0xFFFF, reload_delay=1 if timer == 1 else 0,
+                         controller=controller, source=source, line=line)
+        self.timer = timer
+        self.repeat = False
+        self.running = True  # 6522 counters never stop
+
+    @property
+    def free_run(self) -> bool:
+        return self.repeat
+
+    @free_run.setter
+    def free_run(self, enabled: bool):
+        self.repeat = enabled and self.timer == 1
+
+    def read(self, cycle: int) -> int:
+        """Reading the low counter byte clears the interrupt - done by the caller"""
+        return self.value(cycle)
+
+    def write_latch(self, value: int):
+        if self.timer == 1:
+            self.reload = value & 0xFFFF
+
+    def write_counter(self, value: int, cycle: int):
+        """Write to the high counter byte - load and arm the interrupt"""
+        if self.controller:
+            self.controller.acknowledge(self.source)
+        if self.timer == 1:
+            self.reload = value & 0xFFFF
+            self.load(cycle)
+        else:
+            self.load(cycle, value)
+
+    def reset(self):
+        super().reset()
+        self.running = True
+
+class AYEnvelope(LazyCounter):
+    """AY-3-8910 envelope generator - 16 steps per cycle, shape from R13
+
+    The step counter is a 4-bit lazy counter; the envelope level is derived
+    from its position and the number of completed cycles when read.
+    """
+
+    def __init__(self, cycles_per_clock: int = 1):
+        super().__init__(15, width=4, prescale=16 * cycles_per_clock)
+        self.cycles_per_clock = cycles_per_clock
+        self.shape = 0
+        self.envelope_period = 1
+
+    def set_period(self, period: int, cycle: int):
+        """R11/R12 - each step lasts 16 * period AY clocks"""
+        self.envelope_period = max(1, period)
+        self.set_prescale(16 * self.envelope_period * self.cycles_per_clock, cycle)
+
+    def write_shape(self, shape: int, cycle: int):
+        """R13 - restarts the envelope"""
+        self.shape = shape & 0x0F
+        self.running = True
+        self.load(cycle)
+
+    def volume(self, cycle: int) -> int:
+        """Envelope level 0-15 at a cycle"""
+        if not self.running:
+            return 0
+        position = 15 - self.value(cycle)
+        completed = self.underflows(cycle)
+        attack = bool(self.shape & 0x04)
+        if completed == 0:
+            return position if attack else 15 - position
+        if not self.shape & 0x08:  # CONTINUE clear - drop to 0 and stay
+            return 0
+        alternate = bool(self.shape & 0x02)
+        if self.shape & 0x01:  # HOLD
+            return 15 if attack != alternate else 0
+        rising = attack != (alternate and completed % 2 == 1)
+        return position if rising else 15 - position
+
+__all__ = ['LazyCounter', 'CIATimer', 'VIATimer', 'AYEnvelope']
@@ -0,0 +1,135 @@
+"""
+X-Seti - October18 2026 - Memory Subsystem
+Byte-addressable memory blocks with per-page write tracking
+"""
+#this goes in core/
+
+from array import array
+from typing import List, Optional, Iterable, Union
+
+PAGE_SHIFT = 8
+PAGE_SIZE = 1 << PAGE_SHIFT
+
+class MemoryBlock:
+    """RAM/ROM contents backed by a bytearray
+
+    Every write stamps its page with the current generation. Consumers call
+    checkpoint() and later ask which pages were written since, so several viewers
+    can track changes independently without clearing each other's state.
+    """
+
+    def __init__(self, size: int, name: str = "", read_only: bool = False,
+                 data: Optional[bytearray] = None):
+        self.name = name
+        self.read_only = read_only
+        self.data = data if data is not None else bytearray(size)
+        self.size = len(self.data)
+        self.view = memoryview(self.data)
+        self.page_count = (self.size + PAGE_SIZE - 1) >> PAGE_SHIFT
+        self.page_generation = array('L', [0]) * self.page_count
+        self.generation = 1
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __deepcopy__(self, memo) -> 'MemoryBlock':
+        """Independent contents (memoryviews can't be deep-copied directly)"""
+        block = MemoryBlock(self.size, self.name, self.read_only, bytearray(self.data))
+        block.page_generation = array('L', self.page_generation)
+        block.generation = self.generation
+        return block
+
+    def __getitem__(self, key: Union[int, slice]):
+        return self.data[key]
+
+    def __setitem__(self, key: Union[int, slice], value):
+        """Raw store - used by loaders, bypasses the read-only flag but still tracks pages"""
+        self.data[key] = value
+        if isinstance(key, slice):
+            start, stop, _ = key.indices(self.size)
+            self._mark(start, stop - start)
+        else:
+            self.page_generation[(key % self.size) >> PAGE_SHIFT] = self.generation
+
+    # === Access ===
+
+    def read(self, address: int) -> int:
+        return self.data[address]
+
+    def write(self, address: int, value: int) -> bool:
+        """CPU-side write - ignored for ROM"""
+        if self.read_only:
+            return False
+        self.data[address] = value & 0xFF
+        self.page_generation[address >> PAGE_SHIFT] = self.generation
+        return True
+
+    def read_block(self, address: int, length: int) -> memoryview:
+        """Zero-copy view of a range"""
+        return self.view[address:address + length]
+
+    def write_block(self, address: int, data: Iterable[int]) -> int:
+        """Write several bytes - returns the number written"""
+        if self.read_only:
+            return 0
+        data = bytes(data)
+        length = min(len(data), self.size - address)
+        self.data[address:address + length] = data[:length]
+        self._mark(address, length)
+        return length
+
+    def load(self, data: bytes, offset: int = 0):
+        """Fill from an image (ROM dump, snapshot...)"""
+        length = min(len(data), self.size - offset)
+        self.data[offset:offset + length] = data[:length]
+        self._mark(offset, length)
+
+    def fill(self, value: int = 0):
+        self.data[:] = bytes([value & 0xFF]) * self.size
+        self._mark(0, self.size)
+
+    def _mark(self, address: int, length: int):
+        if length <= 0:
+            return
+        generation = self.generation
+        pages = self.page_generation
+        for page in range(address >> PAGE_SHIFT, ((address + length - 1) >> PAGE_SHIFT) + 1):
+            pages[page] = generation
+
+    # === Change tracking ===
+
+    def checkpoint(self) -> int:
+        """Start a new tracking interval - returns the token for dirty_pages()"""
+        token = self.generation
+        self.generation += 1
+        return token
+
+    def is_page_dirty(self, page: int, since: int) -> bool:
+        return self.page_generation[page] > since
+
+    def dirty_pages(self, since: int, first_page: int = 0, last_page: Optional[int] = None) -> List[int]:
+        """Pages written after checkpoint `since`, optionally limited to a page range"""
+        if last_page is None:
+            last_page = self.page_count - 1
+        pages = self.page_generation
+        return [page for page in range(first_page, min(last_page, self.page_count - 1) + 1)
+                if pages[page] > since]
+
+def get_component_memory(component) -> Optional[MemoryBlock]:
+    """Memory of a component - MemoryComponent.get_memory() or a plain memory attribute"""
+    if component is None:
+        return None
+    if hasattr(component, 'get_memory'):
+        return component.get_memory()
+    memory = getattr(component, 'memory', None)
+    if isinstance(memory, MemoryBlock):
+        return memory
+    if isinstance(memory, (bytearray, bytes)):
+        # Wrap in place so later writes through the block are seen by the component
+        block = MemoryBlock(0, getattr(component, 'name', ''), data=bytearray(memory)
+                            if isinstance(memory, bytes) else memory)
+        component.memory = block
+        return block
+    return None
+
+__all__ = ['MemoryBlock', 'get_component_memory', 'PAGE_SIZE', 'PAGE_SHIFT']
@@ -0,0 +1,220 @@
+"""
+X-Seti - October18 2026 - Live Net Map
+Incremental union-find nets over the connection store with local re-splitting
+"""
+#this goes in core/
+
+import itertools
+from collections import deque
+from typing import Dict, List, Any, Optional, Tuple, Set, Callable, Iterable
+
+from core.connection_store import ConnectionStore
+
+Pin = Tuple[str, str]  # (component id, port name)
+
+class NetMap:
+    """Sets of electrically connected pins, kept current as the store changes
+
+    Joining two nets is a union (smaller into larger) and lookups use path
+    compression. Removing a connection re-walks only the net it belonged to,
+    over the store's per-port adjacency, and splits it if it fell apart.
+    Pins with no connections are not in any net.
+
+    Events: 'net_created', 'net_merged', 'net_split', 'net_removed' - handlers
+    get a dict with the net ids involved ('net' is None when everything was cleared).
+    """
+
+    def __init__(self, store: ConnectionStore):
+        self.store = store
+        self._parent: Dict[Pin, Pin] = {}
+        self._members: Dict[Pin, Set[Pin]] = {}  # root -> pins
+        self._net_ids: Dict[Pin, int] = {}  # root -> stable net id
+        self._next_id = itertools.count(1)
+        self.event_handlers: Dict[str, List[Callable]] = {}
+        self.attach(store)
+        
+    def attach(self, store: ConnectionStore):
+        """Follow a (new) connection store"""
+        if self.store is not store:
+            self.store.remove_observer(self)
+            self.store = store
+        store.add_observer(self)
+        self.rebuild()
+
+    def add_event_handler(self, event_type: str, handler: Callable):
+        self.event_handlers.setdefault(event_type, [])
+        if handler not in self.event_handlers[event_type]:
+            self.event_handlers[event_type].append(handler)
+
+    def remove_event_handler(self, event_type: str, handler: Callable):
+        if handler in self.event_handlers.get(event_type, []):
+            self.event_handlers[event_type].remove(handler)
+
+    def emit_event(self, event_type: str, data: Any = None):
+        for handler in self.event_handlers.get(event_type, []):
+            try:
+                handler(data)
+            except Exception as e:
+                print(f"⚠️ Error in net map handler for {event_type}: {e}")
+
+    # Union-find
+
+    def find(self, pin: Pin) -> Optional[Pin]:
+        """Root pin of a pin's net (path compressed), None if unconnected"""
+        parent = self._parent
+        if pin not in parent:
+            return None
+        root = pin
+        while parent[root] != root:
+            root = parent[root]
+        while parent[pin] != root:
+            parent[pin], pin = root, parent[pin]
+        return root
+
+    def _add_pin(self, pin: Pin) -> Pin:
+        if pin not in self._parent:
+            self._parent[pin] = pin
+            self._members[pin] = {pin}
+        return self.find(pin)
+
+    def _new_net(self, root: Pin) -> int:
+        net_id = next(self._next_id)
+        self._net_ids[root] = net_id
+        return net_id
+
+    def rebuild(self):
+        """Recompute everything from the store - used after bulk loads"""
+        self._parent.clear()
+        self._members.clear()
+        self._net_ids.clear()
+        for record in self.store:
+            self._union(*self._ends(record), emit=False)
+
+    @staticmethod
+    def _ends(record: Dict[str, Any]) -> Tuple[Pin, Pin]:
+        return (record['from_component'], record['from_port']), (record['to_component'], record['to_port'])
+
+    # Store observer callbacks
+    
+    def connections_cleared(self):
+        self.rebuild()
+        self.emit_event('net_removed', {'net': None})
+
+    def connection_added(self, record: Dict[str, Any]):
+        self._union(*self._ends(record))
+
+    def _union(self, a: Pin, b: Pin, emit: bool = True):
+        new_a, new_b = a not in self._parent, b not in self._parent
+        root_a, root_b = self._add_pin(a), self._add_pin(b)
+        if root_a == root_b:
+            return
+        if new_a and new_b:
+            self._parent[b] = a
+            self._members[a].add(b)
+            del self._members[b]
+            net_id = self._new_net(a)
+            if emit:
+                self.emit_event('net_created', {'net': net_id})
+            return
+
+        # Smaller set joins the larger; the larger keeps its net id
+        if len(self._members[root_a]) < len(self._members[root_b]):
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._members[root_a] |= self._members.pop(root_b)
+        kept = self._net_ids.get(root_a) or self._new_net(root_a)
+        absorbed = self._net_ids.pop(root_b, None)
+        if emit:
+            self.emit_event('net_merged', {'net': kept, 'absorbed': absorbed})
+
+    def connection_removed(self, record: Dict[str, Any]):
+        """Re-split the net of a removed connection if its ends are no longer joined"""
+        a, b = self._ends(record)
+        root = self.find(a)
+        if root is None or root != self.find(b):
+            return
+        net_id = self._net_ids.get(root)
+        pins = self._members[root]
+
+        # Walk from each end over the remaining connections
+        parts: List[Set[Pin]] = []
+        seen: Set[Pin] = set()
+        for start in (a, b):
+            if start in seen:
+                continue
+            part = self._reach(start)
+            seen |= part
+            parts.append(part)
+        leftover = pins - seen  # only possible if the store changed behind our back
+        if leftover:
+            parts.append(leftover)
+        if len(parts) == 1:
+            return
+
+        # Largest part keeps the net id, singletons drop out of the map
+        parts.sort(key=len, reverse=True)
+        del self._members[root]
+        self._net_ids.pop(root, None)
+        created = []
+        for index, part in enumerate(parts):
+            if len(part) == 1:
+                pin = next(iter(part))
+                del self._parent[pin]
+                continue
+            new_root = next(iter(part))
+            for pin in part:
+                self._parent[pin] = new_root
+            self._members[new_root] = part
+            if index == 0 and net_id is not None:
+                self._net_ids[new_root] = net_id
+            else:
+                created.append(self._new_net(new_root))
+        if len(parts[0]) == 1:
+            self.emit_event('net_removed', {'net': net_id})
+        else:
+            self.emit_event('net_split', {'net': net_id, 'created': created})
+
+    def _reach(self, start: Pin) -> Set[Pin]:
+        """Pins connected to start through the store's adjacency"""
+        reached = {start}
+        queue = deque([start])
+        while queue:
+            for other in self.store.port_neighbours(*queue.popleft()):
+                if other not in reached:
+                    reached.add(other)
+                    queue.append(other)
+        return reached
+
+    # Queries
+
+    def net_id(self, pin: Pin) -> Optional[int]:
+        root = self.find(pin)
+        return self._net_ids.get(root) if root is not None else None
+
+    def net_pins(self, pin: Pin) -> Set[Pin]:
+        """All pins on the same net as pin (just the pin when unconnected)"""
+        root = self.find(pin)
+        return set(self._members[root]) if root is not None else {pin}
+
+    def same_net(self, a: Pin, b: Pin) -> bool:
+        root = self.find(a)
+        return root is not None and root == self.find(b)
+
+    def nets(self) -> Dict[int, Set[Pin]]:
+        """Net id -> pins"""
+        return {self._net_ids[root]: set(pins) for root, pins in self._members.items()
+                if root in self._net_ids}
+
+    def nets_of_component(self, component_id: str) -> Dict[str, int]:
+        """Port -> net id for every connected port of a component"""
+        result = {}
+        for record in self.store.for_component(component_id):
+            for pin in self._ends(record):
+                if pin[0] == component_id:
+                    result[pin[1]] = self.net_id(pin)
+        return result
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+__all__ = ['NetMap', 'Pin']
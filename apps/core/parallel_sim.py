@@ -0,0 +1,381 @@
+"""
+X-Seti - October18 2026 - Partitioned Parallel Simulation
+Conservative lookahead-synchronized gate simulation across worker processes
+"""
+#this goes in core/
+
+import heapq
+import time
+import random
+import multiprocessing
+from typing import Dict, List, Any, Optional, Tuple
+
+from core.gate_sim import GateNetlist
+from core.partitioner import partition_netlist
+
+# (time, net, value) - stimulus, boundary messages and trace entries all use this shape
+Event = Tuple[int, str, int]
+
+def _eval_gate(kind: str, args: List[int]) -> int:
+    """Single-vector gate evaluation on 0/1 values"""
+    if kind == 'AND' or kind == 'NAND':
+        result = 1
+        for arg in args:
+            result &= arg
+    elif kind == 'OR' or kind == 'NOR':
+        result = 0
+        for arg in args:
+            result |= arg
+    elif kind == 'XOR' or kind == 'XNOR':
+        result = 0
+        for arg in args:
+            result ^= arg
+    elif kind == 'MUX':
+        select, a, b = args
+        result = b if select else a
+    elif kind == 'NOT':
+        result = args[0] ^ 1
+    else:
+        result = args[0]
+    if kind in ('NAND', 'NOR', 'XNOR'):
+        result ^= 1
+    return result
+
+class PartitionSimulator:
+    """Event-driven timed simulation of a set of gates
+
+    Every gate output changes `delay` time units after the inputs that caused
+    it. All events at one time are applied before any gate is evaluated, so the
+    result does not depend on event order. Outputs listed in `routes` are also
+    sent to the partitions that read them.
+    """
+
+    def __init__(self, gates: List[Tuple[str, List[str], str, int]],
+                 routes: Optional[Dict[str, List[int]]] = None):
+        self.gates = gates
+        self.routes = routes or {}
+        self.values: Dict[str, int] = {}
+        self.projected: Dict[str, int] = {}  # value after every pending event
+        self.owned = {gate[2] for gate in gates}
+        self.fanout: Dict[str, List[int]] = {}
+        for index, (kind, inputs, output, delay) in enumerate(gates):
+            if delay < 1:
+                raise ValueError(f"Gate driving {output} needs a delay of at least 1")
+            for pin in inputs:
+                self.fanout.setdefault(pin.lstrip('~'), []).append(index)
+        self.queue: List[Tuple[int, int, str, int]] = []
+        self._sequence = 0
+        self.outbox: Dict[int, List[Event]] = {}
+        self.trace: List[Event] = []
+        self.events_processed = 0
+
+        # Settle from all-zero nets - every gate is evaluated once at time 0
+        for index in range(len(gates)):
+            self._evaluate(index, 0)
+
+    def next_time(self) -> float:
+        return self.queue[0][0] if self.queue else float('inf')
+
+    def inject(self, events: List[Event]):
+        """Add stimulus or boundary-net changes from other partitions"""
+        for timestamp, net, value in events:
+            self._push(timestamp, net, value)
+
+    def _push(self, timestamp: int, net: str, value: int):
+        heapq.heappush(self.queue, (timestamp, self._sequence, net, value))
+        self._sequence += 1
+
+    def _evaluate(self, index: int, now: int):
+        kind, inputs, output, delay = self.gates[index]
+        values = self.values
+        args = [values.get(pin[1:], 0) ^ 1 if pin[0] == '~' else values.get(pin, 0) for pin in inputs]
+        result = _eval_gate(kind, args)
+        if result != self.projected.get(output, 0):
+            self.projected[output] = result
+            timestamp = now + delay
+            self._push(timestamp, output, result)
+            for partition in self.routes.get(output, ()):
+                self.outbox.setdefault(partition, []).append((timestamp, output, result))
+
+    def run_until(self, end_time: int) -> Tuple[Dict[int, List[Event]], List[Event]]:
+        """Process events before end_time - returns (outbox, trace) since the last call"""
+        queue = self.queue
+        values = self.values
+        fanout = self.fanout
+        while queue and queue[0][0] < end_time:
+            now = queue[0][0]
+            touched = set()
+            while queue and queue[0][0] == now:
+                _, _, net, value = heapq.heappop(queue)
+                self.events_processed += 1
+                if values.get(net, 0) == value:
+                    continue
+                values[net] = value
+                if net in self.owned:
+                    # Nets driven elsewhere are traced by their owner
+                    self.trace.append((now, net, value))
+                touched.update(fanout.get(net, ()))
+            for index in sorted(touched):
+                self._evaluate(index, now)
+
+        outbox, trace = self.outbox, self.trace
+        self.outbox, self.trace = {}, []
+        return outbox, trace
+
+def _gate_list(netlist: GateNetlist, indices: Optional[List[int]] = None) -> List[Tuple[str, List[str], str, int]]:
+    indices = range(len(netlist.gates)) if indices is None else indices
+    return [(netlist.gates[i][0], netlist.gates[i][1], netlist.gates[i][2],
+             netlist.delays.get(netlist.gates[i][2], 1)) for i in indices]
+
+def simulate_single(netlist: GateNetlist, stimulus: List[Event], until: int) -> List[Event]:
+    """Reference single-process run - trace of every gate output change"""
+    simulator = PartitionSimulator(_gate_list(netlist))
+    simulator.inject(stimulus)
+    _, trace = simulator.run_until(until)
+    trace.sort()
+    return trace
+
+def partition_gates(netlist: GateNetlist, parts: int) -> List[int]:
+    """Min-cut partition that keeps fast paths together - returns the partition of every gate
+
+    Uses core.partitioner.partition_netlist: links weigh 1/delay, so cuts land
+    on slow links and the lookahead stays large, while partitions stay within
+    5% of equal size.
+    """
+    count = len(netlist.gates)
+    parts = max(1, min(parts, count))
+    if parts == 1:
+        return [0] * count
+    return partition_netlist(netlist, parts)
+
+def _partition_worker(conn, gates, routes):
+    """Worker process loop - one PartitionSimulator driven by coordinator messages"""
+    simulator = PartitionSimulator(gates, routes)
+    while True:
+        message = conn.recv()
+        command = message[0]
+        if command == 'run':
+            _, end_time, incoming = message
+            simulator.inject(incoming)
+            outbox, trace = simulator.run_until(end_time)
+            conn.send((outbox, trace, simulator.next_time()))
+        elif command == 'next_time':
+            conn.send(simulator.next_time())
+        elif command == 'stats':
+            conn.send(simulator.events_processed)
+        else:
+            break
+    conn.close()
+
+class _LocalPartition:
+    """In-process stand-in for a worker connection - used for single-partition runs"""
+
+    def __init__(self, gates, routes):
+        self.simulator = PartitionSimulator(gates, routes)
+        self._reply = None
+
+    def send(self, message):
+        command = message[0]
+        if command == 'run':
+            _, end_time, incoming = message
+            self.simulator.inject(incoming)
+            outbox, trace = self.simulator.run_until(end_time)
+            self._reply = (outbox, trace, self.simulator.next_time())
+        elif command == 'next_time':
+            self._reply = self.simulator.next_time()
+        elif command == 'stats':
+            self._reply = self.simulator.events_processed
+
+    def recv(self):
+        return self._reply
+
+class PartitionedSimulator:
+    """Runs each netlist partition in its own process with conservative synchronization
+
+    Partitions only exchange changes of cut nets. A change scheduled at time t
+    can only cause a cut-net change at t + lookahead or later, where lookahead is
+    the smallest delay of any gate driving a cut net, so every partition can
+    simulate a window of `lookahead` time units without hearing from the others.
+    """
+
+    def __init__(self, netlist: GateNetlist, workers: int = 4, assignment: Optional[List[int]] = None):
+        self.netlist = netlist
+        self.assignment = assignment or partition_gates(netlist, workers)
+        self.partition_count = max(self.assignment) + 1 if self.assignment else 1
+        self.processes: List[Any] = []
+        self.connections: List[Any] = []
+        self.windows = 0
+
+        # Who reads which net, and which nets cross partitions
+        self.readers: Dict[str, set] = {}
+        for index, (_, inputs, _) in enumerate(netlist.gates):
+            for pin in inputs:
+                self.readers.setdefault(pin.lstrip('~'), set()).add(self.assignment[index])
+
+        self.routes: List[Dict[str, List[int]]] = [{} for _ in range(self.partition_count)]
+        cut_delays = []
+        for index, (_, _, output) in enumerate(netlist.gates):
+            owner = self.assignment[index]
+            remote = sorted(self.readers.get(output, set()) - {owner})
+            if remote:
+                self.routes[owner][output] = remote
+                cut_delays.append(netlist.delays.get(output, 1))
+        self.cut_nets = sum(len(routes) for routes in self.routes)
+        self.lookahead = min(cut_delays) if cut_delays else float('inf')
+
+    def start(self):
+        """Spawn one worker per partition - a single partition runs in-process"""
+        self.stop()
+        gates_by_partition = [[] for _ in range(self.partition_count)]
+        for index, partition in enumerate(self.assignment):
+            gates_by_partition[partition].append(index)
+
+        for partition, indices in enumerate(gates_by_partition):
+            gates = _gate_list(self.netlist, indices)
+            if self.partition_count == 1:
+                self.connections.append(_LocalPartition(gates, self.routes[partition]))
+                continue
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_partition_worker,
+                                              args=(child_conn, gates, self.routes[partition]), daemon=True)
+            process.start()
+            self.processes.append(process)
+            self.connections.append(parent_conn)
+
+    def stop(self):
+        for conn in self.connections:
+            try:
+                conn.send(('stop',))
+            except (OSError, BrokenPipeError):
+                pass
+        for process in self.processes:
+            process.join(timeout=2)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+        self.connections = []
+
+    def run(self, stimulus: List[Event], until: int) -> List[Event]:
+        """Simulate until `until` - returns the merged trace of gate output changes"""
+        if not self.connections:
+            self.start()
+
+        inboxes: List[List[Event]] = [[] for _ in range(self.partition_count)]
+        for event in stimulus:
+            for partition in self.readers.get(event[1], ()):
+                inboxes[partition].append(event)
+
+        next_times = []
+        for conn in self.connections:
+            conn.send(('next_time',))
+        for conn in self.connections:
+            next_times.append(conn.recv())
+
+        trace: List[Event] = []
+        while True:
+            pending = [min([next_times[p]] + [event[0] for event in inboxes[p]])
+                       for p in range(self.partition_count)]
+            window_start = min(pending)
+            if window_start >= until:
+                break
+            window_end = min(window_start + self.lookahead, until)
+            self.windows += 1
+
+            active = [p for p in range(self.partition_count) if pending[p] < window_end]
+            for p in active:
+                # Only events inside the window are needed now, later ones stay queued here
+                due = [event for event in inboxes[p] if event[0] < window_end]
+                inboxes[p] = [event for event in inboxes[p] if event[0] >= window_end]
+                self.connections[p].send(('run', window_end, due))
+            for p in active:
+                outbox, partition_trace, next_times[p] = self.connections[p].recv()
+                trace.extend(partition_trace)
+                for target, events in outbox.items():
+                    inboxes[target].extend(events)
+
+        trace.sort()
+        return trace
+
+    def get_statistics(self) -> Dict[str, Any]:
+        events = 0
+        for conn in self.connections:
+            conn.send(('stats',))
+        for conn in self.connections:
+            events += conn.recv()
+        return {
+            'partitions': self.partition_count,
+            'cut_nets': self.cut_nets,
+            'lookahead': self.lookahead,
+            'windows': self.windows,
+            'events_processed': events
+        }
+
+def build_cluster_netlist(clusters: int = 8, gates_per_cluster: int = 600,
+                          links_per_cluster: int = 4, link_delay: int = 40, seed: int = 1) -> GateNetlist:
+    """Synthetic multi-board system - busy clusters joined by a few slow links
+
+    Each cluster has free-running ring oscillators feeding random logic; links
+    are buffers with a long delay, like signals crossing an expansion connector.
+    """
+    rng = random.Random(seed)
+    netlist = GateNetlist("clusters")
+    for c in range(clusters):
+        nets = []
+        for r in range(4):
+            # 5-stage inverter ring with a per-ring delay so clusters do not lock step
+            ring = [f"c{c}.r{r}.{i}" for i in range(5)]
+            for i in range(5):
+                netlist.add_gate('NOT', [ring[i - 1]], ring[i], delay=1 + (r + c) % 3)
+            nets.extend(ring)
+        for g in range(gates_per_cluster - 20):
+            kind = rng.choice(('AND', 'OR', 'XOR', 'NAND', 'NOR'))
+            output = f"c{c}.g{g}"
+            netlist.add_gate(kind, rng.sample(nets[-60:], 2), output, delay=rng.randint(1, 3))
+            nets.append(output)
+    for c in range(clusters):
+        for link in range(links_per_cluster):
+            source = f"c{c}.g{rng.randrange(gates_per_cluster - 20)}"
+            target_cluster = (c + 1) % clusters
+            netlist.add_gate('BUF', [source], f"link{c}.{link}", delay=link_delay)
+            sink = f"c{target_cluster}.g{rng.randrange(gates_per_cluster - 20)}"
+            kind, inputs, output = netlist.gates[netlist._drivers[sink]]
+            inputs[0] = f"link{c}.{link}"
+    return netlist
+
+def benchmark_partitions(netlist: GateNetlist, until: int = 400,
+                         worker_counts=range(1, 9)) -> List[Dict[str, Any]]:
+    """Time the single-process reference and 1..8 worker runs, checking traces match"""
+    start = time.perf_counter()
+    reference = simulate_single(netlist, [], until)
+    single_time = time.perf_counter() - start
+    print(f"single process: {single_time:.3f}s, {len(reference)} changes")
+
+    results = []
+    for workers in worker_counts:
+        simulator = PartitionedSimulator(netlist, workers)
+        simulator.start()
+        start = time.perf_counter()
+        trace = simulator.run([], until)
+        elapsed = time.perf_counter() - start
+        stats = simulator.get_statistics()
+        simulator.stop()
+        result = {
+            'workers': workers,
+            'seconds': elapsed,
+            'speedup': single_time / elapsed if elapsed else 0.0,
+            'matches': trace == reference,
+            'cut_nets': stats['cut_nets'],
+            'lookahead': stats['lookahead'],
+            'windows': stats['windows']
+        }
+        results.append(result)
+        print(f"{workers} workers: {elapsed:.3f}s  x{result['speedup']:.2f}  "
+              f"cut={result['cut_nets']} lookahead={result['lookahead']} windows={result['windows']}  "
+              f"{'match' if result['matches'] else 'MISMATCH'}")
+    return results
+
+if __name__ == "__main__":
+    benchmark_partitions(build_cluster_netlist())
+
+__all__ = ['PartitionSimulator', 'PartitionedSimulator', 'simulate_single', 'partition_gates',
+           'build_cluster_netlist', 'benchmark_partitions']
@@ -0,0 +1,376 @@
+"""
+X-Seti - October18 2026 - Netlist Partitioner
+Multilevel k-way min-cut partitioning of the component graph
+"""
+#this goes in core/
+
+import heapq
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple, Hashable
+
+class WeightedGraph:
+    """Undirected graph with node and edge weights - adjacency kept as dict of dicts"""
+
+    def __init__(self):
+        self.node_weights: Dict[Hashable, float] = {}
+        self.adjacency: Dict[Hashable, Dict[Hashable, float]] = {}
+
+    def add_node(self, node: Hashable, weight: float = 1.0):
+        if node not in self.node_weights:
+            self.node_weights[node] = weight
+            self.adjacency[node] = {}
+        else:
+            self.node_weights[node] = weight
+
+    def add_edge(self, a: Hashable, b: Hashable, weight: float = 1.0):
+        """Add weight to the edge a-b - repeated calls accumulate"""
+        if a == b:
+            return
+        for node in (a, b):
+            if node not in self.node_weights:
+                self.add_node(node)
+        self.adjacency[a][b] = self.adjacency[a].get(b, 0.0) + weight
+        self.adjacency[b][a] = self.adjacency[b].get(a, 0.0) + weight
+
+    def __len__(self) -> int:
+        return len(self.node_weights)
+
+    def total_weight(self) -> float:
+        return sum(self.node_weights.values())
+
+    def subgraph(self, nodes: List[Hashable]) -> 'WeightedGraph':
+        keep = set(nodes)
+        graph = WeightedGraph()
+        for node in nodes:
+            graph.add_node(node, self.node_weights[node])
+        for node in nodes:
+            graph.adjacency[node] = {other: weight for other, weight in self.adjacency[node].items()
+                                     if other in keep}
+        return graph
+
+@dataclass
+class PartitionResult:
+    """k-way partition with its quality figures"""
+    assignment: Dict[Hashable, int]
+    parts: int
+    cut_size: float = 0.0
+    cut_edges: int = 0
+    part_weights: List[float] = field(default_factory=list)
+
+    @property
+    def balance(self) -> float:
+        """Heaviest part relative to a perfect split - 1.0 is perfectly balanced"""
+        total = sum(self.part_weights)
+        if not total:
+            return 1.0
+        return max(self.part_weights) / (total / self.parts)
+
+    def groups(self) -> List[List[Hashable]]:
+        """Nodes of each part"""
+        groups = [[] for _ in range(self.parts)]
+        for node, part in self.assignment.items():
+            groups[part].append(node)
+        return groups
+
+    def get_report(self) -> Dict[str, Any]:
+        return {
+            'parts': self.parts,
+            'cut_size': self.cut_size,
+            'cut_edges': self.cut_edges,
+            'part_weights': list(self.part_weights),
+            'balance': self.balance
+        }
+
+def evaluate_partition(graph: WeightedGraph, assignment: Dict[Hashable, int], parts: int) -> PartitionResult:
+    """Cut size and part weights of an assignment"""
+    cut_size = 0.0
+    cut_edges = 0
+    for node, neighbours in graph.adjacency.items():
+        for other, weight in neighbours.items():
+            if assignment[node] != assignment[other]:
+                cut_size += weight
+                cut_edges += 1
+    # Every cut edge was seen from both ends
+    cut_size /= 2
+    cut_edges //= 2
+    part_weights = [0.0] * parts
+    for node, weight in graph.node_weights.items():
+        part_weights[assignment[node]] += weight
+    return PartitionResult(dict(assignment), parts, cut_size, cut_edges, part_weights)
+
+# === Multilevel bisection ===
+
+def _coarsen(graph: WeightedGraph, rng: random.Random) -> Tuple[WeightedGraph, Dict[Hashable, Hashable]]:
+    """Heavy-edge matching - every node is merged with its heaviest unmatched neighbour"""
+    matched: Dict[Hashable, Hashable] = {}
+    nodes = list(graph.node_weights)
+    rng.shuffle(nodes)
+    for node in nodes:
+        if node in matched:
+            continue
+        best, best_weight = None, 0.0
+        for other, weight in graph.adjacency[node].items():
+            if other not in matched and weight > best_weight:
+                best, best_weight = other, weight
+        matched[node] = node
+        if best is not None:
+            matched[best] = node
+
+    coarse = WeightedGraph()
+    for node, representative in matched.items():
+        coarse.node_weights[representative] = coarse.node_weights.get(representative, 0.0) + \
+            graph.node_weights[node]
+        coarse.adjacency.setdefault(representative, {})
+    for node, neighbours in graph.adjacency.items():
+        a = matched[node]
+        for other, weight in neighbours.items():
+            b = matched[other]
+            if a != b:
+                coarse.adjacency[a][b] = coarse.adjacency[a].get(b, 0.0) + weight
+    return coarse, matched
+
+def _grow_bisection(graph: WeightedGraph, target: float, rng: random.Random) -> Dict[Hashable, int]:
+    """Greedy graph growing - add the most strongly connected node to side 0 until it reaches target"""
+    nodes = list(graph.node_weights)
+    side = {node: 1 for node in nodes}
+    if not nodes:
+        return side
+    start = rng.choice(nodes)
+    weight = 0.0
+    frontier: Dict[Hashable, float] = {start: 0.0}
+    while frontier and weight < target:
+        node = max(frontier, key=frontier.get)
+        del frontier[node]
+        side[node] = 0
+        weight += graph.node_weights[node]
+        for other, edge in graph.adjacency[node].items():
+            if side[other] == 1:
+                frontier[other] = frontier.get(other, 0.0) + edge
+        if not frontier and weight < target:
+            # Disconnected graph - continue from any node still on side 1
+            remaining = [n for n in nodes if side[n] == 1]
+            if remaining:
+                frontier[rng.choice(remaining)] = 0.0
+    return side
+
+def _fm_refine(graph: WeightedGraph, side: Dict[Hashable, int], target: float,
+               tolerance: float, passes: int = 8, patience: int = 100):
+    """Fiduccia-Mattheyses passes - move single nodes by best gain, keep the best prefix
+
+    Moves may temporarily worsen the cut; each pass is rolled back to the point
+    with the smallest cut. A pass gives up after `patience` moves without
+    improvement. Gains live in a lazy max-heap so a move costs O(degree log n).
+    """
+    total = graph.total_weight()
+    limits = (target * (1 + tolerance), (total - target) * (1 + tolerance))
+    node_weights = graph.node_weights
+    adjacency = graph.adjacency
+
+    for _ in range(passes):
+        weights = [0.0, 0.0]
+        for node, part in side.items():
+            weights[part] += node_weights[node]
+        gains: Dict[Hashable, float] = {}
+        heap = []
+        for sequence, (node, part) in enumerate(side.items()):
+            gain = 0.0
+            for other, weight in adjacency[node].items():
+                gain += weight if side[other] != part else -weight
+            gains[node] = gain
+            heap.append((-gain, sequence, node))
+        heapq.heapify(heap)
+        sequence = len(heap)
+
+        locked = set()
+        blocked = []
+        moves = []
+        cut_change = 0.0
+        best_change, best_length = 0.0, 0
+        while heap and len(moves) - best_length <= patience:
+            negative_gain, _, node = heapq.heappop(heap)
+            if node in locked or -negative_gain != gains[node]:
+                continue  # stale entry
+            destination = 1 - side[node]
+            if weights[destination] + node_weights[node] > limits[destination]:
+                blocked.append((negative_gain, sequence, node))
+                sequence += 1
+                continue
+
+            gain = gains[node]
+            side[node] = destination
+            weights[1 - destination] -= node_weights[node]
+            weights[destination] += node_weights[node]
+            locked.add(node)
+            moves.append(node)
+            cut_change -= gain
+            for other, weight in adjacency[node].items():
+                if other not in locked:
+                    gains[other] += -2 * weight if side[other] == destination else 2 * weight
+                    heapq.heappush(heap, (-gains[other], sequence, other))
+                    sequence += 1
+            # Balance changed - blocked nodes may fit now
+            for entry in blocked:
+                heapq.heappush(heap, entry)
+            blocked = []
+            if cut_change < best_change - 1e-12:
+                best_change, best_length = cut_change, len(moves)
+
+        for node in moves[best_length:]:
+            side[node] = 1 - side[node]
+        if best_length == 0:
+            break
+
+def bisect(graph: WeightedGraph, fraction: float = 0.5, tolerance: float = 0.05,
+           seed: int = 0, coarsest: int = 40) -> Dict[Hashable, int]:
+    """Multilevel min-cut bisection - side 0 gets about `fraction` of the node weight"""
+    rng = random.Random(seed)
+    levels: List[Tuple[WeightedGraph, Dict[Hashable, Hashable]]] = []
+    current = graph
+    while len(current) > coarsest:
+        coarse, matching = _coarsen(current, rng)
+        if len(coarse) > 0.9 * len(current):
+            break  # matching stalled (e.g. few edges) - stop coarsening
+        levels.append((current, matching))
+        current = coarse
+
+    target = graph.total_weight() * fraction
+    best_side, best_cut = None, None
+    for attempt in range(4):
+        side = _grow_bisection(current, target, rng)
+        _fm_refine(current, side, target, tolerance)
+        cut = evaluate_partition(current, side, 2).cut_size
+        if best_cut is None or cut < best_cut:
+            best_side, best_cut = dict(side), cut
+    side = best_side
+
+    for finer, matching in reversed(levels):
+        side = {node: side[representative] for node, representative in matching.items()}
+        _fm_refine(finer, side, target, tolerance)
+    return side
+
+def partition_graph(graph: WeightedGraph, parts: int, tolerance: float = 0.05,
+                    seed: int = 0) -> PartitionResult:
+    """k-way min-cut partition by recursive multilevel bisection"""
+    assignment: Dict[Hashable, int] = {}
+
+    def split(nodes: List[Hashable], first_part: int, count: int, depth: int):
+        if count <= 1 or len(nodes) <= 1:
+            for node in nodes:
+                assignment[node] = first_part
+            return
+        left_count = count // 2
+        sub = graph.subgraph(nodes)
+        side = bisect(sub, left_count / count, tolerance, seed + depth)
+        left = [node for node in nodes if side[node] == 0]
+        right = [node for node in nodes if side[node] == 1]
+        split(left, first_part, left_count, depth + 1)
+        split(right, first_part + left_count, count - left_count, depth + 1)
+
+    split(list(graph.node_weights), 0, max(1, parts), 0)
+    return evaluate_partition(graph, assignment, max(1, parts))
+
+# === Graph builders ===
+
+def measure_activity(simulation_engine) -> Dict[str, float]:
+    """Toggle rate (changes per simulated second) of every engine signal from a profiling run"""
+    rates: Dict[str, float] = {}
+    elapsed = simulation_engine.simulation_time or 1.0
+    for name, signal in simulation_engine.signals.items():
+        trace = simulation_engine.signal_traces.get(name)
+        if trace is not None and len(trace):
+            _, _, toggles = trace.summarize(0, len(trace))
+        else:
+            history = signal.history
+            toggles = sum(1 for i in range(1, len(history)) if history[i][1] != history[i - 1][1])
+        rates[name] = toggles / elapsed
+    return rates
+
+def _connection_nets(connections) -> Dict[Tuple[str, str], set]:
+    """Nets by union-find over a plain connection list - managers without a NetMap"""
+    parent: Dict[Tuple[str, str], Tuple[str, str]] = {}
+
+    def find(pin: Tuple[str, str]) -> Tuple[str, str]:
+        while parent.get(pin, pin) != pin:
+            parent[pin] = parent.get(parent[pin], parent[pin])
+            pin = parent[pin]
+        return pin
+
+    for connection in connections:
+        a = (connection['from_component'], connection['from_port'])
+        b = (connection['to_component'], connection['to_port'])
+        parent.setdefault(a, a)
+        parent.setdefault(b, b)
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_b] = root_a
+
+    nets: Dict[Tuple[str, str], set] = {}
+    for pin in list(parent):
+        nets.setdefault(find(pin), set()).add(pin)
+    return nets
+
+def build_component_graph(component_manager, activity: Optional[Dict[str, float]] = None,
+                          activity_weight: float = 1.0) -> WeightedGraph:
+    """Component graph from ComponentManager.connections
+
+    Nets come from the manager's live NetMap. Each net adds weight to every pair of
+    components on it, spread as 1/(n-1) so that wide nets like GND do not
+    dominate. Nets whose signals toggled in a profiling run (activity, keyed by
+    engine signal name 'component_id_port') count extra in proportion to their
+    rate relative to the busiest net.
+    """
+    graph = WeightedGraph()
+    for component_id, component in component_manager.components.items():
+        graph.add_node(component_id, float(max(1, len(getattr(component, 'ports', [])))))
+
+    net_map = getattr(component_manager, 'net_map', None)
+    if net_map is not None:
+        nets = net_map.nets()
+    else:
+        nets = _connection_nets(component_manager.connections)
+
+    activity = activity or {}
+    peak = max(activity.values(), default=0.0) or 1.0
+    for pins in nets.values():
+        members = sorted({component_id for component_id, _ in pins if component_id in graph.node_weights})
+        if len(members) < 2:
+            continue
+        rate = max((activity.get(f"{component_id}_{port}", 0.0) for component_id, port in pins), default=0.0)
+        weight = (1.0 + activity_weight * rate / peak) / (len(members) - 1)
+        for i, a in enumerate(members):
+            for b in members[i + 1:]:
+                graph.add_edge(a, b, weight)
+    return graph
+
+def partition_components(component_manager, parts: int, activity: Optional[Dict[str, float]] = None,
+                         tolerance: float = 0.05, seed: int = 0) -> PartitionResult:
+    """k-way partition of placed components - groups() gives component ids per part"""
+    graph = build_component_graph(component_manager, activity)
+    result = partition_graph(graph, parts, tolerance, seed)
+    print(f"✓ Partitioned {len(graph)} components into {parts}: cut {result.cut_size:.2f}, "
+          f"balance {result.balance:.3f}")
+    return result
+
+def build_gate_graph(netlist) -> WeightedGraph:
+    """Gate graph of a GateNetlist - fast links weigh more, so cuts prefer slow ones"""
+    graph = WeightedGraph()
+    readers: Dict[str, List[int]] = {}
+    for index, (_, inputs, _) in enumerate(netlist.gates):
+        graph.add_node(index, 1.0)
+        for pin in inputs:
+            readers.setdefault(pin.lstrip('~'), []).append(index)
+    for index, (_, _, output) in enumerate(netlist.gates):
+        delay = netlist.delays.get(output, 1)
+        for reader in readers.get(output, ()):
+            graph.add_edge(index, reader, 1.0 / delay)
+    return graph
+
+def partition_netlist(netlist, parts: int, tolerance: float = 0.05, seed: int = 0) -> List[int]:
+    """Gate assignment list for PartitionedSimulator(netlist, assignment=...)"""
+    result = partition_graph(build_gate_graph(netlist), parts, tolerance, seed)
+    return [result.assignment[index] for index in range(len(netlist.gates))]
+
+__all__ = ['WeightedGraph', 'PartitionResult', 'evaluate_partition', 'bisect', 'partition_graph',
+           'measure_activity', 'build_component_graph', 'partition_components',
+           'build_gate_graph', 'partition_netlist']
@@ -0,0 +1,146 @@
+"""
+X-Seti - October18 2026 - Pin Tables
+Compact struct-of-arrays pin lists shared between a definition and its instances
+"""
+#this goes in core/
+
+import sys
+import weakref
+from array import array
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+DIRECTIONS = ("input", "output", "bidirectional")
+SIGNAL_TYPES = ("digital", "analog", "power", "ground")
+
+_DIRECTION_CODES = {name: code for code, name in enumerate(DIRECTIONS)}
+_SIGNAL_CODES = {name: code for code, name in enumerate(SIGNAL_TYPES)}
+
+POWER_PINS = ('VCC', 'VDD', 'VPP', 'VBB', 'VBAT', '+5V', '+12V', '-5V', '-12V')
+GROUND_PINS = ('GND', 'VSS', 'AGND', 'DGND', '0V')
+
+# Identical pin lists share one table
+_SHARED: 'weakref.WeakValueDictionary[tuple, PinTable]' = weakref.WeakValueDictionary()
+
+def guess_signal_type(name: str) -> str:
+    """power/ground from the usual supply pin names, digital otherwise"""
+    upper = name.upper()
+    if upper in GROUND_PINS:
+        return "ground"
+    if upper in POWER_PINS:
+        return "power"
+    return "digital"
+
+def _pin_number_column(numbers: List[Any]):
+    """int array when every pin number is an int (numeric strings included),
+    otherwise a tuple of the values as given - old files may hold anything"""
+    coerced = []
+    for number in numbers:
+        if isinstance(number, str) and number.strip().lstrip('+-').isdigit():
+            number = int(number)
+        coerced.append(number)
+    try:
+        return array('i', coerced)
+    except (TypeError, OverflowError):
+        return tuple(numbers)
+
+class PinTable:
+    """Immutable pin list as parallel arrays
+
+    Names are interned, pin numbers are an int array (a tuple if some are not
+    integers) and direction and
+    signal type are one byte each, so a 100-pin part costs a few hundred
+    bytes and is shared by every placed instance until one of them needs
+    mutable ComponentPort records.
+    """
+
+    __slots__ = ('names', 'pin_numbers', 'directions', 'signal_types', 'descriptions',
+                 '_index', '__weakref__')
+
+    def __init__(self, names: Iterable[str], pin_numbers: Optional[Iterable[int]] = None,
+                 directions: Optional[Iterable[str]] = None,
+                 signal_types: Optional[Iterable[str]] = None,
+                 descriptions: Optional[Iterable[str]] = None):
+        self.names: Tuple[str, ...] = tuple(sys.intern(str(name)) for name in names)
+        count = len(self.names)
+        self.pin_numbers = _pin_number_column(list(pin_numbers)) if pin_numbers is not None \
+            else array('i', range(1, count + 1))
+        self.directions = bytes(_DIRECTION_CODES.get(direction, 2) for direction in directions) \
+            if directions is not None else bytes([2]) * count
+        self.signal_types = bytes(_SIGNAL_CODES.get(signal_type, 0) for signal_type in signal_types) \
+            if signal_types is not None else bytes(count)
+        descriptions = tuple(descriptions) if descriptions is not None else ()
+        self.descriptions = descriptions if any(descriptions) else None
+        self._index: Optional[Dict[str, int]] = None
+        if not len(self.pin_numbers) == len(self.directions) == len(self.signal_types) == count:
+            raise ValueError("Pin table columns differ in length")
+
+    @classmethod
+    def shared(cls, names: Iterable[str], pin_numbers: Optional[Iterable[int]] = None,
+               directions: Optional[Iterable[str]] = None,
+               signal_types: Optional[Iterable[str]] = None,
+               descriptions: Optional[Iterable[str]] = None) -> 'PinTable':
+        """Table for these pins, reusing an identical one if it is still alive"""
+        table = cls(names, pin_numbers, directions, signal_types, descriptions)
+        key = table.key()
+        existing = _SHARED.get(key)
+        if existing is not None:
+            return existing
+        _SHARED[key] = table
+        return table
+
+    @classmethod
+    def from_ports(cls, ports: List[Any]) -> 'PinTable':
+        return cls.shared([port.name for port in ports], [port.pin_number for port in ports],
+                          [port.direction for port in ports], [port.signal_type for port in ports],
+                          [port.description for port in ports])
+
+    @classmethod
+    def from_pin_dicts(cls, pins: List[Dict[str, Any]]) -> 'PinTable':
+        """Chipset-style [{'name': 'A0'}, ...] or saved port dicts - numbered in order by default"""
+        names = [pin['name'] for pin in pins]
+        return cls.shared(
+            names,
+            [pin.get('pin_number', pin.get('number', index + 1)) for index, pin in enumerate(pins)],
+            [pin.get('direction', 'bidirectional') for pin in pins],
+            [pin.get('signal_type') or guess_signal_type(pin['name']) for pin in pins],
+            [pin.get('description', '') for pin in pins]
+        )
+
+    def key(self) -> tuple:
+        numbers = self.pin_numbers.tobytes() if isinstance(self.pin_numbers, array) else self.pin_numbers
+        return (self.names, numbers, self.directions, self.signal_types, self.descriptions)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def direction(self, index: int) -> str:
+        return DIRECTIONS[self.directions[index]]
+
+    def signal_type(self, index: int) -> str:
+        return SIGNAL_TYPES[self.signal_types[index]]
+
+    def description(self, index: int) -> str:
+        return self.descriptions[index] if self.descriptions else ""
+
+    def index_of(self, name: str) -> int:
+        """Position of a pin name, -1 if absent"""
+        if self._index is None:
+            index: Dict[str, int] = {}
+            for position, pin_name in enumerate(self.names):
+                index.setdefault(pin_name, position)
+            self._index = index
+        return self._index.get(name, -1)
+
+    def rows(self):
+        """(name, pin number, direction, signal type, description) per pin"""
+        for index, name in enumerate(self.names):
+            yield (name, self.pin_numbers[index], DIRECTIONS[self.directions[index]],
+                   SIGNAL_TYPES[self.signal_types[index]], self.description(index))
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Same layout as BaseComponent.to_dict() ports"""
+        return [{'name': name, 'pin_number': number, 'direction': direction,
+                 'signal_type': signal_type, 'description': description}
+                for name, number, direction, signal_type, description in self.rows()]
+
+__all__ = ['PinTable', 'DIRECTIONS', 'SIGNAL_TYPES', 'guess_signal_type']
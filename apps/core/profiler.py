@@ -0,0 +1,213 @@
+"""
+X-Seti - October18 2026 - Execution Profiler
+Per-address execution counts and cycle totals for emulated CPUs
+"""
+#this goes in core/
+
+import re
+import csv
+import math
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Any, Optional, Tuple
+
+# Label file lines we understand:
+#   LABEL = $1234 / LABEL EQU 0x1234 / LABEL: equ 1234h   (assembler symbol dumps)
+#   al C:1234 .label                                       (VICE monitor labels)
+#   1234 label / $1234 label                               (plain address lists)
+_LABEL_PATTERNS = [
+    re.compile(r'^\s*\.?([A-Za-z_.@][\w.@]*):?\s*(?:=|\bequ\b)\s*(\$[0-9A-Fa-f]+|0x[0-9A-Fa-f]+|[0-9A-Fa-f]+[hH]|\d+)\s*(?:;.*)?$', re.IGNORECASE),
+    re.compile(r'^\s*al\s+(?:C:)?([0-9A-Fa-f]+)\s+\.?([\w.@]+)', re.IGNORECASE),
+    re.compile(r'^\s*(?:\$|0x)?([0-9A-Fa-f]{2,8})[:\s]+\.?([A-Za-z_.@][\w.@]*)\s*$'),
+]
+
+def _parse_number(text: str) -> int:
+    text = text.strip()
+    if text.startswith('$'):
+        return int(text[1:], 16)
+    if text.lower().startswith('0x'):
+        return int(text, 16)
+    if text[-1] in 'hH':
+        return int(text[:-1], 16)
+    return int(text)
+
+class ExecutionProfiler:
+    """Execution counters sized to the CPU address space
+
+    CPU components call record(pc, cycles) once per executed instruction when
+    engine.profiler is set. Both counters are preallocated array('I') so recording
+    is two indexed adds with no allocation. There is no CPU core in the tree yet,
+    so nothing records until one is added.
+
+    max_count follows the hottest address as it is recorded, so the heatmap
+    never has to scan the whole address space.
+    """
+
+    def __init__(self, address_space: int = 0x10000):
+        self.address_space = address_space
+        self.counts = array('I', [0]) * address_space
+        self.cycles = array('I', [0]) * address_space
+        self.max_count = 0
+        self.labels: Dict[int, str] = {}
+        self._label_addresses: List[int] = []
+
+    def record(self, pc: int, cycles: int = 1):
+        """Count one instruction at pc taking `cycles` clock cycles"""
+        counts = self.counts
+        cycle_counts = self.cycles
+        # Both new values first - the increment must not be applied twice if only one store overflows
+        count = counts[pc] + 1
+        total = cycle_counts[pc] + cycles
+        try:
+            counts[pc] = count
+            cycle_counts[pc] = total
+        except OverflowError:
+            # Saturate rather than stop the emulation after ~4 billion hits
+            count = counts[pc] = min(count, 0xFFFFFFFF)
+            cycle_counts[pc] = min(total, 0xFFFFFFFF)
+        if count > self.max_count:
+            self.max_count = count
+
+    def reset(self):
+        self.counts = array('I', [0]) * self.address_space
+        self.cycles = array('I', [0]) * self.address_space
+        self.max_count = 0
+
+    @property
+    def total_instructions(self) -> int:
+        return sum(self.counts)
+
+    @property
+    def total_cycles(self) -> int:
+        return sum(self.cycles)
+
+    # === Symbols ===
+
+    def load_labels(self, file_path: str) -> int:
+        """Load a label/symbol file - returns the number of labels read"""
+        loaded = 0
+        try:
+            with open(file_path, 'r', errors='replace') as f:
+                for line in f:
+                    parsed = self._parse_label_line(line)
+                    if parsed:
+                        address, name = parsed
+                        if 0 <= address < self.address_space:
+                            self.labels[address] = name
+                            loaded += 1
+        except OSError as e:
+            print(f"❌ Error loading labels {file_path}: {e}")
+            return 0
+        self._label_addresses = sorted(self.labels)
+        print(f"✓ Loaded {loaded} labels from {file_path}")
+        return loaded
+
+    def _parse_label_line(self, line: str) -> Optional[Tuple[int, str]]:
+        name_first, vice, address_first = _LABEL_PATTERNS
+        match = name_first.match(line)
+        if match:
+            try:
+                return _parse_number(match.group(2)), match.group(1)
+            except ValueError:
+                return None
+        match = vice.match(line) or address_first.match(line)
+        if match:
+            return int(match.group(1), 16), match.group(2)
+        return None
+
+    def set_label(self, address: int, name: str):
+        self.labels[address] = name
+        self._label_addresses = sorted(self.labels)
+
+    def symbolize(self, address: int) -> str:
+        """label+offset for an address, or the plain hex address without labels"""
+        index = bisect_right(self._label_addresses, address)
+        if not index:
+            return f"${address:04X}"
+        base = self._label_addresses[index - 1]
+        offset = address - base
+        return self.labels[base] if not offset else f"{self.labels[base]}+{offset}"
+
+    # === Reports ===
+
+    def hotspots(self, top: int = 20, max_gap: int = 4) -> List[Dict[str, Any]]:
+        """Hottest address ranges, most cycles first
+
+        With labels loaded a range runs from one label to the next; otherwise it is
+        a run of executed addresses with gaps of at most max_gap bytes.
+        """
+        ranges = self._label_ranges() if self._label_addresses else self._executed_runs(max_gap)
+        total_cycles = self.total_cycles or 1
+        counts, cycles = self.counts, self.cycles
+
+        report = []
+        for start, end in ranges:
+            range_cycles = sum(cycles[start:end])
+            if not range_cycles:
+                continue
+            report.append({
+                'start': start,
+                'end': end - 1,
+                'label': self.symbolize(start),
+                'instructions': sum(counts[start:end]),
+                'cycles': range_cycles,
+                'percent': 100.0 * range_cycles / total_cycles
+            })
+        report.sort(key=lambda entry: entry['cycles'], reverse=True)
+        return report[:top]
+
+    def _label_ranges(self) -> List[Tuple[int, int]]:
+        addresses = self._label_addresses
+        ranges = [(0, addresses[0])] if addresses[0] else []
+        ranges += list(zip(addresses, addresses[1:] + [self.address_space]))
+        return ranges
+
+    def _executed_runs(self, max_gap: int) -> List[Tuple[int, int]]:
+        ranges = []
+        start = last = None
+        for address, count in enumerate(self.counts):
+            if not count:
+                continue
+            if start is None:
+                start = address
+            elif address - last > max_gap + 1:
+                ranges.append((start, last + 1))
+                start = address
+            last = address
+        if start is not None:
+            ranges.append((start, last + 1))
+        return ranges
+
+    def format_report(self, top: int = 20) -> str:
+        """Plain text hotspot table"""
+        lines = [f"{'Range':<13} {'Label':<24} {'Instr':>10} {'Cycles':>12} {'%':>6}"]
+        for entry in self.hotspots(top):
+            lines.append(f"${entry['start']:04X}-${entry['end']:04X} {entry['label'][:24]:<24} "
+                         f"{entry['instructions']:>10} {entry['cycles']:>12} {entry['percent']:>6.2f}")
+        return "\n".join(lines)
+
+    def heat(self, address: int, max_count: int) -> float:
+        """0..1 log-scaled heat of one address against the hottest one"""
+        count = self.counts[address] if 0 <= address < self.address_space else 0
+        if not count or max_count <= 0:
+            return 0.0
+        return math.log1p(count) / math.log1p(max_count)
+
+    def export_csv(self, file_path: str, executed_only: bool = True) -> bool:
+        """Write address,label,count,cycles rows"""
+        try:
+            with open(file_path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['address', 'label', 'count', 'cycles'])
+                for address in range(self.address_space):
+                    count = self.counts[address]
+                    if executed_only and not count:
+                        continue
+                    writer.writerow([f"{address:04X}", self.symbolize(address), count, self.cycles[address]])
+            print(f"✓ Profile exported to {file_path}")
+            return True
+        except OSError as e:
+            print(f"❌ Error exporting profile: {e}")
+            return False
+
+__all__ = ['ExecutionProfiler']
@@ -0,0 +1,324 @@
+"""
+X-Seti - October18 2026 - Project Archive
+Zip-sectioned binary project format - columnar tables decoded only when needed
+"""
+#this goes in core/
+
+import sys
+import json
+import zipfile
+from array import array
+from collections.abc import Mapping
+from typing import Dict, List, Any, Optional, Tuple, Callable
+
+from core.pin_table import PinTable
+from core.component_definition import ComponentDefinition
+
+ARCHIVE_VERSION = 1
+PROJECT_EXTENSION = ".vrpz"
+
+# Component string fields stored as string-table indexes
+STRING_FIELDS = ('id', 'component_type', 'name', 'category', 'manufacturer', 'part_number',
+                 'package_type', 'year', 'datasheet_url', 'image_path')
+CONNECTION_FIELDS = ('id', 'from_component', 'from_port', 'to_component', 'to_port')
+
+SECTIONS = ('strings', 'components', 'pin_tables', 'properties', 'connections', 'geometry',
+            'groups', 'view')
+
+# Values the string table keeps as they are - anything else is stored as str()
+_TABLE_TYPES = (str, int, float, bool)
+
+class StringTable:
+    """Interned values - each distinct value is stored once and referenced by index
+
+    Numbers and booleans keep their JSON type, so a year saved as 1976 loads as
+    1976 and not "1976".
+    """
+
+    def __init__(self, strings: Optional[List[Any]] = None):
+        self.strings: List[Any] = strings or []
+        self._index: Dict[Tuple[type, Any], int] = {(type(value), value): i
+                                                    for i, value in enumerate(self.strings)}
+
+    def add(self, value: Any) -> int:
+        if value is None:
+            value = ""
+        elif not isinstance(value, _TABLE_TYPES):
+            value = str(value)
+        key = (type(value), value)  # 1, 1.0 and True stay distinct
+        index = self._index.get(key)
+        if index is None:
+            index = len(self.strings)
+            self.strings.append(value)
+            self._index[key] = index
+        return index
+
+    def column(self, values) -> array:
+        add = self.add
+        return array('I', [add(value) for value in values])
+
+def _pack_columns(columns: Dict[str, array]) -> bytes:
+    """Header line (name, typecode, count per column) followed by the raw little-endian arrays"""
+    header = []
+    body = []
+    for name, column in columns.items():
+        if sys.byteorder == 'big':
+            column = array(column.typecode, column)
+            column.byteswap()
+        header.append([name, column.typecode, len(column)])
+        body.append(column.tobytes())
+    return json.dumps(header).encode() + b"\n" + b"".join(body)
+
+def _unpack_columns(data: bytes) -> Dict[str, array]:
+    newline = data.index(b"\n")
+    header = json.loads(data[:newline])
+    columns = {}
+    offset = newline + 1
+    for name, typecode, count in header:
+        column = array(typecode)
+        size = column.itemsize * count
+        column.frombytes(data[offset:offset + size])
+        if sys.byteorder == 'big':
+            column.byteswap()
+        columns[name] = column
+        offset += size
+    return columns
+
+class DeferredSection:
+    """Raw bytes of one archive section, decoded the first time value() is called"""
+
+    __slots__ = ('_data', '_decode', '_value')
+
+    def __init__(self, data: Optional[bytes], decode: Optional[Callable[[bytes], Any]] = None,
+                 value: Any = None):
+        self._data = data
+        self._decode = decode
+        self._value = value
+
+    def value(self) -> Any:
+        if self._data is not None:
+            self._value = self._decode(self._data)
+            self._data = None
+        return self._value
+
+class DeferredProperties(Mapping):
+    """One component's saved properties - read-only, backed by a DeferredSection"""
+
+    __slots__ = ('_section', '_key')
+
+    def __init__(self, section: DeferredSection, key: str):
+        self._section = section
+        self._key = key
+
+    def _values(self) -> Dict[str, Any]:
+        return (self._section.value() or {}).get(self._key, {})
+
+    def __getitem__(self, key):
+        return self._values()[key]
+
+    def __iter__(self):
+        return iter(self._values())
+
+    def __len__(self) -> int:
+        return len(self._values())
+
+def _apply_geometry(section: DeferredSection, components: List[Any]):
+    columns = section.value()
+    if not columns:
+        return
+    for i, component in enumerate(components):
+        component.setPos(columns['x'][i], columns['y'][i])
+        component.setRotation(columns['rotation'][i])
+
+def write_archive(filename: str, component_manager, view: Optional[Dict[str, Any]] = None,
+                  geometry: Optional[Dict[str, Tuple[float, float, float]]] = None) -> bool:
+    """Save components, connections, geometry and view settings as separate zip sections
+
+    geometry is {component id: (x, y, rotation)}; by default it is read from
+    the components' own scene positions when they have them.
+    """
+    try:
+        components = list(component_manager.components.values())
+        strings = StringTable()
+
+        columns = {field: strings.column(getattr(c, field, "") for c in components) for field in STRING_FIELDS}
+        columns['pin_count'] = array('i', [int(getattr(c, 'pin_count', 0) or 0) for c in components])
+        columns['width'] = array('d', [float(getattr(c, 'width', 0) or 0) for c in components])
+        columns['height'] = array('d', [float(getattr(c, 'height', 0) or 0) for c in components])
+        columns['enabled'] = array('B', [1 if getattr(c, 'enabled', True) else 0 for c in components])
+
+        properties = {str(i): c.properties.copy() for i, c in enumerate(components) if c.properties}
+        columns['has_properties'] = array('B', [1 if str(i) in properties else 0
+                                                for i in range(len(components))])
+
+        # Each distinct pin list is stored once
+        tables: Dict[int, int] = {}
+        table_rows: List[List[Dict[str, Any]]] = []
+        table_column = array('i')
+        for component in components:
+            table = component.get_pin_table()
+            index = tables.get(id(table))
+            if index is None:
+                index = tables[id(table)] = len(table_rows)
+                table_rows.append(table.to_dicts())
+            table_column.append(index)
+        columns['pin_table'] = table_column
+
+        connections = component_manager.connections
+        records = connections.to_list() if hasattr(connections, 'to_list') else list(connections)
+        connection_columns = {field: strings.column(record.get(field, "") for record in records)
+                              for field in CONNECTION_FIELDS}
+
+        if geometry is None:
+            component_manager.ensure_geometry()
+            geometry = {}
+            for component in components:
+                if hasattr(component, 'pos') and callable(component.pos):
+                    position = component.pos()
+                    geometry[component.id] = (position.x(), position.y(), component.rotation())
+        geometry_columns = {
+            'x': array('d', [geometry.get(c.id, (0.0, 0.0, 0.0))[0] for c in components]),
+            'y': array('d', [geometry.get(c.id, (0.0, 0.0, 0.0))[1] for c in components]),
+            'rotation': array('d', [geometry.get(c.id, (0.0, 0.0, 0.0))[2] for c in components])
+        }
+
+        manifest = {
+            'version': ARCHIVE_VERSION,
+            'components': len(components),
+            'connections': len(records),
+            'sections': list(SECTIONS)
+        }
+        with zipfile.ZipFile(filename, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as archive:
+            archive.writestr('manifest.json', json.dumps(manifest))
+            archive.writestr('strings.json', json.dumps(strings.strings, separators=(',', ':')))
+            archive.writestr('components.bin', _pack_columns(columns))
+            archive.writestr('pin_tables.json', json.dumps(table_rows, separators=(',', ':')))
+            archive.writestr('properties.json', json.dumps(properties, separators=(',', ':')))
+            archive.writestr('connections.bin', _pack_columns(connection_columns))
+            archive.writestr('geometry.bin', _pack_columns(geometry_columns))
+            archive.writestr('groups.json', json.dumps(component_manager.component_groups))
+            archive.writestr('view.json', json.dumps(view or {}))
+        return True
+    except (OSError, TypeError, ValueError) as e:
+        print(f"⚠️ Error writing project archive: {e}")
+        return False
+
+class ProjectArchive:
+    """Read side of the archive - each section is decompressed and decoded on first use
+
+    load_into() goes further for the property and geometry sections: they are
+    only read from the zip there, and decoded when a component's properties or
+    positions are first used.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._zip = zipfile.ZipFile(filename, 'r')
+        self.manifest = json.loads(self._zip.read('manifest.json'))
+        if self.manifest.get('version', 0) > ARCHIVE_VERSION:
+            raise ValueError(f"Project archive version {self.manifest['version']} is newer than supported")
+        self._sections: Dict[str, Any] = {}
+
+    def close(self):
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def section(self, name: str) -> Any:
+        """Decoded section - columns dict for .bin sections, parsed JSON otherwise"""
+        if name not in self._sections:
+            names = self._zip.namelist()
+            if f"{name}.bin" in names:
+                self._sections[name] = _unpack_columns(self._zip.read(f"{name}.bin"))
+            elif f"{name}.json" in names:
+                self._sections[name] = json.loads(self._zip.read(f"{name}.json"))
+            else:
+                self._sections[name] = None
+        return self._sections[name]
+
+    def deferred(self, name: str) -> DeferredSection:
+        """Section read now (the zip may be closed later) but decoded on first use"""
+        if name in self._sections:
+            return DeferredSection(None, value=self._sections[name])
+        names = self._zip.namelist()
+        if f"{name}.bin" in names:
+            return DeferredSection(self._zip.read(f"{name}.bin"), _unpack_columns)
+        if f"{name}.json" in names:
+            return DeferredSection(self._zip.read(f"{name}.json"), json.loads)
+        return DeferredSection(None)
+
+    @property
+    def strings(self) -> List[Any]:
+        return self.section('strings')
+
+    def view_settings(self) -> Dict[str, Any]:
+        """Canvas/view settings - cheap, touches no component data"""
+        return self.section('view') or {}
+
+    def geometry(self) -> Dict[str, Tuple[float, float, float]]:
+        """{component id: (x, y, rotation)}"""
+        columns = self.section('geometry')
+        ids = self.section('components')['id']
+        strings = self.strings
+        return {strings[ids[i]]: (columns['x'][i], columns['y'][i], columns['rotation'][i])
+                for i in range(len(ids))}
+
+    def connection_records(self) -> List[Dict[str, Any]]:
+        columns = self.section('connections')
+        strings = self.strings
+        decoded = [[strings[index] for index in columns[field]] for field in CONNECTION_FIELDS]
+        return [dict(zip(CONNECTION_FIELDS, values)) for values in zip(*decoded)]
+
+    def load_into(self, component_manager, factory=None, apply_geometry: bool = True) -> int:
+        """Build components, connections and groups in a manager - returns the component count
+
+        Saved properties become a lazy layer under each component's own, and the
+        positions are handed to the manager (ComponentManager.ensure_geometry()),
+        so neither section is decoded until it is used.
+        """
+        if factory is None:
+            from core.components import ComponentFactory
+            factory = ComponentFactory
+        columns = self.section('components')
+        strings = self.strings
+        tables = [PinTable.from_pin_dicts(rows) for rows in self.section('pin_tables')]
+        properties = self.deferred('properties')
+        has_properties = columns.get('has_properties')  # missing in older archives
+
+        # Rows that only differ in id/name/properties share one definition
+        definition_fields = [field for field in STRING_FIELDS if field not in ('id', 'name', 'component_type')]
+        count = len(columns['id'])
+        loaded = []
+        for i in range(count):
+            component_type = strings[columns['component_type'][i]]
+            definition = ComponentDefinition.shared(
+                component_type, tables[columns['pin_table'][i]],
+                pin_count=columns['pin_count'][i], width=columns['width'][i], height=columns['height'][i],
+                **{field: strings[columns[field][i]] for field in definition_fields})
+            component = factory.create_component(component_type)
+            saved = DeferredProperties(properties, str(i)) if has_properties is None or has_properties[i] else None
+            component.use_definition(definition, saved)
+            component.id = strings[columns['id'][i]]
+            component.name = strings[columns['name'][i]]
+            component.enabled = bool(columns['enabled'][i])
+            component_manager.components[component.id] = component
+            loaded.append(component)
+
+        if apply_geometry and loaded and hasattr(loaded[0], 'setPos'):
+            geometry = self.deferred('geometry')
+            component_manager.defer_geometry(lambda: _apply_geometry(geometry, loaded))
+
+        component_manager.connections = self.connection_records()
+        component_manager.component_groups = self.section('groups') or {}
+        return count
+
+def is_project_archive(filename: str) -> bool:
+    return zipfile.is_zipfile(filename)
+
+__all__ = ['write_archive', 'ProjectArchive', 'StringTable', 'DeferredSection', 'DeferredProperties',
+           'is_project_archive',
+           'PROJECT_EXTENSION', 'ARCHIVE_VERSION']
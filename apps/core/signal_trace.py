@@ -0,0 +1,339 @@
+"""
+X-Seti - October18 2026 - Signal Trace Pyramids
+Multi-resolution min/max/transition summaries for waveform display and measurement
+"""
+#this goes in core/
+
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Any, Optional, Tuple, Sequence
+
+DEFAULT_MAX_SAMPLES = 1 << 20  # per trace - older samples are dropped beyond this
+
+class _PyramidLevel:
+    """One resolution level - a summary per bucket of `size` samples"""
+
+    __slots__ = ('size', 'mins', 'maxs', 'transitions')
+
+    def __init__(self, size: int, typecode: str):
+        self.size = size
+        self.mins = array(typecode) if typecode else []
+        self.maxs = array(typecode) if typecode else []
+        self.transitions = array('L')
+
+class SignalPyramid:
+    """Timestamped samples of one signal with incrementally built summary levels
+
+    Level k buckets cover base_size * fanout**k samples. Appending a sample updates
+    the last bucket of every level, so the pyramid never needs a rebuild.
+
+    Past max_samples the oldest half is dropped in whole top-level buckets, so
+    every level stays aligned. The simulation thread appends while the GUI
+    reads; both go through the lock, and readers never see a half-updated level.
+    """
+
+    def __init__(self, name: str, bit_width: int = 1, base_size: int = 16, fanout: int = 4,
+                 max_samples: int = DEFAULT_MAX_SAMPLES):
+        self.name = name
+        self.bit_width = bit_width
+        self.base_size = base_size
+        self.fanout = fanout
+        self.max_samples = max(max_samples, base_size * 2)
+        self.lock = threading.RLock()
+        self._typecode = 'Q' if bit_width <= 64 else None  # wider buses fall back to lists
+        self.times = array('d')
+        self.values = array(self._typecode) if self._typecode else []
+        self.levels: List[_PyramidLevel] = [_PyramidLevel(base_size, self._typecode)]
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def clear(self):
+        """Drop all samples"""
+        with self.lock:
+            self.times = array('d')
+            self.values = array(self._typecode) if self._typecode else []
+            self.levels = [_PyramidLevel(self.base_size, self._typecode)]
+
+    def time_range(self) -> Optional[Tuple[float, float]]:
+        """First and last sample time, None while empty"""
+        with self.lock:
+            return (self.times[0], self.times[-1]) if self.times else None
+
+    def append(self, timestamp: float, value: int):
+        """Add a sample - timestamps must not go backwards"""
+        with self.lock:
+            if len(self.times) >= self.max_samples:
+                self._drop_oldest()
+            self._append(timestamp, value)
+
+    def _append(self, timestamp: float, value: int):
+        values = self.values
+        index = len(values)
+        changed = 1 if index and values[-1] != value else 0
+        self.times.append(timestamp)
+        values.append(value)
+
+        for level in self.levels:
+            bucket = index // level.size
+            if bucket == len(level.mins):
+                level.mins.append(value)
+                level.maxs.append(value)
+                level.transitions.append(changed)
+            else:
+                if value < level.mins[bucket]:
+                    level.mins[bucket] = value
+                if value > level.maxs[bucket]:
+                    level.maxs[bucket] = value
+                level.transitions[bucket] += changed
+
+        # Grow a coarser level once the top one has more than `fanout` buckets
+        top = self.levels[-1]
+        if len(top.mins) > self.fanout:
+            self._add_level(top)
+
+    def _drop_oldest(self):
+        """Forget about half of the samples, in multiples of the coarsest bucket"""
+        count = len(self.values)
+        drop = (count // 2) // self.levels[-1].size * self.levels[-1].size
+        while not drop and len(self.levels) > 1:
+            self.levels.pop()  # coarsest bucket is bigger than half - rebuilt as samples arrive
+            drop = (count // 2) // self.levels[-1].size * self.levels[-1].size
+        if not drop:
+            return
+        # The change into the new first sample came from a dropped one
+        if self.values[drop] != self.values[drop - 1]:
+            for level in self.levels:
+                level.transitions[drop // level.size] -= 1
+        del self.times[:drop]
+        del self.values[:drop]
+        for level in self.levels:
+            buckets = drop // level.size
+            del level.mins[:buckets]
+            del level.maxs[:buckets]
+            del level.transitions[:buckets]
+
+    def _add_level(self, top: _PyramidLevel):
+        level = _PyramidLevel(top.size * self.fanout, self._typecode)
+        fanout = self.fanout
+        for start in range(0, len(top.mins), fanout):
+            end = start + fanout
+            level.mins.append(min(top.mins[start:end]))
+            level.maxs.append(max(top.maxs[start:end]))
+            level.transitions.append(sum(top.transitions[start:end]))
+        self.levels.append(level)
+
+    # === Lookup ===
+
+    def index_at(self, timestamp: float) -> int:
+        """Index of the first sample after timestamp"""
+        with self.lock:
+            return bisect_right(self.times, timestamp)
+
+    def value_at(self, timestamp: float) -> Optional[int]:
+        """Signal value at a time, None before the first sample"""
+        with self.lock:
+            index = bisect_right(self.times, timestamp)
+            return self.values[index - 1] if index else None
+
+    def summarize(self, start: int, end: int) -> Tuple[Optional[int], Optional[int], int]:
+        """Exact (min, max, transitions) for samples [start, end)"""
+        with self.lock:
+            return self._summarize(start, end)
+
+    def _summarize(self, start: int, end: int) -> Tuple[Optional[int], Optional[int], int]:
+        start = max(start, 0)
+        end = min(end, len(self.values))
+        if start >= end:
+            return None, None, 0
+
+        lo = hi = self.values[start]
+        transitions = 0
+        if start and self.values[start - 1] != lo:
+            transitions = 1
+
+        # Raw samples up to the first level-0 boundary, then the largest buckets that fit
+        index = start + 1
+        while index < end:
+            level = self._largest_aligned_level(index, end)
+            if level is None:
+                value = self.values[index]
+                lo = value if value < lo else lo
+                hi = value if value > hi else hi
+                if value != self.values[index - 1]:
+                    transitions += 1
+                index += 1
+            else:
+                bucket = index // level.size
+                lo = min(lo, level.mins[bucket])
+                hi = max(hi, level.maxs[bucket])
+                transitions += level.transitions[bucket]
+                index += level.size
+        return lo, hi, transitions
+
+    def _largest_aligned_level(self, index: int, end: int) -> Optional[_PyramidLevel]:
+        found = None
+        for level in self.levels:
+            if index % level.size or index + level.size > end:
+                break
+            found = level
+        return found
+
+    def columns(self, t0: float, t1: float, width: int) -> List[Tuple[Optional[int], Optional[int], int, Optional[int]]]:
+        """Summarize a time window into `width` display columns
+
+        Each column is (min, max, transitions, value_at_start). Columns are answered
+        from the level whose buckets are about one column wide, with column edges
+        snapped to bucket boundaries, so the cost per column does not depend on how
+        many samples it covers.
+        """
+        if width <= 0 or t1 <= t0:
+            return []
+        with self.lock:
+            return self._columns(t0, t1, width)
+
+    def _columns(self, t0: float, t1: float, width: int) -> List[Tuple[Optional[int], Optional[int], int, Optional[int]]]:
+        result = []
+
+        times = self.times
+        values = self.values
+        edges = [bisect_left(times, t0 + (t1 - t0) * c / width) for c in range(width + 1)]
+        per_column = max(1, (edges[-1] - edges[0]) // width)
+
+        level = None
+        for candidate in self.levels:
+            if candidate.size > per_column:
+                break
+            level = candidate
+
+        for c in range(width):
+            start, end = edges[c], edges[c + 1]
+            before = values[start - 1] if start else None
+
+            if start >= end:
+                result.append((before, before, 0, before))
+                continue
+
+            if level is None or end - start < level.size:
+                lo, hi, transitions = self._summarize(start, end)
+            else:
+                first = start // level.size
+                last = max(first + 1, end // level.size)
+                lo = min(level.mins[first:last])
+                hi = max(level.maxs[first:last])
+                transitions = sum(level.transitions[first:last])
+                if before is not None:
+                    lo = min(lo, before)
+                    hi = max(hi, before)
+
+            result.append((lo, hi, transitions, before if before is not None else values[start]))
+        return result
+
+    def decimate(self, max_points: int) -> List[Tuple[float, int]]:
+        """History reduced to about max_points without losing short pulses"""
+        with self.lock:
+            if len(self.times) <= max_points:
+                return list(zip(self.times, self.values))
+            t0, t1 = self.times[0], self.times[-1]
+            width = max(1, max_points // 2)
+            columns = self._columns(t0, t1, width) if t1 > t0 else []
+        step = (t1 - t0) / width
+        points = []
+        for c, (lo, hi, transitions, start_value) in enumerate(columns):
+            timestamp = t0 + c * step
+            if lo is None:
+                continue
+            if transitions and lo != hi:
+                points.append((timestamp, lo))
+                points.append((timestamp, hi))
+            else:
+                points.append((timestamp, start_value))
+        return points
+
+def decimate_history(history: Sequence[Tuple[float, int]], max_points: int) -> List[Tuple[float, int]]:
+    """Min/max decimation of a plain (timestamp, value) history list"""
+    if len(history) <= max_points:
+        return list(history)
+
+    buckets = max(1, max_points // 2)
+    size = len(history) / buckets
+    points = []
+    for b in range(buckets):
+        chunk = history[int(b * size):int((b + 1) * size)]
+        if not chunk:
+            continue
+        low = min(chunk, key=lambda sample: sample[1])
+        high = max(chunk, key=lambda sample: sample[1])
+        points.extend(sorted({low, high}))
+    return points
+
+class BusGroup:
+    """Several 1-bit traces shown as one hex value - bits listed LSB first"""
+
+    def __init__(self, name: str, bits: List[SignalPyramid]):
+        self.name = name
+        self.bits = bits
+
+    @property
+    def bit_width(self) -> int:
+        return len(self.bits)
+
+    def value_at(self, timestamp: float) -> Optional[int]:
+        value = 0
+        for i, bit in enumerate(self.bits):
+            bit_value = bit.value_at(timestamp)
+            if bit_value is None:
+                return None
+            value |= (1 if bit_value else 0) << i
+        return value
+
+    def columns(self, t0: float, t1: float, width: int) -> List[Tuple[Optional[int], Optional[int], int, Optional[int]]]:
+        """Same shape as SignalPyramid.columns - transitions is the sum over all bits"""
+        per_bit = [bit.columns(t0, t1, width) for bit in self.bits]
+        result = []
+        for c in range(width):
+            value = 0
+            transitions = 0
+            known = True
+            for i, bit_columns in enumerate(per_bit):
+                lo, hi, bit_transitions, start = bit_columns[c]
+                if start is None:
+                    known = False
+                    break
+                value |= (1 if start else 0) << i
+                transitions += bit_transitions
+            if known:
+                result.append((value, value, transitions, value))
+            else:
+                result.append((None, None, 0, None))
+        return result
+
+    def transitions_between(self, t0: float, t1: float) -> int:
+        return sum(measure_transitions(bit, t0, t1) for bit in self.bits)
+
+def measure_transitions(pyramid: SignalPyramid, t0: float, t1: float) -> int:
+    """Exact number of value changes between two times"""
+    start = pyramid.index_at(t0)
+    end = pyramid.index_at(t1)
+    # summarize() counts the change into the first sample, which happened after t0
+    _, _, transitions = pyramid.summarize(start, end)
+    return transitions
+
+def cursor_measurements(trace, t_a: float, t_b: float) -> Dict[str, Any]:
+    """Measurements between two cursors for a SignalPyramid or BusGroup"""
+    t0, t1 = min(t_a, t_b), max(t_a, t_b)
+    delta = t1 - t0
+    if isinstance(trace, BusGroup):
+        transitions = trace.transitions_between(t0, t1)
+    else:
+        transitions = measure_transitions(trace, t0, t1)
+    return {
+        'delta_time': delta,
+        'frequency': 1.0 / delta if delta > 0 else 0.0,
+        'value_a': trace.value_at(t_a),
+        'value_b': trace.value_at(t_b),
+        'transitions': transitions
+    }
+
+__all__ = ['SignalPyramid', 'DEFAULT_MAX_SAMPLES', 'BusGroup', 'decimate_history', 'measure_transitions', 'cursor_measurements']
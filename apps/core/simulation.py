@@ -4,12 +4,21 @@ Handles real-time simulation of the hardware system
 """
 #this goes in core/
 import time
+import heapq
+import itertools
 import threading
-from typing import Dict, List, Any, Optional, Callable, Tuple
+from typing import Dict, List, Any, Optional, Callable, Tuple, Union
 from enum import Enum
 from dataclasses import dataclass
 from PyQt6.QtCore import QObject, pyqtSignal, QTimer
 from core.components import BaseComponent, ComponentManager
+from core.signal_trace import SignalPyramid, decimate_history
+from core.memory import get_component_memory
+from core.profiler import ExecutionProfiler
+from core.interrupts import InterruptController
+from core.input_journal import InputJournal, InputEvent, StateHasher, DEFAULT_FRAME_CYCLES
+from core.bus_nets import (NetSlice, find_pin_groups, parse_bus_declaration, bus_role,
+                           group_width)
 
 class SimulationState(Enum):
     """Simulation states"""
@@ -32,6 +41,10 @@ class SimulationConfig:
     time_step: float = 0.000001  # 1 microsecond
     max_iterations: int = 10000
     trace_signals: bool = False
+    cycles_per_frame: int = 0  # 0 = no frame boundaries
+    warp_frame_skip: int = 8  # present every Nth frame in warp mode
+    warp_audio: str = "mute"  # mute, decimate
+    min_present_fps: float = 10.0  # real time: present at least this often even when behind
     
 class Signal:
     """Represents a digital signal"""
@@ -43,6 +56,9 @@ class Signal:
         self.previous_value = 0
         self.timestamp = 0.0
         self.history: List[tuple] = []  # (timestamp, value)
+        self.trace: Optional[SignalPyramid] = None  # full-resolution trace for the logic analyzer
+        self.on_change: Optional[Callable[['Signal'], None]] = None  # set while components sleep on it
+        self.sleepers: set = set()  # ids of components waiting for a change
         
     def set_value(self, value: int, timestamp: float):
         """Set signal value with timestamp"""
@@ -52,11 +68,16 @@ class Signal:
         
         # Add to history
         self.history.append((timestamp, self.value))
+        if self.trace is not None:
+            self.trace.append(timestamp, self.value)
         
         # Keep limited history
         if len(self.history) > 1000:
             self.history = self.history[-500:]
             
+        if self.on_change is not None and self.value != self.previous_value:
+            self.on_change(self)
+            
     def get_bit(self, bit_index: int) -> int:
         """Get specific bit value"""
         if 0 <= bit_index < self.bit_width:
@@ -93,6 +114,11 @@ class SimulationBus:
         self.signals: Dict[str, Signal] = {}
         self.connected_components: List[BaseComponent] = []
         self.drivers: List[str] = []  # Components that can drive the bus
+        self.net = Signal(name, bit_width)  # packed value - one int write per transfer
+        
+    def slice(self, lsb: int, width: int = 1) -> NetSlice:
+        """View of some bits of the bus, e.g. one address pin"""
+        return NetSlice(self.net, lsb, width)
         
     def add_signal(self, signal_name: str) -> Signal:
         """Add a signal to the bus"""
@@ -113,15 +139,13 @@ class SimulationBus:
     def drive_bus(self, driver_id: str, value: int, timestamp: float):
         """Drive the bus with a value from a specific driver"""
         if driver_id in self.drivers:
+            self.net.set_value(value, timestamp)
             for signal in self.signals.values():
                 signal.set_value(value, timestamp)
                 
     def read_bus(self) -> int:
         """Read current bus value"""
-        # For simplicity, return the value of the first signal
-        if self.signals:
-            return list(self.signals.values())[0].value
-        return 0
+        return self.net.value
 
 class SimulationEngine(QObject):
     """Main simulation engine"""
@@ -132,10 +156,12 @@ class SimulationEngine(QObject):
     componentStateChanged = pyqtSignal(str, dict)  # component_id, state
     errorOccurred = pyqtSignal(str)  # error_message
     statisticsUpdated = pyqtSignal(dict)  # statistics
+    frameReady = pyqtSignal(int)  # frame_number - only for frames that should be presented
+    warpModeChanged = pyqtSignal(bool)  # warp enabled
     
-    def __init__(self, component_manager: ComponentManager):
+    def __init__(self, component_manager: Optional[ComponentManager] = None):
         super().__init__()
-        self.component_manager = component_manager
+        self.component_manager = component_manager if component_manager is not None else ComponentManager()
         self.config = SimulationConfig()
         self.state = SimulationState.STOPPED
         
@@ -148,12 +174,55 @@ class SimulationEngine(QObject):
         # Simulation data
         self.buses: Dict[str, SimulationBus] = {}
         self.signals: Dict[str, Signal] = {}
-        self.event_queue: List[tuple] = []  # (timestamp, event_type, data)
+        self.signal_traces: Dict[str, SignalPyramid] = {}  # kept across reconnects
+        self.pin_groups: Dict[str, Dict[str, Dict[int, str]]] = {}  # component id -> prefix -> bit -> pin
+        self.pin_slices: Dict[Tuple[str, str], NetSlice] = {}  # (component id, pin) -> bit view
+        self.pin_signals: Dict[str, NetSlice] = {}  # "{id}_{pin}" of grouped pins -> bit view
+        self.event_queue: List[tuple] = []  # heap of (timestamp, sequence, event_type, data)
+        self._event_sequence = itertools.count()
+        
+        # Execution traps - address -> handlers, checked by CPU components
+        self.pc_traps: Dict[int, List[Callable]] = {}
+        
+        # Quiescence - sleeping components are skipped until a signal changes or a cycle is reached
+        self.active_components: Optional[List[BaseComponent]] = None  # None = rebuild before next step
+        self._active_revision = -1  # component_manager.revision the list was built from
+        self.sleeping: Dict[str, Tuple[Optional[int], List[str]]] = {}  # id -> (wake cycle, signals)
+        self._wake_heap: List[Tuple[int, int, str]] = []
+        self.awake_components = 0
+        self.component_calls = 0
+        self.component_calls_skipped = 0
+        
+        # Interrupt sources are scheduled deadlines - CPUs check interrupts.pending
+        self.interrupts = InterruptController(self)
+        
+        # Optional execution profiler - CPU components call profiler.record(pc, cycles)
+        self.profiler: Optional[ExecutionProfiler] = None
+        
+        # Record / replay of external stimulus with per-frame state hashes
+        self.journal: Optional[InputJournal] = None
+        self.journal_mode: Optional[str] = None  # 'record', 'replay' or None
+        self.state_hasher = StateHasher(self)
+        self._replay_event_index = 0
+        self._replay_frame_index = 0
+        self.replay_divergence: Optional[Dict[str, Any]] = None
+        self._components_ran = False  # inputs set now are first seen on the next cycle
         
         # Performance tracking
         self.cycles_per_second = 0.0
         self.actual_frequency = 0.0
         self.simulation_ratio = 1.0  # actual_freq / target_freq
+        self.speed_multiple = 1.0  # recent speed relative to real time
+        self._speed_window_time = 0.0
+        self._speed_window_cycle = 0
+        self._last_stats_time = 0.0
+        
+        # Warp mode and frame presentation
+        self.warp_mode = False
+        self.frame_count = 0
+        self.frames_presented = 0
+        self.frames_skipped = 0
+        self._last_present_time = 0.0
         
         # Threading
         self.simulation_thread: Optional[threading.Thread] = None
@@ -208,17 +277,49 @@ class SimulationEngine(QObject):
     def create_signal(self, name: str, bit_width: int = 1) -> Signal:
         """Create a new signal"""
         signal = Signal(name, bit_width)
+        signal.trace = self.signal_traces.get(name)
         self.signals[name] = signal
         return signal
         
+    def trace_signal(self, signal_name: str, bit_width: int = None) -> SignalPyramid:
+        """Start recording every change of a signal for the logic analyzer"""
+        if signal_name not in self.signal_traces:
+            if bit_width is None:
+                signal = self.signals.get(signal_name)
+                bit_width = signal.bit_width if signal else 1
+            self.signal_traces[signal_name] = SignalPyramid(signal_name, bit_width)
+            
+        trace = self.signal_traces[signal_name]
+        if signal_name in self.signals:
+            self.signals[signal_name].trace = trace
+        return trace
+        
+    def untrace_signal(self, signal_name: str):
+        """Stop recording a signal"""
+        self.signal_traces.pop(signal_name, None)
+        if signal_name in self.signals:
+            self.signals[signal_name].trace = None
+        
     def connect_components(self):
         """Connect components to simulation buses and signals"""
         self.buses.clear()
         self.signals.clear()
+        self.pin_slices.clear()
+        self.pin_signals.clear()
+        self.pin_groups.clear()
         
-        # Create standard buses
-        data_bus = self.create_bus("data", 8)
-        address_bus = self.create_bus("address", 16)
+        # Standard buses are as wide as the widest address/data pin group on the board
+        for component in self.component_manager.components.values():
+            self.pin_groups[component.id] = self.get_component_pin_groups(component)
+        widths = {'data': 8, 'address': 16}
+        for groups in self.pin_groups.values():
+            for prefix, members in groups.items():
+                role = bus_role(prefix)
+                if role:
+                    widths[role] = max(widths[role], group_width(members))
+        data_bus = self.create_bus("data", widths['data'])
+        address_bus = self.create_bus("address", widths['address'])
+        self._create_pin_nets()
         
         # Create control signals
         clock_signal = self.create_signal("clock")
@@ -229,8 +330,61 @@ class SimulationEngine(QObject):
         for component in self.component_manager.components.values():
             self._connect_component_to_simulation(component)
             
+    def get_component_pin_groups(self, component: BaseComponent) -> Dict[str, Dict[int, str]]:
+        """Multi-bit pin groups of a component - explicit declarations win over detection
+        
+        Declarations live in component.properties['buses'] as {name: 'A0-A23'} or
+        {name: [pin names LSB first]}.
+        """
+        port_names = [port.name for port in component.ports if port.signal_type == "digital"]
+        groups = find_pin_groups(port_names)
+        declared = component.properties.get('buses', {}) if hasattr(component.properties, 'get') else {}
+        for name, declaration in declared.items():
+            try:
+                members = parse_bus_declaration(declaration)
+            except ValueError as e:
+                print(f"⚠️ {component.name}: {e}")
+                continue
+            # Drop detected groups that overlap the declared one
+            claimed = set(members.values())
+            groups = {prefix: pins for prefix, pins in groups.items() if not claimed & set(pins.values())}
+            groups[name] = members
+        return groups
+        
+    def _create_pin_nets(self):
+        """One packed net per pin group, with 1-bit slices for the individual pins"""
+        for component_id, groups in self.pin_groups.items():
+            for prefix, members in groups.items():
+                role = bus_role(prefix)
+                if role:
+                    net = self.buses[role].net
+                else:
+                    net = self.create_signal(f"{component_id}_{prefix}", group_width(members))
+                for bit, pin in members.items():
+                    pin_slice = NetSlice(net, bit)
+                    self.pin_slices[(component_id, pin)] = pin_slice
+                    # The per-pin signal name reaches the same bit of the packed net
+                    self.pin_signals[f"{component_id}_{pin}"] = pin_slice
+                    
+    def get_pin(self, component_id: str, pin_name: str) -> Optional[NetSlice]:
+        """Single-bit view of a grouped pin"""
+        return self.pin_slices.get((component_id, pin_name))
+        
+    def get_group_net(self, component_id: str, prefix: str) -> Optional[Signal]:
+        """Packed net behind a pin group - write it to transfer the whole group at once"""
+        groups = self.pin_groups.get(component_id, {})
+        if prefix not in groups:
+            return None
+        role = bus_role(prefix)
+        if role:
+            return self.buses[role].net
+        return self.signals.get(f"{component_id}_{prefix}")
+        
     def _connect_component_to_simulation(self, component: BaseComponent):
         """Connect a single component to simulation"""
+        # Models reach their pins through component.engine
+        component.engine = self
+        
         # Connect data ports to data bus
         for port in component.getPortsOfType('data'):
             if 'data' in self.buses:
@@ -247,8 +401,10 @@ class SimulationEngine(QObject):
                     port.direction == 'output'
                 )
                 
-        # Connect control signals
+        # Connect control signals - grouped pins already live in a packed net
         for port in component.getPortsOfType('control'):
+            if (component.id, port.name) in self.pin_slices:
+                continue
             signal_name = f"{component.id}_{port.name}"
             signal = self.create_signal(signal_name)
             
@@ -269,28 +425,29 @@ class SimulationEngine(QObject):
             self.simulation_time = 0.0
             self.start_time = time.time()
             self.last_update_time = self.start_time
+            self._speed_window_time = self.start_time
+            self._speed_window_cycle = 0
+            self.frame_count = 0
+            self.frames_presented = 0
+            self.frames_skipped = 0
+            self._last_present_time = self.start_time
             
             # Connect components
             self.connect_components()
             
-            # Initialize all components
+            # Initialize all components - everything starts awake
+            self.wake_all_components()
+            self.component_calls = 0
+            self.component_calls_skipped = 0
             for component in self.component_manager.components.values():
                 component.simulation_active = True
                 component.reset()
+            self.active_components = None
                 
             # Set state and start
             self.state = SimulationState.RUNNING
             self.stateChanged.emit(self.state.value)
-            
-            if self.config.real_time:
-                # Use timer for real-time simulation
-                self.timer.start()
-            else:
-                # Use separate thread for fast simulation
-                self.stop_requested = False
-                self.simulation_thread = threading.Thread(target=self._simulation_loop)
-                self.simulation_thread.daemon = True
-                self.simulation_thread.start()
+            self._start_runner()
                 
         except Exception as e:
             self.state = SimulationState.ERROR
@@ -310,9 +467,11 @@ class SimulationEngine(QObject):
             self.simulation_thread.join(timeout=1.0)
             
         # Reset components
+        self.wake_all_components()
         for component in self.component_manager.components.values():
             component.simulation_active = False
             component.reset()
+        self.active_components = None
             
         self.state = SimulationState.STOPPED
         self.stateChanged.emit(self.state.value)
@@ -325,16 +484,102 @@ class SimulationEngine(QObject):
             self.state = SimulationState.PAUSED
             self.stateChanged.emit(self.state.value)
             
+            # The loop exits once it sees PAUSED - resume starts a fresh one
+            if (self.simulation_thread and self.simulation_thread.is_alive()
+                    and self.simulation_thread is not threading.current_thread()):
+                self.simulation_thread.join(timeout=1.0)
+            
     def resume_simulation(self):
         """Resume the simulation"""
         if self.state == SimulationState.PAUSED:
             self.pause_requested = False
             self.state = SimulationState.RUNNING
             self.stateChanged.emit(self.state.value)
+            self.last_update_time = time.time()
+            self._start_runner()
+            
+    def _start_runner(self):
+        """Drive a running simulation - the QTimer pacer in real time, the loop thread otherwise"""
+        if self.config.real_time and not self.warp_mode:
+            self.timer.start()
+        elif not (self.simulation_thread and self.simulation_thread.is_alive()):
+            self._start_simulation_thread()
+                
+    def _start_simulation_thread(self):
+        """Run the simulation loop in a background thread"""
+        self.stop_requested = False
+        self.simulation_thread = threading.Thread(target=self._simulation_loop)
+        self.simulation_thread.daemon = True
+        self.simulation_thread.start()
+        
+    def set_warp_mode(self, enabled: bool, frame_skip: Optional[int] = None):
+        """Run as fast as possible - disables the real-time pacer and thins out presentation"""
+        if frame_skip is not None:
+            self.config.warp_frame_skip = max(1, frame_skip)
             
-            if self.config.real_time:
+        if enabled == self.warp_mode:
+            return
+            
+        self.warp_mode = enabled
+        self._speed_window_time = time.time()
+        self._speed_window_cycle = self.current_cycle
+        
+        # Swap the real-time timer for the free-running thread and back
+        if self.state == SimulationState.RUNNING and self.config.real_time:
+            if enabled:
+                self.timer.stop()
+                self._start_simulation_thread()
+            else:
+                self.stop_requested = True
+                if self.simulation_thread and self.simulation_thread.is_alive():
+                    self.simulation_thread.join(timeout=1.0)
+                self.stop_requested = False
                 self.timer.start()
                 
+        self.warpModeChanged.emit(enabled)
+        print(f"⏩ Warp mode: {'on' if enabled else 'off'}")
+        
+    def toggle_warp_mode(self):
+        """Toggle warp mode"""
+        self.set_warp_mode(not self.warp_mode)
+        
+    @property
+    def audio_sample_stride(self) -> int:
+        """Audio output stride for sound components - 0 mutes, N keeps every Nth sample"""
+        if not self.warp_mode:
+            return 1
+        if self.config.warp_audio == "decimate":
+            return max(1, int(round(self.speed_multiple)))
+        return 0
+        
+    def should_present_frame(self) -> bool:
+        """Whether the frame that just completed should be rendered"""
+        if self.warp_mode:
+            return self.frame_count % max(1, self.config.warp_frame_skip) == 0
+            
+        # Real-time: drop frames while the emulation is behind the wall clock,
+        # but never go longer than 1/min_present_fps without showing one
+        target_frequency = self.config.clock_frequency * 1000000
+        if target_frequency <= 0:
+            return True
+        now = time.time()
+        expected_cycle = (now - self.start_time) * target_frequency
+        if self.current_cycle + self.config.cycles_per_frame >= expected_cycle:
+            return True
+        min_fps = self.config.min_present_fps
+        return min_fps > 0 and now - self._last_present_time >= 1.0 / min_fps
+        
+    def _end_frame(self):
+        """Frame boundary - decide whether video is presented"""
+        self.frame_count += 1
+        if self.should_present_frame():
+            self.frames_presented += 1
+            self._last_present_time = time.time()
+            self.frameReady.emit(self.frame_count)
+        else:
+            self.frames_skipped += 1
+        self.emit_event('frame_completed', self.frame_count)
+        
     def step_simulation(self):
         """Execute one simulation step"""
         if self.state in [SimulationState.STOPPED, SimulationState.PAUSED]:
@@ -349,39 +594,75 @@ class SimulationEngine(QObject):
         try:
             # Update simulation time
             current_time = time.time()
-            if self.config.real_time:
+            if self.config.real_time and not self.warp_mode:
                 delta_time = current_time - self.last_update_time
                 self.simulation_time += delta_time
             else:
-                # In non-real-time mode, advance by one clock cycle
+                # Non-real-time and warp advance by one clock cycle
                 self.simulation_time += 1.0 / (self.config.clock_frequency * 1000000)
                 
             self.last_update_time = current_time
+            self._components_ran = False
             
+            # Journal stimulus due before this cycle
+            if self.journal_mode == 'replay':
+                self._replay_inputs()
+                
             # Generate clock signal
             if 'clock' in self.signals:
                 clock_value = 1 if (self.current_cycle % 2) == 0 else 0
                 self.signals['clock'].set_value(clock_value, self.simulation_time)
                 
-            # Update all components
-            for component in self.component_manager.components.values():
-                if component.simulation_active:
-                    try:
-                        component.simulate_step(self.current_cycle)
+            # Raise interrupts that fall due this cycle
+            if self.current_cycle >= self.interrupts.next_deadline:
+                self.interrupts.service(self.current_cycle)
+                
+            # Update awake components
+            if self._wake_heap and self._wake_heap[0][0] <= self.current_cycle:
+                self._wake_due_components()
+            active = self.active_components
+            if active is None or self._active_revision != self.component_manager.revision:
+                active = self._rebuild_active_components()
+            self.awake_components = len(active)
+            self.component_calls += len(active)
+            self.component_calls_skipped += len(self.sleeping)
+            
+            for component in active:
+                try:
+                    component.simulate_step(self.current_cycle)
+                    
+                    # Emit component state if changed
+                    if hasattr(component, 'state') and component.state:
+                        self.componentStateChanged.emit(component.id, component.state)
                         
-                        # Emit component state if changed
-                        if hasattr(component, 'state') and component.state:
-                            self.componentStateChanged.emit(component.id, component.state)
-                            
-                    except Exception as e:
-                        print(f"Error simulating component {component.name}: {e}")
+                    if component.sleep_request is not None:
+                        until_cycle, signals = component.sleep_request
+                        component.sleep_request = None
+                        self.sleep_component(component.id, until_cycle, signals)
                         
+                except Exception as e:
+                    print(f"Error simulating component {component.name}: {e}")
+            self._components_ran = True
+            
+            # Hash the frame before event handlers feed in inputs stamped for the next cycle,
+            # so recording and replay hash the same state
+            next_cycle = self.current_cycle + 1
+            if self.journal_mode and next_cycle % self.journal.frame_cycles == 0:
+                self._journal_frame(next_cycle)
+                
             # Process event queue
             self._process_event_queue()
             
             # Update cycle counter
             self.current_cycle += 1
-            self.cycleCompleted.emit(self.current_cycle)
+            self._components_ran = False
+            if not self.warp_mode:
+                self.cycleCompleted.emit(self.current_cycle)
+                
+            # Frame boundary
+            cycles_per_frame = self.config.cycles_per_frame
+            if cycles_per_frame and self.current_cycle % cycles_per_frame == 0:
+                self._end_frame()
             
             # Update performance statistics
             self._update_performance_stats()
@@ -401,8 +682,8 @@ class SimulationEngine(QObject):
             if not self.pause_requested:
                 self.simulation_step()
                 
-                # Small delay to prevent 100% CPU usage
-                if self.config.clock_frequency > 1000:  # If very high frequency
+                # Small delay to prevent 100% CPU usage - warp never sleeps
+                if not self.warp_mode and self.config.clock_frequency > 1000:  # If very high frequency
                     time.sleep(0.001)  # 1ms delay
             else:
                 time.sleep(0.01)  # 10ms delay when paused
@@ -410,29 +691,246 @@ class SimulationEngine(QObject):
     def _process_event_queue(self):
         """Process scheduled events"""
         current_time = self.simulation_time
-        events_to_process = []
+        queue = self.event_queue
         
-        # Find events that should be processed
-        for event in self.event_queue:
-            timestamp, event_type, data = event
-            if timestamp <= current_time:
-                events_to_process.append(event)
-                
-        # Remove processed events from queue
-        for event in events_to_process:
-            self.event_queue.remove(event)
-            
-        # Process events
-        for timestamp, event_type, data in events_to_process:
+        # Events are kept in a heap so only due events are touched
+        while queue and queue[0][0] <= current_time:
+            timestamp, _, event_type, data = heapq.heappop(queue)
             self.emit_event(event_type, data)
             
     def schedule_event(self, delay: float, event_type: str, data: Any = None):
         """Schedule an event to occur after a delay"""
         timestamp = self.simulation_time + delay
-        self.event_queue.append((timestamp, event_type, data))
+        heapq.heappush(self.event_queue, (timestamp, next(self._event_sequence), event_type, data))
+        
+    def add_pc_trap(self, address: int, handler: Callable):
+        """Add a handler run when a CPU is about to execute at address"""
+        self.pc_traps.setdefault(address, [])
+        if handler not in self.pc_traps[address]:
+            self.pc_traps[address].append(handler)
+            
+    def remove_pc_trap(self, address: int, handler: Callable):
+        """Remove an execution trap"""
+        handlers = self.pc_traps.get(address)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+            if not handlers:
+                del self.pc_traps[address]
+                
+    def check_pc_trap(self, cpu) -> bool:
+        """Called by CPU components before each instruction - True if a trap handled it"""
+        handlers = self.pc_traps.get(cpu.registers['PC'])
+        if not handlers:
+            return False
+        for handler in handlers:
+            if handler(cpu):
+                return True
+        return False
+        
+    # === Quiescence ===
+    
+    def _rebuild_active_components(self) -> List[BaseComponent]:
+        manager = self.component_manager
+        self._active_revision = manager.revision
+        active = []
+        for component_id, component in manager.components.items():
+            # Parts added since connect_components() report simulation_active changes too
+            component.engine = self
+            if getattr(component, 'simulation_active', False) and component_id not in self.sleeping:
+                active.append(component)
+        self.active_components = active
+        return active
         
-        # Keep queue sorted by timestamp
-        self.event_queue.sort(key=lambda x: x[0])
+    def _find_signal(self, name: str) -> Optional[Signal]:
+        """Engine signal by name, or bus signal as 'bus.signal'
+
+        A grouped pin resolves to its packed net, so sleepers wake on any bit of the group.
+        """
+        signal = self.signals.get(name)
+        if signal is None and name in self.pin_signals:
+            signal = self.pin_signals[name].net
+        if signal is None and '.' in name:
+            bus_name, signal_name = name.split('.', 1)
+            bus = self.buses.get(bus_name)
+            if bus:
+                signal = bus.signals.get(signal_name)
+        return signal
+        
+    def sleep_component(self, component_id: str, until_cycle: Optional[int] = None,
+                        signals: Optional[List[str]] = None):
+        """Skip a component until until_cycle or until one of the signals changes
+        
+        With neither given it sleeps until wake_component() is called.
+        """
+        if component_id not in self.component_manager.components:
+            return
+        self.wake_component(component_id)  # replace any earlier sleep
+        if until_cycle is not None and until_cycle <= self.current_cycle:
+            return  # already due - stays awake
+        
+        watched = []
+        for name in signals or []:
+            signal = self._find_signal(name)
+            if signal is None:
+                print(f"⚠️ Cannot sleep on unknown signal {name}")
+                continue
+            signal.sleepers.add(component_id)
+            signal.on_change = self._on_signal_changed
+            watched.append(name)
+            
+        if until_cycle is not None:
+            heapq.heappush(self._wake_heap, (until_cycle, next(self._event_sequence), component_id))
+        self.sleeping[component_id] = (until_cycle, watched)
+        self.active_components = None
+        
+    def wake_component(self, component_id: str):
+        """Put a sleeping component back on the active list"""
+        entry = self.sleeping.pop(component_id, None)
+        if entry is None:
+            return
+        for name in entry[1]:
+            signal = self._find_signal(name)
+            if signal is not None:
+                signal.sleepers.discard(component_id)
+                if not signal.sleepers:
+                    signal.on_change = None
+        self.active_components = None
+        
+    def wake_all_components(self):
+        for component_id in list(self.sleeping):
+            self.wake_component(component_id)
+        self._wake_heap.clear()
+        
+    def _on_signal_changed(self, signal: Signal):
+        for component_id in list(signal.sleepers):
+            self.wake_component(component_id)
+            
+    def _wake_due_components(self):
+        heap = self._wake_heap
+        while heap and heap[0][0] <= self.current_cycle:
+            cycle, _, component_id = heapq.heappop(heap)
+            entry = self.sleeping.get(component_id)
+            if entry is not None and entry[0] == cycle:
+                self.wake_component(component_id)
+                
+    def enable_profiler(self, address_space: int = 0x10000) -> ExecutionProfiler:
+        """Start counting executed instructions per address"""
+        if self.profiler is None or self.profiler.address_space != address_space:
+            self.profiler = ExecutionProfiler(address_space)
+        self.emit_event('profiler_changed', self.profiler)
+        return self.profiler
+        
+    def disable_profiler(self):
+        """Stop profiling - collected data is dropped"""
+        self.profiler = None
+        self.emit_event('profiler_changed', None)
+        
+    def start_recording(self, frame_cycles: Optional[int] = None) -> InputJournal:
+        """Reset and journal every external stimulus from cycle 0
+        
+        Keyboard, joystick and tape sources go through set_signal_value /
+        set_bus_value / set_component_state with their own source label.
+        """
+        self.reset_simulation()
+        self.journal = InputJournal(frame_cycles or self.config.cycles_per_frame or DEFAULT_FRAME_CYCLES)
+        self.journal.metadata = {'clock_frequency': self.config.clock_frequency,
+                                 'components': sorted(self.component_manager.components)}
+        self.journal_mode = 'record'
+        self.state_hasher.reset()
+        self.journal.add_frame(0, self.state_hasher.frame_hash())
+        self.emit_event('journal_changed', 'record')
+        print(f"✓ Recording inputs (state hash every {self.journal.frame_cycles} cycles)")
+        return self.journal
+        
+    def stop_recording(self) -> Optional[InputJournal]:
+        """Finish recording - returns the journal"""
+        journal = self.journal if self.journal_mode == 'record' else None
+        if journal:
+            self.journal_mode = None
+            self.emit_event('journal_changed', None)
+            summary = journal.get_summary()
+            print(f"✓ Recorded {summary['events']} inputs over {summary['frames']} frames")
+        return journal
+        
+    def start_replay(self, journal: InputJournal):
+        """Reset and feed a journal back in - stops at the first diverging frame
+        
+        Live stimulus sources (tape deck, keyboard) should stay detached;
+        the journal drives them.
+        """
+        self.reset_simulation()
+        self.journal = journal
+        self.journal_mode = 'replay'
+        self._replay_event_index = 0
+        self._replay_frame_index = 0
+        self.replay_divergence = None
+        self.state_hasher.reset()
+        self.emit_event('journal_changed', 'replay')
+        self._journal_frame()
+        
+    def stop_replay(self):
+        if self.journal_mode == 'replay':
+            self.journal_mode = None
+            self.emit_event('journal_changed', None)
+            
+    def _apply_input(self, event: InputEvent):
+        """Apply a journal event without re-recording it"""
+        if event.kind == 'signal':
+            signal = self._signal_or_pin(event.target)
+            if signal is not None:
+                signal.set_value(event.value, self.simulation_time)
+        elif event.kind == 'bus':
+            bus = self.buses.get(event.target)
+            if bus:
+                bus.drive_bus(event.key, event.value, self.simulation_time)
+        elif event.kind == 'state':
+            component = self.component_manager.get_component(event.target)
+            if component:
+                component.setState(event.key, event.value)
+                self.wake_component(event.target)
+                
+    def _replay_inputs(self):
+        events = self.journal.events
+        index = self._replay_event_index
+        while index < len(events) and events[index].cycle <= self.current_cycle:
+            self._apply_input(events[index])
+            index += 1
+        self._replay_event_index = index
+        
+    def _journal_frame(self, cycle: Optional[int] = None):
+        """Frame boundary - record the state hash, or check it against the journal"""
+        if cycle is None:
+            cycle = self.current_cycle
+        state_hash = self.state_hasher.frame_hash()
+        if self.journal_mode == 'record':
+            self.journal.add_frame(cycle, state_hash)
+            return
+            
+        frames = self.journal.frames
+        index = self._replay_frame_index
+        if index >= len(frames):
+            self.stop_replay()
+            self.emit_event('replay_completed', {'frames': len(frames), 'cycle': cycle})
+            print(f"✅ Replay matched all {len(frames)} frames")
+            self.pause_simulation()  # keep the state for inspection
+            return
+            
+        expected_cycle, expected_hash = frames[index]
+        if expected_cycle != cycle or expected_hash != state_hash:
+            self.replay_divergence = {
+                'frame': index,
+                'cycle': cycle,
+                'expected_cycle': expected_cycle,
+                'expected_hash': expected_hash,
+                'actual_hash': state_hash
+            }
+            self.stop_replay()
+            self.emit_event('replay_diverged', self.replay_divergence)
+            print(f"❌ Replay diverged at frame {index} (cycle {cycle}): "
+                  f"expected {expected_hash:08x}, got {state_hash:08x}")
+            self.pause_simulation()  # keep the state for inspection
+            return
+        self._replay_frame_index = index + 1
         
     def _update_performance_stats(self):
         """Update performance statistics"""
@@ -449,8 +947,21 @@ class SimulationEngine(QObject):
             else:
                 self.simulation_ratio = 1.0
                 
-        # Emit statistics every 100 cycles
+        # Recent speed multiple over a short window
+        window = current_time - self._speed_window_time
+        if window >= 0.25:
+            target_frequency = self.config.clock_frequency * 1000000
+            if target_frequency > 0:
+                recent_rate = (self.current_cycle - self._speed_window_cycle) / window
+                self.speed_multiple = recent_rate / target_frequency
+            self._speed_window_time = current_time
+            self._speed_window_cycle = self.current_cycle
+                
+        # Emit statistics every 100 cycles - at most 4 times a second in warp
         if self.current_cycle % 100 == 0:
+            if self.warp_mode and current_time - self._last_stats_time < 0.25:
+                return
+            self._last_stats_time = current_time
             stats = self.get_simulation_statistics()
             self.statisticsUpdated.emit(stats)
             
@@ -464,22 +975,51 @@ class SimulationEngine(QObject):
             'actual_frequency': self.actual_frequency,
             'target_frequency': self.config.clock_frequency * 1000000,
             'simulation_ratio': self.simulation_ratio,
+            'speed_multiple': self.speed_multiple,
+            'warp_mode': self.warp_mode,
+            'frame_count': self.frame_count,
+            'frames_presented': self.frames_presented,
+            'frames_skipped': self.frames_skipped,
+            'profiling': self.profiler is not None,
+            'journal': self.journal_mode,
+            'interrupts_pending': self.interrupts.pending,
+            'interrupts_raised': self.interrupts.raised,
+            'awake_components': self.awake_components,
+            'sleeping_components': len(self.sleeping),
+            'component_calls_skipped': self.component_calls_skipped,
+            'sleep_ratio': (self.component_calls_skipped /
+                            max(1, self.component_calls + self.component_calls_skipped)),
             'component_count': len(self.component_manager.components),
             'bus_count': len(self.buses),
             'signal_count': len(self.signals),
             'event_queue_size': len(self.event_queue)
         }
         
+    def _signal_or_pin(self, signal_name: str) -> Optional[Union[Signal, NetSlice]]:
+        """Signal by name - grouped pins ("{id}_{pin}") give their bit of the packed net"""
+        signal = self.signals.get(signal_name)
+        if signal is None:
+            signal = self.pin_signals.get(signal_name)
+        return signal
+        
     def get_signal_value(self, signal_name: str) -> Optional[int]:
         """Get current value of a signal"""
-        if signal_name in self.signals:
-            return self.signals[signal_name].value
+        signal = self._signal_or_pin(signal_name)
+        if signal is not None:
+            return signal.value
         return None
         
-    def set_signal_value(self, signal_name: str, value: int):
+    def _input_cycle(self) -> int:
+        """Cycle a journalled input is stamped with - the first one whose components see it"""
+        return self.current_cycle + 1 if self._components_ran else self.current_cycle
+        
+    def set_signal_value(self, signal_name: str, value: int, source: str = "manual"):
         """Set value of a signal"""
-        if signal_name in self.signals:
-            self.signals[signal_name].set_value(value, self.simulation_time)
+        signal = self._signal_or_pin(signal_name)
+        if signal is not None:
+            if self.journal_mode == 'record':
+                self.journal.record(self._input_cycle(), 'signal', signal_name, value, source=source)
+            signal.set_value(value, self.simulation_time)
             
     def get_bus_value(self, bus_name: str) -> Optional[int]:
         """Get current value of a bus"""
@@ -487,9 +1027,11 @@ class SimulationEngine(QObject):
             return self.buses[bus_name].read_bus()
         return None
         
-    def set_bus_value(self, bus_name: str, value: int, driver_id: str):
+    def set_bus_value(self, bus_name: str, value: int, driver_id: str, source: str = "manual"):
         """Set value of a bus from a specific driver"""
         if bus_name in self.buses:
+            if self.journal_mode == 'record':
+                self.journal.record(self._input_cycle(), 'bus', bus_name, value, driver_id, source)
             self.buses[bus_name].drive_bus(driver_id, value, self.simulation_time)
             
     def get_component_state(self, component_id: str) -> Optional[Dict[str, Any]]:
@@ -499,11 +1041,15 @@ class SimulationEngine(QObject):
             return component.state.copy()
         return None
         
-    def set_component_state(self, component_id: str, state_key: str, value: Any):
+    def set_component_state(self, component_id: str, state_key: str, value: Any,
+                            source: str = "manual"):
         """Set state of a specific component"""
         component = self.component_manager.get_component(component_id)
         if component:
+            if self.journal_mode == 'record':
+                self.journal.record(self._input_cycle(), 'state', component_id, value, state_key, source)
             component.setState(state_key, value)
+            self.wake_component(component_id)
             
     def reset_simulation(self):
         """Reset simulation to initial state"""
@@ -524,14 +1070,30 @@ class SimulationEngine(QObject):
             for signal in bus.signals.values():
                 signal.set_value(0, 0.0)
                 signal.history.clear()
+            # read_bus() reads the packed net
+            bus.net.set_value(0, 0.0)
+            bus.net.previous_value = 0
+            bus.net.history.clear()
                 
-        # Clear event queue
+        # Clear event queue and recorded traces
         self.event_queue.clear()
+        for trace in self.signal_traces.values():
+            trace.clear()
+        if self.profiler:
+            self.profiler.reset()
+        self.interrupts.reset()
         
         # Reset all components
+        self.wake_all_components()
         for component in self.component_manager.components.values():
             component.reset()
             
+    # Short names used by the menu bar signals
+    start = start_simulation
+    stop = stop_simulation
+    pause = pause_simulation
+    reset = reset_simulation
+    
     def export_simulation_data(self) -> Dict[str, Any]:
         """Export simulation data for analysis"""
         data = {
@@ -595,14 +1157,11 @@ class SimulationEngine(QObject):
             
     def get_signal_history(self, signal_name: str, max_points: int = 1000) -> List[Tuple[float, int]]:
         """Get signal history for plotting"""
+        if signal_name in self.signal_traces:
+            return self.signal_traces[signal_name].decimate(max_points)
         if signal_name in self.signals:
-            history = self.signals[signal_name].history
-            if len(history) <= max_points:
-                return history
-            else:
-                # Downsample history
-                step = len(history) // max_points
-                return history[::step]
+            # Min/max decimation keeps short pulses visible
+            return decimate_history(self.signals[signal_name].history, max_points)
         return []
         
     def add_breakpoint(self, condition: Callable[[], bool], description: str = ""):
@@ -638,10 +1197,14 @@ class SimulationEngine(QObject):
             errors.append("No components in system")
             
         # Check for unconnected power pins
+        net_map = self.component_manager.net_map
         for component in self.component_manager.components.values():
             power_ports = component.getPortsOfType('power')
+            if not power_ports:
+                continue
+            connected = net_map.nets_of_component(component.id)
             for port in power_ports:
-                if not port.connected_to:
+                if port.name not in connected:
                     warnings.append(f"Component {component.name} has unconnected power port: {port.name}")
                     
         # Check for floating buses
@@ -705,8 +1268,8 @@ class DebugInterface:
         """Get recent trace entries"""
         return self.trace_log[-count:]
 
-class DebugInterface_old:
-    """Debug interface for simulation"""
+class SimulationDebugger:
+    """Condition breakpoints, memory and register access on a running SimulationEngine"""
 
     def __init__(self, simulation_engine: SimulationEngine):
         self.engine = simulation_engine
@@ -792,20 +1355,20 @@ class DebugInterface_old:
 
     def examine_memory(self, component_id: str, address: int, length: int = 1) -> List[int]:
         """Examine memory contents"""
-        # This would need to be implemented based on specific component types
-        component = self.engine.component_manager.get_component(component_id)
-        if component and hasattr(component, 'memory'):
-            # Hypothetical memory access
-            return [0] * length  # Placeholder
-        return []
-
-    def set_memory(self, component_id: str, address: int, data: List[int]):
-        """Set memory contents"""
-        # This would need to be implemented based on specific component types
-        component = self.engine.component_manager.get_component(component_id)
-        if component and hasattr(component, 'memory'):
-            # Hypothetical memory write
-            pass
+        memory = get_component_memory(self.engine.component_manager.get_component(component_id))
+        if memory is None or address < 0:
+            return []
+        return list(memory.read_block(address, length))
+
+    def set_memory(self, component_id: str, address: int, data: List[int]) -> int:
+        """Set memory contents - returns the number of bytes written"""
+        memory = get_component_memory(self.engine.component_manager.get_component(component_id))
+        if memory is None or address < 0 or address >= len(memory):
+            return 0
+        # Debugger edits go straight to the backing store, ROM included
+        data = bytes(value & 0xFF for value in data)[:len(memory) - address]
+        memory[address:address + len(data)] = data
+        return len(data)
 
     def get_register_values(self, component_id: str) -> Dict[str, int]:
         """Get register values for a component"""
@@ -826,217 +1389,3 @@ class DebugInterface_old:
         component = self.engine.component_manager.get_component(component_id)
         if component:
             component.trace_enabled = enable
-
-class SimulationEngine:
-    """Main simulation engine"""
-
-    def __init__(self, component_manager=None):
-        self.component_manager = component_manager
-        self.config = SimulationConfig()
-        self.state = SimulationState.STOPPED
-        self.buses: Dict[str, SimulationBus] = {}
-        self.debug = DebugInterface()
-        self.components: List[Any] = []
-
-        # Threading
-        self._simulation_thread = None
-        self._stop_event = threading.Event()
-        self._pause_event = threading.Event()
-
-        # Timing
-        self.simulation_time = 0.0
-        self.cycle_count = 0
-
-        # Create default buses
-        self._create_default_buses()
-
-        print("✓ SimulationEngine initialized")
-
-    def _create_default_buses(self):
-        """Create standard buses"""
-        self.buses['address'] = SimulationBus('address', 16)
-        self.buses['data'] = SimulationBus('data', 8)
-        self.buses['control'] = SimulationBus('control', 8)
-
-        # Add common control signals
-        self.buses['control'].add_signal('clock')
-        self.buses['control'].add_signal('reset')
-        self.buses['control'].add_signal('read')
-        self.buses['control'].add_signal('write')
-
-    def add_component(self, component):
-        """Add component to simulation"""
-        if component not in self.components:
-            self.components.append(component)
-
-            # Connect component to buses if it has the interface
-            if hasattr(component, 'connect_to_bus'):
-                for bus_name, bus in self.buses.items():
-                    component.connect_to_bus(bus_name, bus)
-
-    def remove_component(self, component):
-        """Remove component from simulation"""
-        if component in self.components:
-            self.components.remove(component)
-
-    def start_simulation(self):
-        """Start the simulation"""
-        if self.state != SimulationState.STOPPED:
-            return False
-
-        self.state = SimulationState.RUNNING
-        self._stop_event.clear()
-        self._pause_event.clear()
-
-        self._simulation_thread = threading.Thread(target=self._simulation_loop)
-        self._simulation_thread.daemon = True
-        self._simulation_thread.start()
-
-        print("✓ Simulation started")
-        return True
-
-    def stop_simulation(self):
-        """Stop the simulation"""
-        if self.state == SimulationState.STOPPED:
-            return
-
-        self._stop_event.set()
-        self.state = SimulationState.STOPPED
-
-        if self._simulation_thread:
-            self._simulation_thread.join(timeout=1.0)
-
-        print("✓ Simulation stopped")
-
-    def pause_simulation(self):
-        """Pause the simulation"""
-        if self.state == SimulationState.RUNNING:
-            self._pause_event.set()
-            self.state = SimulationState.PAUSED
-
-    def resume_simulation(self):
-        """Resume paused simulation"""
-        if self.state == SimulationState.PAUSED:
-            self._pause_event.clear()
-            self.state = SimulationState.RUNNING
-
-    def _simulation_loop(self):
-        """Main simulation loop"""
-        try:
-            while not self._stop_event.is_set():
-                # Check for pause
-                while self._pause_event.is_set() and not self._stop_event.is_set():
-                    time.sleep(0.01)
-
-                if self._stop_event.is_set():
-                    break
-
-                # Execute one simulation step
-                self._simulation_step()
-
-                # Timing control
-                time.sleep(self.config.time_step)
-
-                # Check iteration limit
-                if self.cycle_count >= self.config.max_iterations:
-                    print("⚠️ Simulation reached maximum iterations")
-                    break
-
-        except Exception as e:
-            print(f"❌ Simulation error: {e}")
-            self.state = SimulationState.ERROR
-        finally:
-            self.state = SimulationState.STOPPED
-
-    def _simulation_step(self):
-        """Execute one simulation step"""
-        self.cycle_count += 1
-        self.simulation_time += self.config.time_step
-
-        # Generate clock signal
-        clock_state = 1 if (self.cycle_count % 2) == 0 else 0
-        self.buses['control'].set_signal('clock', clock_state)
-
-        # Update all components
-        for component in self.components:
-            if hasattr(component, 'simulation_step'):
-                try:
-                    component.simulation_step(self.simulation_time)
-                except Exception as e:
-                    if self.config.debug_mode:
-                        print(f"Component {component} error: {e}")
-
-        # Debug tracing
-        if self.config.trace_signals:
-            self._trace_signals()
-
-    def _trace_signals(self):
-        """Trace signal states for debugging"""
-        trace_data = {}
-        for bus_name, bus in self.buses.items():
-            bus_data = {}
-            for signal_name, signal in bus.signals.items():
-                bus_data[signal_name] = signal.value
-            trace_data[bus_name] = bus_data
-
-        self.debug.log_trace('system', 'signal_trace', trace_data)
-
-    def reset_simulation(self):
-        """Reset simulation state"""
-        was_running = self.state == SimulationState.RUNNING
-
-        if was_running:
-            self.stop_simulation()
-
-        # Reset state
-        self.simulation_time = 0.0
-        self.cycle_count = 0
-        self.debug.trace_log.clear()
-
-        # Reset buses
-        for bus in self.buses.values():
-            for signal in bus.signals.values():
-                signal.set_value(0)
-
-        # Reset components
-        for component in self.components:
-            if hasattr(component, 'reset'):
-                component.reset()
-
-        # Generate reset pulse
-        self.buses['control'].set_signal('reset', 1)
-        time.sleep(0.001)  # Brief reset pulse
-        self.buses['control'].set_signal('reset', 0)
-
-        if was_running:
-            self.start_simulation()
-
-        print("✓ Simulation reset")
-
-    def get_bus_state(self, bus_name: str) -> Dict[str, Any]:
-        """Get current state of a bus"""
-        if bus_name not in self.buses:
-            return {}
-
-        bus = self.buses[bus_name]
-        state = {}
-        for signal_name, signal in bus.signals.items():
-            state[signal_name] = {
-                'value': signal.value,
-                'timestamp': signal.timestamp,
-                'width': signal.width
-            }
-        return state
-
-    def get_simulation_stats(self) -> Dict[str, Any]:
-        """Get simulation statistics"""
-        return {
-            'state': self.state.value,
-            'simulation_time': self.simulation_time,
-            'cycle_count': self.cycle_count,
-            'components_count': len(self.components),
-            'buses_count': len(self.buses),
-            'clock_speed': self.config.clock_speed,
-            'debug_mode': self.config.debug_mode
-        }
-
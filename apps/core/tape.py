@@ -0,0 +1,524 @@
+"""
+X-Seti - October18 2026 - Tape Subsystem
+TAP/TZX tape images for the ZX Spectrum - pulse playback and ROM-trap fast loading
+"""
+#this goes in core/
+
+import os
+import mmap
+import struct
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Iterator
+
+# Standard ROM loader timings (T-states at 3.5MHz)
+PILOT_PULSE = 2168
+SYNC1_PULSE = 667
+SYNC2_PULSE = 735
+ZERO_PULSE = 855
+ONE_PULSE = 1710
+PILOT_HEADER_COUNT = 8063
+PILOT_DATA_COUNT = 3223
+DEFAULT_PAUSE_MS = 1000
+
+# 48K ROM entry point of LD-BYTES
+LD_BYTES = 0x0556
+
+SPECTRUM_CLOCK_HZ = 3500000
+TZX_SIGNATURE = b"ZXTape!\x1a"
+
+@dataclass
+class TapeBlock:
+    """A single block on the tape - data is a view into the mapped file"""
+    index: int
+    block_id: int
+    data: memoryview
+    pilot_pulse: int = PILOT_PULSE
+    sync1_pulse: int = SYNC1_PULSE
+    sync2_pulse: int = SYNC2_PULSE
+    zero_pulse: int = ZERO_PULSE
+    one_pulse: int = ONE_PULSE
+    pilot_count: int = PILOT_HEADER_COUNT
+    used_bits: int = 8
+    pause_ms: int = DEFAULT_PAUSE_MS
+    tone: tuple = ()  # explicit pulse lengths for pure tone / pulse sequence blocks
+
+    @property
+    def is_data(self) -> bool:
+        """Block carries bytes the ROM loader can read"""
+        return len(self.data) > 0
+
+    @property
+    def flag(self) -> int:
+        """Flag byte (0x00 header, 0xFF data)"""
+        return self.data[0] if self.data else -1
+
+    def pulses(self) -> Iterator[int]:
+        """Generate edge intervals in T-states for this block"""
+        yield from self.tone
+
+        for _ in range(self.pilot_count):
+            yield self.pilot_pulse
+
+        if self.sync1_pulse:
+            yield self.sync1_pulse
+        if self.sync2_pulse:
+            yield self.sync2_pulse
+
+        data = self.data
+        last = len(data) - 1
+        zero, one = self.zero_pulse, self.one_pulse
+        for i in range(len(data)):
+            byte = data[i]
+            bits = self.used_bits if i == last else 8
+            for bit in range(bits):
+                pulse = one if byte & (0x80 >> bit) else zero
+                yield pulse
+                yield pulse
+
+class TapeImage:
+    """TAP or TZX image read lazily from a memory-mapped file"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.is_tzx = False
+        self._file = None
+        self._map = None
+        self._view = memoryview(b"")
+        self._offsets: List[int] = []  # start offset of every block found so far
+        self._end_reached = False
+        self._open()
+
+    def _open(self):
+        """Map the file and detect its format"""
+        self._file = open(self.filename, 'rb')
+        if os.fstat(self._file.fileno()).st_size > 0:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._map)
+
+        self.is_tzx = bytes(self._view[:8]) == TZX_SIGNATURE
+        self._offsets = [10 if self.is_tzx else 0]
+
+    def close(self):
+        """Release the mapping"""
+        try:
+            self._view.release()
+            if self._map:
+                self._map.close()
+        except BufferError:
+            # Blocks handed out still reference the map - it is freed with them
+            pass
+        self._map = None
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __iter__(self) -> Iterator[TapeBlock]:
+        index = 0
+        while True:
+            block = self.block(index)
+            if block is None:
+                return
+            yield block
+            index += 1
+
+    def block(self, index: int) -> Optional[TapeBlock]:
+        """Get block by index, parsing only as far as needed"""
+        while index >= len(self._offsets) - 1 and not self._end_reached:
+            self._scan_next()
+
+        if index >= len(self._offsets) - 1:
+            return None
+
+        offset = self._offsets[index]
+        if self.is_tzx:
+            block, _ = self._parse_tzx_block(index, offset)
+        else:
+            block, _ = self._parse_tap_block(index, offset)
+        return block
+
+    def data_blocks(self) -> Iterator[TapeBlock]:
+        """Iterate only the blocks that carry loader data"""
+        return (block for block in self if block.is_data)
+
+    def _scan_next(self):
+        """Find the start of the block following the last known one"""
+        offset = self._offsets[-1]
+        try:
+            if self.is_tzx:
+                _, next_offset = self._parse_tzx_block(len(self._offsets) - 1, offset)
+            else:
+                _, next_offset = self._parse_tap_block(len(self._offsets) - 1, offset)
+        except (struct.error, IndexError, ValueError) as e:
+            print(f"⚠️ Truncated tape block at offset {offset}: {e}")
+            next_offset = None
+
+        if next_offset is None or next_offset > len(self._view):
+            self._end_reached = True
+        else:
+            self._offsets.append(next_offset)
+
+    def _parse_tap_block(self, index: int, offset: int):
+        """TAP: little-endian length followed by the raw block"""
+        view = self._view
+        if offset + 2 > len(view):
+            return None, None
+
+        length = view[offset] | (view[offset + 1] << 8)
+        start = offset + 2
+        pilot = PILOT_HEADER_COUNT
+        if length and view[start] & 0x80:
+            pilot = PILOT_DATA_COUNT
+
+        block = TapeBlock(index, 0x10, view[start:start + length], pilot_count=pilot)
+        return block, start + length
+
+    def _parse_tzx_block(self, index: int, offset: int):
+        """TZX: ID byte followed by a block-specific header"""
+        view = self._view
+        if offset >= len(view):
+            return None, None
+
+        block_id = view[offset]
+        body = offset + 1
+
+        if block_id == 0x10:  # Standard speed data
+            pause, length = struct.unpack_from('<HH', view, body)
+            start = body + 4
+            data = view[start:start + length]
+            pilot = PILOT_DATA_COUNT if length and data[0] & 0x80 else PILOT_HEADER_COUNT
+            return TapeBlock(index, block_id, data, pilot_count=pilot, pause_ms=pause), start + length
+
+        if block_id == 0x11:  # Turbo speed data
+            pilot, sync1, sync2, zero, one, count, bits, pause = struct.unpack_from('<HHHHHHBH', view, body)
+            length = self._read_u24(view, body + 15)
+            start = body + 18
+            return TapeBlock(index, block_id, view[start:start + length], pilot, sync1, sync2,
+                             zero, one, count, bits, pause), start + length
+
+        if block_id == 0x12:  # Pure tone
+            pulse, count = struct.unpack_from('<HH', view, body)
+            return self._tone_block(index, block_id, (pulse,) * count), body + 4
+
+        if block_id == 0x13:  # Pulse sequence
+            count = view[body]
+            pulses = struct.unpack_from(f'<{count}H', view, body + 1)
+            return self._tone_block(index, block_id, pulses), body + 1 + count * 2
+
+        if block_id == 0x14:  # Pure data
+            zero, one, bits, pause = struct.unpack_from('<HHBH', view, body)
+            length = self._read_u24(view, body + 7)
+            start = body + 10
+            return TapeBlock(index, block_id, view[start:start + length], 0, 0, 0,
+                             zero, one, 0, bits, pause), start + length
+
+        if block_id == 0x20:  # Pause / stop the tape
+            pause = struct.unpack_from('<H', view, body)[0]
+            block = self._tone_block(index, block_id, ())
+            block.pause_ms = pause
+            return block, body + 2
+
+        # Metadata blocks carry nothing the loader needs - skip over them
+        skip = self._tzx_skip_length(block_id, view, body)
+        if skip is None:
+            print(f"⚠️ Unsupported TZX block 0x{block_id:02X} - stopping tape scan")
+            return None, None
+
+        block = self._tone_block(index, block_id, ())
+        block.pause_ms = 0
+        return block, body + skip
+
+    def _tone_block(self, index: int, block_id: int, pulses: tuple) -> TapeBlock:
+        """Block without data bytes"""
+        return TapeBlock(index, block_id, memoryview(b""), 0, 0, 0, 0, 0, 0, 8, 0, tuple(pulses))
+
+    def _tzx_skip_length(self, block_id: int, view, body: int) -> Optional[int]:
+        """Length of a block body that playback ignores"""
+        if block_id in (0x22, 0x25, 0x27):
+            return 0
+        if block_id in (0x21, 0x30):
+            return 1 + view[body]
+        if block_id == 0x24:
+            return 2
+        if block_id == 0x31:
+            return 2 + view[body + 1]
+        if block_id == 0x32:
+            return 2 + struct.unpack_from('<H', view, body)[0]
+        if block_id == 0x33:
+            return 1 + view[body] * 3
+        if block_id == 0x35:
+            return 20 + struct.unpack_from('<I', view, body + 16)[0]
+        if block_id == 0x5A:
+            return 9
+        if block_id == 0x15:
+            return 8 + self._read_u24(view, body + 5)
+        if block_id in (0x18, 0x19, 0x2A, 0x2B):
+            return 4 + struct.unpack_from('<I', view, body)[0]
+        return None
+
+    @staticmethod
+    def _read_u24(view, offset: int) -> int:
+        return view[offset] | (view[offset + 1] << 8) | (view[offset + 2] << 16)
+
+class TapePlayer:
+    """Edge-accurate playback - each EAR edge is a scheduled simulation event"""
+
+    EVENT_TYPE = "tape_edge"
+
+    def __init__(self, image: TapeImage, clock_hz: int = SPECTRUM_CLOCK_HZ,
+                 signal_name: str = "tape_ear"):
+        self.image = image
+        self.clock_hz = clock_hz
+        self.signal_name = signal_name
+        self.engine = None
+        self.playing = False
+        self.ear_level = 0
+        self.block_index = 0
+        self.edge_count = 0
+        self._pulses: Optional[Iterator[int]] = None
+        self._pending_pause = 0
+
+    def play(self, engine):
+        """Start playback on a simulation engine"""
+        if self.engine is not engine:
+            if self.engine:
+                self.engine.remove_event_handler(self.EVENT_TYPE, self._on_edge)
+            self.engine = engine
+            engine.add_event_handler(self.EVENT_TYPE, self._on_edge)
+
+        if self.signal_name not in engine.signals:
+            engine.create_signal(self.signal_name)
+
+        self.playing = True
+        self._schedule_next()
+
+    def stop(self):
+        """Stop playback - position is kept"""
+        self.playing = False
+
+    def rewind(self):
+        """Go back to the first block"""
+        self.block_index = 0
+        self._pulses = None
+        self._pending_pause = 0
+
+    def _next_interval(self) -> Optional[int]:
+        """T-states until the next edge, or None at the end of the tape"""
+        while True:
+            if self._pulses is None:
+                block = self.image.block(self.block_index)
+                if block is None:
+                    return None
+                if block.block_id == 0x20 and block.pause_ms == 0:
+                    self.block_index += 1
+                    return None  # 'stop the tape' block
+                self._pulses = block.pulses()
+                self._pending_pause = block.pause_ms
+
+            pulse = next(self._pulses, None)
+            if pulse is not None:
+                return pulse
+
+            self._pulses = None
+            self.block_index += 1
+            if self._pending_pause:
+                pause = self._pending_pause * (self.clock_hz // 1000)
+                self._pending_pause = 0
+                return pause
+
+    def _schedule_next(self):
+        interval = self._next_interval()
+        if interval is None:
+            self.playing = False
+            self.engine.emit_event('tape_stopped', {'block': self.block_index})
+            return
+        self.engine.schedule_event(interval / self.clock_hz, self.EVENT_TYPE, self)
+
+    def _on_edge(self, data):
+        if data is not self or not self.playing:
+            return
+        self.ear_level ^= 1
+        self.edge_count += 1
+        self.engine.set_signal_value(self.signal_name, self.ear_level, source="tape")
+        self._schedule_next()
+
+class TapeLoaderTrap:
+    """Fast loading - intercepts the ROM LD-BYTES routine and copies blocks straight into RAM
+
+    Registers are read from a dict with 'PC', 'SP', 'IX', 'DE', 'A' and 'F' keys,
+    memory is any bytearray-like 64K address space.
+    """
+
+    def __init__(self, image: TapeImage, trap_address: int = LD_BYTES, rom_size: int = 0x4000):
+        self.image = image
+        self.trap_address = trap_address
+        self.rom_size = rom_size
+        self.block_index = 0
+        self.loads = 0
+
+    def install(self, engine):
+        """Register the trap with the simulation engine"""
+        engine.add_pc_trap(self.trap_address, self.handle)
+
+    def uninstall(self, engine):
+        engine.remove_pc_trap(self.trap_address, self.handle)
+
+    def rewind(self):
+        self.block_index = 0
+
+    def _next_data_block(self) -> Optional[TapeBlock]:
+        while True:
+            block = self.image.block(self.block_index)
+            if block is None:
+                return None
+            self.block_index += 1
+            if block.is_data:
+                return block
+
+    def handle(self, cpu) -> bool:
+        """Run LD-BYTES instantly - returns True when the trap consumed the call"""
+        registers = cpu.registers
+        memory = cpu.memory
+
+        block = self._next_data_block()
+        if block is None:
+            return False  # end of tape - let the ROM wait for a signal
+
+        data = block.data
+        wanted_flag = registers['A'] & 0xFF
+        loading = bool(registers['F'] & 0x01)  # carry set = LOAD, reset = VERIFY
+        address = registers['IX'] & 0xFFFF
+        length = registers['DE'] & 0xFFFF
+
+        success = False
+        if len(data) and data[0] == wanted_flag:
+            count = min(length, max(len(data) - 2, 0))
+            payload = data[1:1 + count]
+
+            if loading:
+                self._write(memory, address, payload)
+                ok = True
+            else:
+                ok = self._read(memory, address, count) == bytes(payload)
+
+            parity = 0
+            for byte in data:
+                parity ^= byte
+
+            success = ok and count == length and len(data) == length + 2 and parity == 0
+            registers['IX'] = (address + count) & 0xFFFF
+            registers['DE'] = length - count
+
+        if success:
+            registers['F'] |= 0x01
+        else:
+            registers['F'] &= ~0x01 & 0xFF
+
+        # Return from LD-BYTES
+        sp = registers['SP'] & 0xFFFF
+        registers['PC'] = memory[sp] | (memory[(sp + 1) & 0xFFFF] << 8)
+        registers['SP'] = (sp + 2) & 0xFFFF
+
+        self.loads += 1
+        return True
+
+    def _write(self, memory, address: int, payload: memoryview):
+        """Copy into RAM - ROM is read-only and the address space wraps at 64K"""
+        end = address + len(payload)
+        if address >= self.rom_size and end <= 0x10000:
+            memory[address:end] = payload
+            return
+        for i, byte in enumerate(payload):
+            target = (address + i) & 0xFFFF
+            if target >= self.rom_size:
+                memory[target] = byte
+
+    @staticmethod
+    def _read(memory, address: int, count: int) -> bytes:
+        if address + count <= 0x10000:
+            return bytes(memory[address:address + count])
+        return bytes(memory[(address + i) & 0xFFFF] for i in range(count))
+
+class TapeDeck:
+    """Tape drive for a system - 'fast' uses the ROM trap, 'pulse' plays real edges"""
+
+    MODES = ("fast", "pulse")
+
+    def __init__(self, clock_hz: int = SPECTRUM_CLOCK_HZ):
+        self.clock_hz = clock_hz
+        self.image: Optional[TapeImage] = None
+        self.mode = "fast"
+        self.engine = None
+        self.player: Optional[TapePlayer] = None
+        self.trap: Optional[TapeLoaderTrap] = None
+
+    def insert(self, filename: str) -> bool:
+        """Insert a TAP or TZX file"""
+        try:
+            self.eject()
+            self.image = TapeImage(filename)
+            self.player = TapePlayer(self.image, self.clock_hz)
+            self.trap = TapeLoaderTrap(self.image)
+            print(f"✓ Tape inserted: {os.path.basename(filename)} ({'TZX' if self.image.is_tzx else 'TAP'})")
+            return True
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not open tape {filename}: {e}")
+            self.image = None
+            return False
+
+    def eject(self):
+        """Remove the tape"""
+        self.detach()
+        if self.image:
+            self.image.close()
+        self.image = None
+        self.player = None
+        self.trap = None
+
+    def attach(self, engine, mode: str = "fast"):
+        """Connect the deck to a simulation engine in the given mode"""
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown tape mode: {mode}")
+        self.detach()
+        self.engine = engine
+        self.mode = mode
+        if not self.image:
+            return
+        if mode == "fast":
+            self.trap.install(engine)
+        else:
+            self.player.play(engine)
+
+    def detach(self):
+        """Disconnect from the engine"""
+        if not self.engine:
+            return
+        if self.trap:
+            self.trap.uninstall(self.engine)
+        if self.player:
+            self.player.stop()
+        self.engine = None
+
+    def rewind(self):
+        if self.player:
+            self.player.rewind()
+        if self.trap:
+            self.trap.rewind()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Current deck state"""
+        return {
+            'inserted': self.image is not None,
+            'filename': self.image.filename if self.image else "",
+            'mode': self.mode,
+            'playing': bool(self.player and self.player.playing),
+            'fast_loads': self.trap.loads if self.trap else 0,
+            'edges': self.player.edge_count if self.player else 0
+        }
+
+__all__ = ['TapeBlock', 'TapeImage', 'TapePlayer', 'TapeLoaderTrap', 'TapeDeck', 'LD_BYTES']
@@ -0,0 +1,129 @@
+"""
+X-Seti - October18 2026 - Truth Table Runner
+Exhaustive or sampled test vectors for glue-logic subcircuits using NumPy
+"""
+#this goes in core/
+
+import csv
+from typing import Dict, List, Any, Optional, Union, Callable
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    print("⚠️ NumPy not available - truth table runner disabled, use GateNetlist.truth_table()")
+    NUMPY_AVAILABLE = False
+
+from core.gate_sim import GateNetlist, netlist_from_components
+
+class TruthTable:
+    """Input and output columns of a test run - one boolean array per net"""
+
+    def __init__(self, inputs: List[str], outputs: List[str], input_bits: Dict[str, Any],
+                 output_bits: Dict[str, Any], exhaustive: bool):
+        self.inputs = inputs
+        self.outputs = outputs
+        self.input_bits = input_bits
+        self.output_bits = output_bits
+        self.exhaustive = exhaustive
+
+    def __len__(self) -> int:
+        return len(next(iter(self.input_bits.values()))) if self.input_bits else 0
+
+    def row(self, index: int) -> Dict[str, int]:
+        """One vector as {net: 0/1} over inputs and outputs"""
+        values = {net: int(bits[index]) for net, bits in self.input_bits.items()}
+        values.update({net: int(bits[index]) for net, bits in self.output_bits.items()})
+        return values
+
+    def diff(self, reference: Union['TruthTable', GateNetlist, Callable],
+             max_rows: int = 100) -> List[Dict[str, Any]]:
+        """Vectors where the outputs disagree with a reference
+
+        The reference may be another TruthTable over the same vectors, a
+        GateNetlist, or a function taking {input: bool array} and returning
+        {output: bool array}.
+        """
+        if isinstance(reference, TruthTable):
+            expected = reference.output_bits
+        elif isinstance(reference, GateNetlist):
+            expected = reference.evaluate_arrays(self.input_bits, self.outputs)
+        else:
+            expected = reference(self.input_bits)
+
+        mismatch = np.zeros(len(self), dtype=bool)
+        for net in self.outputs:
+            if net in expected:
+                mismatch |= np.asarray(expected[net], dtype=bool) != self.output_bits[net]
+
+        rows = []
+        for index in np.flatnonzero(mismatch)[:max_rows]:
+            rows.append({
+                'inputs': {net: int(bits[index]) for net, bits in self.input_bits.items()},
+                'expected': {net: int(expected[net][index]) for net in self.outputs if net in expected},
+                'actual': {net: int(self.output_bits[net][index]) for net in self.outputs}
+            })
+        return rows
+
+    def export_csv(self, file_path: str) -> bool:
+        """Write one row per vector - inputs then outputs"""
+        try:
+            with open(file_path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(self.inputs + self.outputs)
+                columns = [self.input_bits[net] for net in self.inputs] + \
+                          [self.output_bits[net] for net in self.outputs]
+                writer.writerows(np.column_stack(columns).astype(np.uint8).tolist())
+            print(f"✓ Truth table exported to {file_path}")
+            return True
+        except OSError as e:
+            print(f"❌ Error exporting truth table: {e}")
+            return False
+
+class TruthTableRunner:
+    """Runs every input combination of a netlist, or a random sample when there are too many
+
+    All vectors are evaluated in one levelized pass with NumPy boolean arrays,
+    so a 16-input decoder takes one pass over 65536-element arrays.
+    """
+
+    def __init__(self, netlist: GateNetlist, inputs: Optional[List[str]] = None,
+                 outputs: Optional[List[str]] = None):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("NumPy is required for TruthTableRunner")
+        netlist.levelize()
+        self.netlist = netlist
+        self.inputs = list(inputs or netlist.inputs)
+        self.outputs = list(outputs or netlist.output_nets())
+
+    @classmethod
+    def from_components(cls, component_manager, component_ids: List[str],
+                        inputs: Optional[List[str]] = None, outputs: Optional[List[str]] = None):
+        """Runner over a selected subcircuit of placed 74-series components"""
+        return cls(netlist_from_components(component_manager, component_ids), inputs, outputs)
+
+    def run(self, max_exhaustive_inputs: int = 20, sample_size: int = 1 << 16,
+            seed: Optional[int] = None) -> TruthTable:
+        """Exhaustive up to max_exhaustive_inputs inputs, random sample_size vectors beyond"""
+        count = len(self.inputs)
+        exhaustive = count <= max_exhaustive_inputs
+        if exhaustive:
+            vectors = np.arange(1 << count, dtype=np.uint64)
+            input_bits = {net: ((vectors >> np.uint64(i)) & np.uint64(1)).astype(bool)
+                          for i, net in enumerate(self.inputs)}
+        else:
+            rng = np.random.default_rng(seed)
+            samples = rng.integers(0, 2, size=(count, sample_size), dtype=np.uint8).astype(bool)
+            input_bits = {net: samples[i] for i, net in enumerate(self.inputs)}
+
+        results = self.netlist.evaluate_arrays(input_bits, self.outputs)
+        missing = [net for net in self.outputs if net not in results]
+        if missing:
+            raise ValueError(f"Unknown output nets: {', '.join(missing)}")
+        output_bits = {net: np.asarray(results[net], dtype=bool) for net in self.outputs}
+
+        mode = "exhaustive" if exhaustive else f"{sample_size} random"
+        print(f"✓ Truth table: {count} inputs, {len(self.outputs)} outputs ({mode} vectors)")
+        return TruthTable(self.inputs, self.outputs, input_bits, output_bits, exhaustive)
+
+__all__ = ['TruthTable', 'TruthTableRunner', 'NUMPY_AVAILABLE']
@@ -6,6 +6,7 @@ X-Seti - June23 2025 - canvas functionality
 
 import os
 import sys
+from contextlib import contextmanager
 from PyQt6.QtWidgets import (QGraphicsView, QGraphicsScene, QWidget, QVBoxLayout,
                            QHBoxLayout, QPushButton, QLabel, QComboBox, QSpinBox,
                            QCheckBox, QSlider, QButtonGroup, QFrame, QColorDialog,
@@ -34,13 +35,14 @@ except ImportError as e:
 class ComponentItem(QGraphicsItem):
     """Enhanced visual component item for the canvas"""
     
-    def __init__(self, name, category, package_type="DIP-40", parent=None):
+    def __init__(self, name, category, package_type="DIP-40", parent=None, quiet=False):
         super().__init__(parent)
         
         self.name = name
         self.category = category
         self.package_type = package_type
         self.selected = False
+        self.component = None  # model BaseComponent, see PCBCanvas.add_component()
         
         # Make item selectable and movable
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable)
@@ -57,7 +59,8 @@ class ComponentItem(QGraphicsItem):
         self.show_pins = True
         self.show_labels = True
         
-        print(f"🔧 Component created: {name} ({package_type})")
+        if not quiet:
+            print(f"🔧 Component created: {name} ({package_type})")
     
     def _get_package_dimensions(self, package_type):
         """Get component dimensions based on package type"""
@@ -449,11 +452,15 @@ if PYQT6_AVAILABLE:
             self.zoom_factor = 1.0
             self.components = {}
             self.connections = []
+            self.component_manager = None  # model side, see set_component_manager()
             
             # Enhanced undo/redo functionality
             self.undo_stack = []
             self.redo_stack = []
             self.max_undo_levels = 50
+            self._transaction_depth = 0  # >0 inside transaction() - no per-edit snapshots
+            self._pending_models = []  # placed inside a transaction, registered on exit
+            self._model_positions = {}  # model id -> (x, y, rotation) last sent to the manager
             
             # Visual settings
             self.show_pin_numbers = True
@@ -678,19 +685,159 @@ if PYQT6_AVAILABLE:
             snapped_y = round(pos.y() / spacing) * spacing
             return QPointF(snapped_x, snapped_y)
         
+        def set_component_manager(self, manager):
+            """ComponentManager that receives the canvas placements, moves and property edits"""
+            self.component_manager = manager
+            self._model_positions.clear()
+        
+        def _registered_model(self, item):
+            """Model behind a canvas item if the component manager knows it, else None"""
+            model = getattr(item, 'component', None)
+            if model is None or self.component_manager is None:
+                return None
+            if self.component_manager.get_component(model.id) is not model:
+                return None
+            return model
+        
+        def _attach_model(self, item, model):
+            """Link a model to a canvas item and queue it for registration"""
+            item.component = model
+            if hasattr(model, 'setPos'):
+                model.setPos(item.pos())
+            if self.component_manager is None:
+                return
+            if self.component_manager.get_component(model.id) is not None:
+                return
+            self._model_positions[model.id] = (item.pos().x(), item.pos().y(), item.rotation())
+            if self._transaction_depth:
+                self._pending_models.append(model)
+            else:
+                self.component_manager.add_component(model)
+        
+        def _release_model(self, item):
+            """Drop the model behind a removed canvas item from the manager"""
+            model = self._registered_model(item)
+            if model is not None:
+                self._model_positions.pop(model.id, None)
+                self.component_manager.remove_component(model.id)
+        
+        def sync_component_models(self, items=None):
+            """Send canvas moves and rotations to the component manager
+            
+            Only items whose position or rotation changed since the last sync are
+            sent, so a drag is journalled once on release, not per mouse move.
+            """
+            if items is None:
+                items = self.components.values()
+            moved = 0
+            for item in items:
+                model = self._registered_model(item)
+                if model is None:
+                    continue
+                placement = (item.pos().x(), item.pos().y(), item.rotation())
+                if self._model_positions.get(model.id) == placement:
+                    continue
+                self._model_positions[model.id] = placement
+                self.component_manager.move_component(model.id, *placement)
+                moved += 1
+            return moved
+        
+        def component_property_changed(self, item, property_name, value):
+            """Route a property panel edit of a canvas item through the component manager"""
+            if not isinstance(item, ComponentItem):
+                return False
+            if property_name in ('x', 'y', 'rotation'):
+                return self.sync_component_models([item]) > 0
+            model = self._registered_model(item)
+            if model is None:
+                return False
+            return self.component_manager.set_component_property(model.id, property_name, value)
+        
+        @contextmanager
+        def transaction(self, record_undo=True):
+            """Group edits into one undo entry
+            
+            Inside the block, add/remove calls take no undo snapshots and the
+            scene index and viewport repaints are suspended. They are rebuilt once
+            on exit. If the block raises, the canvas is rolled back. Transactions nest.
+            """
+            outermost = self._transaction_depth == 0
+            if outermost:
+                if record_undo:
+                    self.save_state_for_undo()
+                index_method = self.scene.itemIndexMethod()
+                self.scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+                self.setUpdatesEnabled(False)
+            self._transaction_depth += 1
+            failed = False
+            try:
+                yield self
+            except Exception:
+                failed = True
+                raise
+            finally:
+                self._transaction_depth -= 1
+                if outermost:
+                    self.scene.setItemIndexMethod(index_method)
+                    self.setUpdatesEnabled(True)
+                    pending, self._pending_models = self._pending_models, []
+                    if failed and record_undo and self.undo_stack:
+                        print("↶ Transaction failed - rolling back")
+                        self.load_canvas_state(self.undo_stack.pop())
+                    elif pending and self.component_manager is not None:
+                        self.component_manager.add_components(pending)
+        
+        def add_components(self, placements):
+            """Place many components as one undoable edit
+            
+            placements: dicts with category, name, position (QPointF or (x, y)) and
+            optional package_type, rotation and component (a BaseComponent; one is
+            created when missing). The models are registered with the component
+            manager in one batch. Returns the canvas items.
+            """
+            items = []
+            with self.transaction():
+                for placement in placements:
+                    position = placement['position']
+                    if not isinstance(position, QPointF):
+                        position = QPointF(*position)
+                    item = self.add_component(placement['category'], placement['name'], position,
+                                              placement.get('package_type', 'DIP-40'),
+                                              placement.get('component'), placement.get('rotation', 0))
+                    if item is not None:
+                        items.append(item)
+            print(f"✅ Placed {len(items)} components")
+            return items
+        
         # Enhanced component management
-        def add_component(self, category, component_name, position, package_type="DIP-40"):
-            """Add a component to the canvas with undo support"""
+        def add_component(self, category, component_name, position, package_type="DIP-40",
+                          component=None, rotation=0):
+            """Add a component to the canvas with undo support
+            
+            With a component manager set, the item is backed by a model component
+            (the one passed in, or a new one) registered with the manager.
+            """
             try:
                 # Save state for undo
-                self.save_state_for_undo()
+                if not self._transaction_depth:
+                    self.save_state_for_undo()
                 
                 # Snap position to grid if enabled
                 snapped_position = self._snap_to_grid(position)
                 
                 # Create component item
-                component_item = ComponentItem(component_name, category, package_type)
+                component_item = ComponentItem(component_name, category, package_type,
+                                               quiet=bool(self._transaction_depth))
                 component_item.setPos(snapped_position)
+                if rotation:
+                    component_item.setRotation(rotation)
+                
+                # Model side
+                if component is None and self.component_manager is not None:
+                    from core.components import ComponentFactory
+                    component = ComponentFactory.create_component(category, component_name)
+                if component is not None:
+                    self._attach_model(component_item, component)
                 
                 # Apply visual settings
                 component_item.show_pins = self.show_pin_numbers
@@ -706,7 +853,8 @@ if PYQT6_AVAILABLE:
                 # Emit signal
                 self.component_added.emit(category, component_name, snapped_position)
                 
-                print(f"✅ Component added: {component_name} at {snapped_position}")
+                if not self._transaction_depth:
+                    print(f"✅ Component added: {component_name} at {snapped_position}")
                 return component_item
                 
             except Exception as e:
@@ -717,10 +865,12 @@ if PYQT6_AVAILABLE:
             """Remove a component from the canvas with undo support"""
             try:
                 # Save state for undo
-                self.save_state_for_undo()
+                if not self._transaction_depth:
+                    self.save_state_for_undo()
                 
                 # Remove from scene
                 self.scene.removeItem(component_item)
+                self._release_model(component_item)
                 
                 # Remove from tracking
                 for comp_id, comp in list(self.components.items()):
@@ -737,6 +887,8 @@ if PYQT6_AVAILABLE:
         def clear_canvas(self):
             """Clear all components from canvas"""
             self.save_state_for_undo()
+            for item in list(self.components.values()):
+                self._release_model(item)
             self.scene.clear()
             self.components.clear()
             self.connections.clear()
@@ -748,9 +900,9 @@ if PYQT6_AVAILABLE:
             selected_items = [item for item in self.scene.selectedItems() if isinstance(item, ComponentItem)]
             
             if selected_items:
-                self.save_state_for_undo()
-                for item in selected_items:
-                    self.remove_component(item)
+                with self.transaction():
+                    for item in selected_items:
+                        self.remove_component(item)
                 print(f"🗑️ Deleted {len(selected_items)} components")
             else:
                 print("🗑️ No components selected to delete")
@@ -768,6 +920,11 @@ if PYQT6_AVAILABLE:
             """Get list of selected components"""
             return [item for item in self.scene.selectedItems() if isinstance(item, ComponentItem)]
         
+        def get_selected_component_ids(self):
+            """Get ids of selected components - e.g. to pick a subcircuit for test vectors"""
+            selected = set(self.get_selected_components())
+            return [comp_id for comp_id, comp in self.components.items() if comp in selected]
+        
         # Enhanced undo/redo functionality
         def save_state_for_undo(self):
             """Save current state for undo functionality"""
@@ -835,7 +992,8 @@ if PYQT6_AVAILABLE:
                     'category': component.category,
                     'package_type': component.package_type,
                     'position': {'x': component.pos().x(), 'y': component.pos().y()},
-                    'rotation': component.rotation()
+                    'rotation': component.rotation(),
+                    'component': component.component  # in-memory undo state only
                 }
                 canvas_data['components'].append(comp_data)
             
@@ -845,22 +1003,30 @@ if PYQT6_AVAILABLE:
             """Load canvas state from data"""
             try:
                 # Clear existing canvas
+                previous = list(self.components.values())
                 self.scene.clear()
                 self.components.clear()
                 
-                # Load components
+                # Load components - restoring a state is not itself an undoable edit
                 if 'components' in canvas_data:
-                    for comp_data in canvas_data['components']:
-                        position = QPointF(comp_data['position']['x'], comp_data['position']['y'])
-                        component = self.add_component(
-                            comp_data['category'],
-                            comp_data['name'],
-                            position,
-                            comp_data.get('package_type', 'DIP-40')
-                        )
-                        
-                        if component and 'rotation' in comp_data:
-                            component.setRotation(comp_data['rotation'])
+                    with self.transaction(record_undo=False):
+                        for comp_data in canvas_data['components']:
+                            position = QPointF(comp_data['position']['x'], comp_data['position']['y'])
+                            self.add_component(
+                                comp_data['category'],
+                                comp_data['name'],
+                                position,
+                                comp_data.get('package_type', 'DIP-40'),
+                                comp_data.get('component'),
+                                comp_data.get('rotation', 0)
+                            )
+                
+                # Bring the model side in line with the restored canvas
+                restored = {id(item.component) for item in self.components.values()}
+                for item in previous:
+                    if id(item.component) not in restored:
+                        self._release_model(item)
+                self.sync_component_models()
                 
                 # Load connections
                 if 'connections' in canvas_data:
@@ -984,6 +1150,8 @@ if PYQT6_AVAILABLE:
         def mouseReleaseEvent(self, event):
             """Handle mouse release events"""
             super().mouseReleaseEvent(event)
+            # A finished drag reaches the component manager once
+            self.sync_component_models(self.get_selected_components())
             # Final scene update after movement
             self.scene.update()
         
@@ -1062,6 +1230,7 @@ if PYQT6_AVAILABLE:
             self.save_state_for_undo()
             current_rotation = component.rotation()
             component.setRotation(current_rotation + 90)
+            self.sync_component_models([component])
             print(f"🔄 Rotated {component.name}")
         
         def show_add_component_dialog(self, position):
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+X-Seti - October18 2026 - Logic Analyzer Panel
+Waveform view over simulation signal traces - zoom, pan, bus grouping and cursors
+"""
+#this belongs in ui/logic_analyzer.py
+
+from typing import Dict, List, Any, Optional, Tuple
+
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+                           QComboBox, QSizePolicy)
+from PyQt6.QtCore import Qt, QTimer, QRectF, QPointF, pyqtSignal
+from PyQt6.QtGui import QPainter, QPen, QColor, QFont
+
+from core.signal_trace import SignalPyramid, BusGroup, cursor_measurements
+from core.bus_nets import find_pin_groups
+
+def format_time(seconds: float) -> str:
+    """Human readable time for axis and measurements"""
+    magnitude = abs(seconds)
+    if magnitude >= 1.0:
+        return f"{seconds:.3f} s"
+    if magnitude >= 1e-3:
+        return f"{seconds * 1e3:.3f} ms"
+    if magnitude >= 1e-6:
+        return f"{seconds * 1e6:.3f} µs"
+    return f"{seconds * 1e9:.1f} ns"
+
+def find_bus_groups(signal_names: List[str]) -> Dict[str, List[str]]:
+    """Group names like A0..A15 or CPU_D0..CPU_D7 by prefix - members ordered LSB first"""
+    return {prefix: [members[bit] for bit in sorted(members)]
+            for prefix, members in find_pin_groups(signal_names).items()}
+
+class WaveformView(QWidget):
+    """Painted waveform rows - every repaint asks each trace for one summary per pixel column"""
+
+    cursorsChanged = pyqtSignal()
+    viewChanged = pyqtSignal(float, float)  # t0, t1
+
+    LABEL_WIDTH = 120
+    ROW_HEIGHT = 26
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.traces: List[Tuple[str, Any]] = []  # (label, SignalPyramid or BusGroup)
+        self.t0 = 0.0
+        self.t1 = 1e-3
+        self.cursor_a: Optional[float] = None
+        self.cursor_b: Optional[float] = None
+        self._drag_x: Optional[float] = None
+
+        self.background = QColor(20, 22, 26)
+        self.wave_color = QColor(80, 220, 120)
+        self.bus_color = QColor(90, 170, 255)
+        self.edge_color = QColor(255, 200, 60)
+
+        self.setMinimumHeight(80)
+        self.setMouseTracking(True)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+
+    # === Trace management ===
+
+    def set_traces(self, traces: List[Tuple[str, Any]]):
+        self.traces = traces
+        self.setMinimumHeight(max(80, len(traces) * self.ROW_HEIGHT + 20))
+        self.update()
+
+    def data_range(self) -> Tuple[float, float]:
+        """Earliest and latest sample time over all traces"""
+        starts, ends = [], []
+        for _, trace in self.traces:
+            pyramids = trace.bits if isinstance(trace, BusGroup) else [trace]
+            for pyramid in pyramids:
+                span = pyramid.time_range()
+                if span:
+                    starts.append(span[0])
+                    ends.append(span[1])
+        if not starts:
+            return 0.0, 1e-3
+        return min(starts), max(ends)
+
+    # === View control ===
+
+    def set_view(self, t0: float, t1: float):
+        if t1 <= t0:
+            return
+        self.t0, self.t1 = t0, t1
+        self.viewChanged.emit(t0, t1)
+        self.update()
+
+    def zoom(self, factor: float, anchor: Optional[float] = None):
+        """Zoom by factor (<1 zooms in) keeping anchor time under the mouse"""
+        if anchor is None:
+            anchor = (self.t0 + self.t1) / 2
+        span = (self.t1 - self.t0) * factor
+        ratio = (anchor - self.t0) / (self.t1 - self.t0)
+        start = anchor - span * ratio
+        self.set_view(start, start + span)
+
+    def zoom_fit(self):
+        start, end = self.data_range()
+        if end <= start:
+            end = start + 1e-6
+        self.set_view(start, end)
+
+    def _wave_width(self) -> int:
+        return max(1, self.width() - self.LABEL_WIDTH)
+
+    def x_to_time(self, x: float) -> float:
+        return self.t0 + (x - self.LABEL_WIDTH) / self._wave_width() * (self.t1 - self.t0)
+
+    def time_to_x(self, t: float) -> float:
+        return self.LABEL_WIDTH + (t - self.t0) / (self.t1 - self.t0) * self._wave_width()
+
+    # === Painting ===
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.background)
+        painter.setFont(QFont("monospace", 8))
+
+        width = self._wave_width()
+        for row, (label, trace) in enumerate(self.traces):
+            top = 10 + row * self.ROW_HEIGHT
+            painter.setPen(QColor(200, 200, 200))
+            painter.drawText(QRectF(4, top, self.LABEL_WIDTH - 8, self.ROW_HEIGHT - 6),
+                             Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, label)
+
+            columns = trace.columns(self.t0, self.t1, width)
+            if isinstance(trace, BusGroup) or trace.bit_width > 1:
+                self._paint_bus(painter, columns, top)
+            else:
+                self._paint_bit(painter, columns, top)
+
+        self._paint_cursors(painter)
+        painter.end()
+
+    def _paint_bit(self, painter: QPainter, columns, top: float):
+        high = top + 4
+        low = top + self.ROW_HEIGHT - 8
+        wave_pen = QPen(self.wave_color, 1)
+        edge_pen = QPen(self.edge_color, 1)
+        previous_y = None
+
+        for c, (lo, hi, transitions, start) in enumerate(columns):
+            if lo is None:
+                previous_y = None
+                continue
+            x = self.LABEL_WIDTH + c
+            if transitions and lo != hi:
+                # One or more edges inside this column - a full-height stroke keeps glitches visible
+                painter.setPen(edge_pen if transitions > 2 else wave_pen)
+                painter.drawLine(QPointF(x, high), QPointF(x, low))
+                previous_y = None  # the stroke already spans both levels
+                continue
+            y = high if start else low
+            painter.setPen(wave_pen)
+            if previous_y is not None and previous_y != y:
+                painter.drawLine(QPointF(x, previous_y), QPointF(x, y))
+            painter.drawLine(QPointF(x, y), QPointF(x + 1, y))
+            previous_y = y
+
+    def _paint_bus(self, painter: QPainter, columns, top: float):
+        high = top + 4
+        low = top + self.ROW_HEIGHT - 8
+        pen = QPen(self.bus_color, 1)
+        painter.setPen(pen)
+
+        segment_start = None
+        segment_value = None
+        for c, (lo, hi, transitions, start) in enumerate(columns + [(None, None, 0, None)]):
+            x = self.LABEL_WIDTH + c
+            changing = transitions > 0
+            value = None if changing else start
+            if value != segment_value or changing:
+                if segment_start is not None and segment_value is not None:
+                    self._paint_bus_segment(painter, segment_start, x, high, low, segment_value)
+                if changing:
+                    painter.drawLine(QPointF(x, high), QPointF(x, low))
+                segment_start = x
+                segment_value = value
+
+    def _paint_bus_segment(self, painter, x0, x1, high, low, value):
+        painter.drawLine(QPointF(x0, high), QPointF(x1, high))
+        painter.drawLine(QPointF(x0, low), QPointF(x1, low))
+        text = f"{value:X}"
+        if x1 - x0 > len(text) * 7 + 4:
+            painter.drawText(QRectF(x0 + 2, high, x1 - x0 - 4, low - high),
+                             Qt.AlignmentFlag.AlignCenter, text)
+
+    def _paint_cursors(self, painter: QPainter):
+        for cursor, color in ((self.cursor_a, QColor(255, 80, 80)), (self.cursor_b, QColor(80, 160, 255))):
+            if cursor is None or not (self.t0 <= cursor <= self.t1):
+                continue
+            x = self.time_to_x(cursor)
+            painter.setPen(QPen(color, 1, Qt.PenStyle.DashLine))
+            painter.drawLine(QPointF(x, 0), QPointF(x, self.height()))
+
+    # === Mouse ===
+
+    def wheelEvent(self, event):
+        anchor = self.x_to_time(event.position().x())
+        self.zoom(0.8 if event.angleDelta().y() > 0 else 1.25, anchor)
+
+    def mousePressEvent(self, event):
+        x = event.position().x()
+        if x < self.LABEL_WIDTH:
+            return
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.cursor_a = self.x_to_time(x)
+            self.cursorsChanged.emit()
+        elif event.button() == Qt.MouseButton.RightButton:
+            self.cursor_b = self.x_to_time(x)
+            self.cursorsChanged.emit()
+        elif event.button() == Qt.MouseButton.MiddleButton:
+            self._drag_x = x
+        self.update()
+
+    def mouseMoveEvent(self, event):
+        if self._drag_x is None:
+            return
+        x = event.position().x()
+        shift = (self._drag_x - x) / self._wave_width() * (self.t1 - self.t0)
+        self._drag_x = x
+        self.set_view(self.t0 + shift, self.t1 + shift)
+
+    def mouseReleaseEvent(self, event):
+        self._drag_x = None
+
+class LogicAnalyzerPanel(QWidget):
+    """Logic analyzer dock contents - connects to SimulationEngine signal traces"""
+
+    MAX_REFRESH_HZ = 20
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.simulation_engine = None
+        self.rows: List[Tuple[str, Any]] = []
+        self.follow = True  # keep the newest samples in view while running
+
+        self._create_ui()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(int(1000 / self.MAX_REFRESH_HZ))
+        self.refresh_timer.timeout.connect(self._refresh)
+
+        print("✓ Logic Analyzer panel created")
+
+    def _create_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+
+        toolbar = QHBoxLayout()
+        self.signal_combo = QComboBox()
+        self.signal_combo.setMinimumWidth(140)
+        toolbar.addWidget(self.signal_combo)
+
+        add_btn = QPushButton("Add")
+        add_btn.clicked.connect(lambda: self.add_signal(self.signal_combo.currentText()))
+        toolbar.addWidget(add_btn)
+
+        bus_btn = QPushButton("Group Buses")
+        bus_btn.setToolTip("Show numbered signals (A0-A15, D0-D7...) as hex buses")
+        bus_btn.clicked.connect(self.group_buses)
+        toolbar.addWidget(bus_btn)
+
+        toolbar.addStretch()
+
+        for text, handler in (("＋", lambda: self.view.zoom(0.5)),
+                              ("－", lambda: self.view.zoom(2.0)),
+                              ("Fit", self._zoom_fit)):
+            button = QPushButton(text)
+            button.setMaximumWidth(40)
+            button.clicked.connect(handler)
+            toolbar.addWidget(button)
+
+        layout.addLayout(toolbar)
+
+        self.view = WaveformView()
+        self.view.cursorsChanged.connect(self._update_measurements)
+        self.view.viewChanged.connect(self._on_view_changed)
+        layout.addWidget(self.view)
+
+        self.measure_label = QLabel("Left click: cursor A   Right click: cursor B   Wheel: zoom   Middle drag: pan")
+        self.measure_label.setStyleSheet("font-family: monospace; color: #888;")
+        layout.addWidget(self.measure_label)
+
+    # === Engine connection ===
+
+    def set_simulation_engine(self, engine):
+        self.simulation_engine = engine
+        self.refresh_signal_list()
+        if hasattr(engine, 'stateChanged'):
+            engine.stateChanged.connect(self._on_state_changed)
+
+    def refresh_signal_list(self):
+        self.signal_combo.clear()
+        if self.simulation_engine:
+            self.signal_combo.addItems(sorted(self.simulation_engine.signals.keys()))
+
+    def add_signal(self, signal_name: str):
+        """Show a signal - starts tracing it in the engine"""
+        if not signal_name or not self.simulation_engine:
+            return
+        if any(label == signal_name for label, _ in self.rows):
+            return
+        trace = self.simulation_engine.trace_signal(signal_name)
+        self.rows.append((signal_name, trace))
+        self.view.set_traces(self.rows)
+
+    def add_bus(self, name: str, signal_names: List[str]):
+        """Show 1-bit signals (LSB first) as one hex bus row"""
+        bits = [self.simulation_engine.trace_signal(signal_name, 1) for signal_name in signal_names]
+        self.rows = [(label, trace) for label, trace in self.rows if label not in signal_names]
+        self.rows.append((f"{name}[{len(bits) - 1}:0]", BusGroup(name, bits)))
+        self.view.set_traces(self.rows)
+
+    def group_buses(self):
+        """Collapse numbered single-bit rows into buses"""
+        single = [label for label, trace in self.rows
+                  if isinstance(trace, SignalPyramid) and trace.bit_width == 1]
+        for prefix, members in find_bus_groups(single).items():
+            self.add_bus(prefix.rstrip('_.') or "BUS", members)
+
+    def remove_all(self):
+        self.rows = []
+        self.view.set_traces(self.rows)
+
+    # === Refresh ===
+
+    def _on_state_changed(self, state: str):
+        if state == "running":
+            self.refresh_timer.start()
+        else:
+            self.refresh_timer.stop()
+            self._refresh()
+
+    def _refresh(self):
+        """Capped-rate repaint - follows the newest data unless the user zoomed away"""
+        if self.follow and self.rows:
+            start, end = self.view.data_range()
+            span = self.view.t1 - self.view.t0
+            if end > self.view.t1:
+                self.view.t0, self.view.t1 = end - span, end
+        self.view.update()
+
+    def _zoom_fit(self):
+        self.follow = True
+        self.view.zoom_fit()
+
+    def _on_view_changed(self, t0: float, t1: float):
+        _, end = self.view.data_range()
+        self.follow = t1 >= end
+
+    def _update_measurements(self):
+        view = self.view
+        if view.cursor_a is None:
+            return
+        if view.cursor_b is None:
+            self.measure_label.setText(f"A: {format_time(view.cursor_a)}")
+            return
+
+        parts = [f"A: {format_time(view.cursor_a)}  B: {format_time(view.cursor_b)}"]
+        first = True
+        for label, trace in self.rows:
+            result = cursor_measurements(trace, view.cursor_a, view.cursor_b)
+            if first:
+                parts.append(f"Δt: {format_time(result['delta_time'])}  1/Δt: {result['frequency']:.1f} Hz")
+                first = False
+            value_a = "-" if result['value_a'] is None else f"{result['value_a']:X}"
+            value_b = "-" if result['value_b'] is None else f"{result['value_b']:X}"
+            parts.append(f"{label}: {value_a}→{value_b} ({result['transitions']} edges)")
+        self.measure_label.setText("   ".join(parts))
+        self.measure_label.setStyleSheet("font-family: monospace;")
+
+# Export
+__all__ = ['LogicAnalyzerPanel', 'WaveformView', 'find_bus_groups', 'format_time']
@@ -56,6 +56,9 @@ class MainWindow(QMainWindow):
     # Manager setters - called by main_app.py
     def set_component_manager(self, manager):
         self.component_manager = manager
+        if self.canvas and hasattr(self.canvas, 'set_component_manager'):
+            # Placements, moves and property edits reach the manager
+            self.canvas.set_component_manager(manager)
         print("✓ Component manager connected")
 
     def set_project_manager(self, manager):
@@ -64,8 +67,24 @@ class MainWindow(QMainWindow):
 
     def set_simulation_engine(self, engine):
         self.simulation_engine = engine
+        if self.status_manager and hasattr(engine, 'statisticsUpdated'):
+            engine.statisticsUpdated.connect(self.status_manager.update_simulation_statistics)
+        if hasattr(engine, 'frameReady'):
+            # Repaint only presented frames - warp mode and a lagging real-time run skip the rest
+            engine.frameReady.connect(self._on_frame_ready)
+        if getattr(self, 'logic_analyzer', None):
+            self.logic_analyzer.set_simulation_engine(engine)
+        if getattr(self, 'memory_viewer', None):
+            self.memory_viewer.set_simulation_engine(engine)
+        if self.menu_manager and hasattr(self.menu_manager, 'set_simulation_engine'):
+            # Run/warp/profile menu actions drive the engine directly
+            self.menu_manager.set_simulation_engine(engine)
         print("✓ Simulation engine connected")
 
+    def _on_frame_ready(self, frame_number):
+        if self.canvas:
+            self.canvas.viewport().update()
+
     def refresh_component_palette(self):
         """Refresh component palette"""
         if self.component_palette and hasattr(self.component_palette, 'refresh'):
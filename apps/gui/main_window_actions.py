@@ -10,11 +10,14 @@ from PyQt6.QtWidgets import *
 from PyQt6.QtCore import *
 from PyQt6.QtGui import *
 
+AUTOSAVE_INTERVAL_MS = 5000  # change journal flush while a saved project is open
+
 # File Actions
 def new_project(main_window):
     """Create new project"""
     main_window.current_project_path = None
     main_window.is_modified = False
+    stop_change_journal(main_window)
     if main_window.canvas and hasattr(main_window.canvas, 'clear'):
         main_window.canvas.clear()
     update_window_title(main_window)
@@ -26,6 +29,8 @@ def open_project(main_window):
     if filename:
         main_window.current_project_path = filename
         main_window.is_modified = False
+        # Nothing is loaded from the file here, so edits are journalled from the next save
+        stop_change_journal(main_window)
         update_window_title(main_window)
         print(f"📂 Project opened: {filename}")
 
@@ -37,10 +42,39 @@ def save_project(main_window):
             main_window.current_project_path = filename
     
     if main_window.current_project_path:
+        manager = main_window.component_manager
+        if manager is not None and hasattr(manager, 'save_to_file'):
+            if not manager.save_to_file(main_window.current_project_path):
+                return
+            start_change_journal(main_window)
         main_window.is_modified = False
         update_window_title(main_window)
         print(f"💾 Project saved: {main_window.current_project_path}")
 
+def start_change_journal(main_window):
+    """Journal edits to the saved project and flush them every few seconds"""
+    manager = main_window.component_manager
+    if manager is None or not hasattr(manager, 'enable_journal'):
+        return
+    journal = manager.journal
+    if journal is None or journal.project_file != main_window.current_project_path:
+        manager.enable_journal(main_window.current_project_path)
+    timer = getattr(main_window, 'autosave_timer', None)
+    if timer is None:
+        timer = main_window.autosave_timer = QTimer(main_window)
+        timer.timeout.connect(lambda: main_window.component_manager and
+                              main_window.component_manager.autosave())
+    timer.start(AUTOSAVE_INTERVAL_MS)
+
+def stop_change_journal(main_window):
+    """Flush and close the journal of the project being left"""
+    timer = getattr(main_window, 'autosave_timer', None)
+    if timer is not None:
+        timer.stop()
+    manager = main_window.component_manager
+    if manager is not None and hasattr(manager, 'disable_journal'):
+        manager.disable_journal()
+
 # Edit Actions
 def undo_action(main_window):
     """Undo action"""
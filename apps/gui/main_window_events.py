@@ -25,5 +25,7 @@ def handle_close_event(main_window, event):
             event.ignore()
             return
     
+    from .main_window_actions import stop_change_journal
+    stop_change_journal(main_window)
     event.accept()
     print("👋 Application closed")
\ No newline at end of file
@@ -42,6 +42,8 @@ def create_docks(main_window):
     create_cad_tools_dock(main_window)
     create_properties_dock(main_window)
     create_layer_controls_dock(main_window)
+    create_logic_analyzer_dock(main_window)
+    create_memory_viewer_dock(main_window)
 
 def create_component_palette_dock(main_window):
     """Create component palette dock - uses existing ui/component_palette.py"""
@@ -85,6 +87,13 @@ def create_properties_dock(main_window):
     
     main_window.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, prop_dock)
     main_window.properties_dock = prop_dock
+    
+    # Edit the selected canvas item; edits reach the component manager via the canvas
+    if main_window.canvas:
+        panel = main_window.properties_panel
+        main_window.canvas.component_selected.connect(panel.setObject)
+        panel.propertyChanged.connect(
+            lambda name, value: main_window.canvas.component_property_changed(panel.current_object, name, value))
     print("✅ Properties dock created")
 
 def create_layer_controls_dock(main_window):
@@ -101,6 +110,34 @@ def create_layer_controls_dock(main_window):
     main_window.layer_controls_dock = layer_dock
     print("✅ Layer controls dock created")
 
+def create_logic_analyzer_dock(main_window):
+    """Create logic analyzer dock - uses ui/logic_analyzer.py"""
+    from ui.logic_analyzer import LogicAnalyzerPanel
+    main_window.logic_analyzer = LogicAnalyzerPanel()
+    
+    analyzer_dock = QDockWidget("Logic Analyzer", main_window)
+    analyzer_dock.setWidget(main_window.logic_analyzer)
+    analyzer_dock.setMinimumHeight(150)
+    
+    main_window.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, analyzer_dock)
+    main_window.logic_analyzer_dock = analyzer_dock
+    analyzer_dock.hide()
+    print("✅ Logic analyzer dock created")
+
+def create_memory_viewer_dock(main_window):
+    """Create memory viewer dock - uses ui/memory_viewer.py"""
+    from ui.memory_viewer import MemoryViewerPanel
+    main_window.memory_viewer = MemoryViewerPanel()
+    
+    memory_dock = QDockWidget("Memory", main_window)
+    memory_dock.setWidget(main_window.memory_viewer)
+    memory_dock.setMinimumHeight(150)
+    
+    main_window.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, memory_dock)
+    main_window.memory_viewer_dock = memory_dock
+    memory_dock.hide()
+    print("✅ Memory viewer dock created")
+
 def create_menu_bar(main_window):
     """Create menu bar - uses existing ui/menu_bar.py"""
     from ui.menu_bar import RetroEmulatorMenuBar
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+X-Seti - October18 2026 - Memory Viewer Panel
+Virtualized hex view/editor over live component memory
+"""
+#this belongs in ui/memory_viewer.py
+
+import string
+from typing import Dict, List, Any, Optional
+
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
+                           QLineEdit, QTableView, QHeaderView, QAbstractItemView,
+                           QCheckBox, QPushButton, QFileDialog)
+from PyQt6.QtCore import Qt, QTimer, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QColor, QFont
+
+from core.memory import MemoryBlock, get_component_memory, PAGE_SIZE, PAGE_SHIFT
+
+BYTES_PER_ROW = 16
+PRINTABLE = set(string.printable) - set('\t\n\r\x0b\x0c')
+
+class MemoryTableModel(QAbstractTableModel):
+    """Hex rows over a MemoryBlock - cells are read on demand, so only visible rows cost anything
+
+    Changes are found by asking the block which pages were written since the last
+    refresh; only those pages are compared against a shadow copy of what was shown.
+    """
+
+    HIGHLIGHT_REFRESHES = 5  # how long a changed byte stays highlighted
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.memory: Optional[MemoryBlock] = None
+        self.base_address = 0
+        self._checkpoint = 0
+        self._shadow: Dict[int, bytes] = {}  # page -> contents at last refresh
+        self._changed: Dict[int, int] = {}  # address -> refreshes left highlighted
+        self.highlight_color = QColor(140, 60, 40)
+        self.profiler = None  # ExecutionProfiler for the heatmap overlay
+        self.show_heatmap = False
+        self._max_count = 0
+
+    def set_memory(self, memory: Optional[MemoryBlock], base_address: int = 0):
+        self.beginResetModel()
+        self.memory = memory
+        self.base_address = base_address
+        self._shadow.clear()
+        self._changed.clear()
+        self._checkpoint = memory.checkpoint() if memory else 0
+        self.endResetModel()
+
+    # === Qt model interface ===
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid() or self.memory is None:
+            return 0
+        return (len(self.memory) + BYTES_PER_ROW - 1) // BYTES_PER_ROW
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else BYTES_PER_ROW + 1
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return f"{section:X}" if section < BYTES_PER_ROW else "ASCII"
+        return f"{self.base_address + section * BYTES_PER_ROW:04X}"
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or self.memory is None:
+            return None
+        row, column = index.row(), index.column()
+        address = row * BYTES_PER_ROW + column
+
+        if column == BYTES_PER_ROW:
+            if role == Qt.ItemDataRole.DisplayRole:
+                chunk = self.memory.read_block(row * BYTES_PER_ROW, BYTES_PER_ROW)
+                return ''.join(chr(b) if chr(b) in PRINTABLE else '.' for b in chunk)
+            return None
+
+        if address >= len(self.memory):
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return f"{self.memory.data[address]:02X}"
+        if role == Qt.ItemDataRole.BackgroundRole:
+            if address in self._changed:
+                return self.highlight_color
+            if self.show_heatmap and self.profiler:
+                heat = self.profiler.heat(self.base_address + address, self._max_count)
+                if heat:
+                    return QColor(int(40 + 200 * heat), int(40 + 80 * (1 - heat)), 40)
+            return None
+        if role == Qt.ItemDataRole.ToolTipRole:
+            tip = f"{self.base_address + address:04X}: {self.memory.data[address]}"
+            if self.profiler and 0 <= self.base_address + address < self.profiler.address_space:
+                cpu_address = self.base_address + address
+                tip += (f"\n{self.profiler.symbolize(cpu_address)}  executed {self.profiler.counts[cpu_address]}"
+                        f"  cycles {self.profiler.cycles[cpu_address]}")
+            return tip
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and index.column() < BYTES_PER_ROW:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        """Hex edit of one byte - writes straight into the live memory"""
+        if role != Qt.ItemDataRole.EditRole or self.memory is None:
+            return False
+        try:
+            byte = int(str(value).strip(), 16)
+        except ValueError:
+            return False
+        if not 0 <= byte <= 0xFF:
+            return False
+        address = index.row() * BYTES_PER_ROW + index.column()
+        if address >= len(self.memory):
+            return False
+        self.memory[address] = byte
+        self._emit_row(index.row())
+        return True
+
+    # === Heatmap ===
+
+    def set_heatmap(self, profiler, enabled: bool):
+        self.profiler = profiler
+        self.show_heatmap = enabled and profiler is not None
+        self._max_count = profiler.max_count if self.show_heatmap else 0
+        if self.memory is not None:
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, BYTES_PER_ROW))
+
+    # === Change tracking ===
+
+    def refresh(self, first_row: int, last_row: int):
+        """Update highlights for the visible rows and repaint the ones that changed"""
+        if self.memory is None:
+            return
+        memory = self.memory
+        dirty_rows = set()
+
+        if self.show_heatmap and self.profiler:
+            # Heat shifts everywhere as counts grow - repaint all visible rows
+            self._max_count = self.profiler.max_count
+            dirty_rows.update(range(first_row, last_row + 1))
+
+        # Age out old highlights
+        for address in list(self._changed):
+            self._changed[address] -= 1
+            dirty_rows.add(address // BYTES_PER_ROW)
+            if self._changed[address] <= 0:
+                del self._changed[address]
+
+        first_page = (first_row * BYTES_PER_ROW) >> PAGE_SHIFT
+        last_page = (last_row * BYTES_PER_ROW + BYTES_PER_ROW - 1) >> PAGE_SHIFT
+        for page in memory.dirty_pages(self._checkpoint, first_page, last_page):
+            start = page << PAGE_SHIFT
+            current = bytes(memory.read_block(start, PAGE_SIZE))
+            previous = self._shadow.get(page)
+            if previous is None:
+                changed = range(start, start + len(current))
+            else:
+                changed = [start + i for i, (a, b) in enumerate(zip(previous, current)) if a != b]
+            for address in changed:
+                self._changed[address] = self.HIGHLIGHT_REFRESHES
+                dirty_rows.add(address // BYTES_PER_ROW)
+            self._shadow[page] = current
+
+        # Seed shadows for visible pages so the next write is highlighted byte-exactly
+        for page in range(first_page, min(last_page, memory.page_count - 1) + 1):
+            if page not in self._shadow:
+                self._shadow[page] = bytes(memory.read_block(page << PAGE_SHIFT, PAGE_SIZE))
+
+        self._checkpoint = memory.checkpoint()
+        for row in sorted(dirty_rows):
+            self._emit_row(row)
+
+    def _emit_row(self, row: int):
+        self.dataChanged.emit(self.index(row, 0), self.index(row, BYTES_PER_ROW))
+
+class MemoryViewerPanel(QWidget):
+    """Component selector, goto field and hex table - refreshed at a capped rate while running"""
+
+    MAX_REFRESH_HZ = 10
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.simulation_engine = None
+        self.component_manager = None
+        self._create_ui()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(int(1000 / self.MAX_REFRESH_HZ))
+        self.refresh_timer.timeout.connect(self.refresh)
+
+        print("✓ Memory Viewer panel created")
+
+    def _create_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+
+        toolbar = QHBoxLayout()
+        self.component_combo = QComboBox()
+        self.component_combo.setMinimumWidth(160)
+        self.component_combo.currentIndexChanged.connect(self._on_component_selected)
+        toolbar.addWidget(self.component_combo)
+
+        toolbar.addWidget(QLabel("Go to:"))
+        self.goto_edit = QLineEdit()
+        self.goto_edit.setPlaceholderText("hex address")
+        self.goto_edit.setMaximumWidth(100)
+        self.goto_edit.returnPressed.connect(lambda: self.goto_address(self.goto_edit.text()))
+        toolbar.addWidget(self.goto_edit)
+        toolbar.addStretch()
+
+        self.heatmap_check = QCheckBox("Heatmap")
+        self.heatmap_check.setToolTip("Colour addresses by how often the CPU executed them")
+        self.heatmap_check.setEnabled(False)
+        self.heatmap_check.toggled.connect(self._on_heatmap_toggled)
+        toolbar.addWidget(self.heatmap_check)
+
+        self.export_btn = QPushButton("Export Profile")
+        self.export_btn.setEnabled(False)
+        self.export_btn.clicked.connect(self.export_profile)
+        toolbar.addWidget(self.export_btn)
+
+        self.info_label = QLabel("No memory")
+        self.info_label.setStyleSheet("color: #888;")
+        toolbar.addWidget(self.info_label)
+        layout.addLayout(toolbar)
+
+        self.model = MemoryTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setFont(QFont("monospace", 9))
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.DoubleClicked |
+                                   QAbstractItemView.EditTrigger.EditKeyPressed)
+
+        # Fixed row/column sizes keep scrolling O(visible rows) for multi-megabyte spaces
+        vertical = self.table.verticalHeader()
+        vertical.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical.setDefaultSectionSize(18)
+        horizontal = self.table.horizontalHeader()
+        horizontal.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        horizontal.setDefaultSectionSize(26)
+        horizontal.setStretchLastSection(True)
+
+        self.table.verticalScrollBar().valueChanged.connect(lambda _: self.refresh())
+        layout.addWidget(self.table)
+
+    # === Engine connection ===
+
+    def set_simulation_engine(self, engine):
+        self.simulation_engine = engine
+        self.component_manager = getattr(engine, 'component_manager', None)
+        self.refresh_component_list()
+        if hasattr(engine, 'stateChanged'):
+            engine.stateChanged.connect(self._on_state_changed)
+        if hasattr(engine, 'add_event_handler'):
+            engine.add_event_handler('profiler_changed', self._on_profiler_changed)
+        self._on_profiler_changed(getattr(engine, 'profiler', None))
+
+    def refresh_component_list(self):
+        """List components that have memory"""
+        self.component_combo.blockSignals(True)
+        self.component_combo.clear()
+        if self.component_manager:
+            for component_id, component in self.component_manager.components.items():
+                if hasattr(component, 'get_memory') or hasattr(component, 'memory'):
+                    self.component_combo.addItem(getattr(component, 'name', component_id), component_id)
+        self.component_combo.blockSignals(False)
+        self._on_component_selected(self.component_combo.currentIndex())
+
+    def set_memory(self, memory: Optional[MemoryBlock], base_address: int = 0):
+        """Show a memory block directly"""
+        self.model.set_memory(memory, base_address)
+        if memory is None:
+            self.info_label.setText("No memory")
+        else:
+            kind = "ROM" if memory.read_only else "RAM"
+            self.info_label.setText(f"{memory.name or kind}: {len(memory)} bytes ({kind})")
+        self.refresh()
+
+    def _on_component_selected(self, index: int):
+        if index < 0 or not self.component_manager:
+            self.set_memory(None)
+            return
+        component = self.component_manager.get_component(self.component_combo.itemData(index))
+        self.set_memory(get_component_memory(component))
+
+    def goto_address(self, text: str):
+        try:
+            address = int(text.strip().lower().replace('0x', '').replace('$', ''), 16)
+        except ValueError:
+            return
+        address -= self.model.base_address
+        if self.model.memory is None or not 0 <= address < len(self.model.memory):
+            return
+        index = self.model.index(address // BYTES_PER_ROW, address % BYTES_PER_ROW)
+        self.table.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtTop)
+        self.table.setCurrentIndex(index)
+
+    # === Profiler ===
+
+    def _on_profiler_changed(self, profiler):
+        self.heatmap_check.setEnabled(profiler is not None)
+        self.export_btn.setEnabled(profiler is not None)
+        self.model.set_heatmap(profiler, self.heatmap_check.isChecked())
+
+    def _on_heatmap_toggled(self, checked: bool):
+        profiler = getattr(self.simulation_engine, 'profiler', None)
+        self.model.set_heatmap(profiler, checked)
+
+    def export_profile(self):
+        """Save the execution profile as CSV"""
+        profiler = getattr(self.simulation_engine, 'profiler', None)
+        if profiler is None:
+            return
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Profile", "profile.csv", "CSV Files (*.csv)")
+        if file_path:
+            profiler.export_csv(file_path)
+
+    # === Refresh ===
+
+    def _on_state_changed(self, state: str):
+        if state == "running":
+            self.refresh_timer.start()
+        else:
+            self.refresh_timer.stop()
+            self.refresh()
+
+    def refresh(self):
+        """Highlight changes in the rows currently on screen"""
+        if self.model.memory is None:
+            return
+        viewport = self.table.viewport()
+        first_row = max(0, self.table.rowAt(0))
+        last_row = self.table.rowAt(viewport.height() - 1)
+        if last_row < 0:
+            last_row = self.model.rowCount() - 1
+        self.model.refresh(first_row, last_row)
+
+# Export
+__all__ = ['MemoryViewerPanel', 'MemoryTableModel']
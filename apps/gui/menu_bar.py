@@ -60,6 +60,8 @@ class MenuBarSignals(QObject):
     pauseSimulation = pyqtSignal()
     stepSimulation = pyqtSignal()
     resetSimulation = pyqtSignal()
+    toggleWarpMode = pyqtSignal(bool)
+    toggleProfiler = pyqtSignal(bool)
     simulationSettings = pyqtSignal()
     
     # Tools menu
@@ -148,6 +150,12 @@ class RetroEmulatorMenuBar(QMenuBar):
         
         # Connect simulation signals if available
         if hasattr(self, 'signals') and simulation_engine:
+            if hasattr(simulation_engine, 'set_warp_mode'):
+                self.signals.toggleWarpMode.connect(simulation_engine.set_warp_mode)
+            if hasattr(simulation_engine, 'enable_profiler'):
+                self.signals.toggleProfiler.connect(
+                    lambda enabled: simulation_engine.enable_profiler() if enabled
+                    else simulation_engine.disable_profiler())
             try:
                 self.signals.startSimulation.connect(simulation_engine.start)
                 self.signals.stopSimulation.connect(simulation_engine.stop)
@@ -500,6 +508,19 @@ class RetroEmulatorMenuBar(QMenuBar):
         reset_action.triggered.connect(self.signals.resetSimulation.emit)
         sim_menu.addAction(reset_action)
         
+        warp_action = QAction('&Warp Mode', self)
+        warp_action.setShortcut(QKeySequence('F9'))
+        warp_action.setCheckable(True)
+        warp_action.setStatusTip('Run as fast as possible, skipping frames and muting audio')
+        warp_action.triggered.connect(self.signals.toggleWarpMode.emit)
+        sim_menu.addAction(warp_action)
+        
+        profile_action = QAction('&Profile Execution', self)
+        profile_action.setCheckable(True)
+        profile_action.setStatusTip('Count executed instructions per address for the memory heatmap')
+        profile_action.triggered.connect(self.signals.toggleProfiler.emit)
+        sim_menu.addAction(profile_action)
+        
         sim_menu.addSeparator()
         
         # Simulation settings
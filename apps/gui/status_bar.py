@@ -224,6 +224,12 @@ class RetroEmulatorStatusBar(QStatusBar):
         self.clock_speed_label = QLabel("")
         section.addWidget(self.clock_speed_label)
         
+        # Achieved speed relative to real time
+        self.speed_label = QLabel("")
+        self.speed_label.setMinimumWidth(50)
+        self.speed_label.setToolTip("Emulation speed relative to real time")
+        section.addWidget(self.speed_label)
+        
         self.addWidget(section)
         
     def _create_system_section(self):
@@ -345,6 +351,7 @@ class RetroEmulatorStatusBar(QStatusBar):
             self.sim_status_label.setToolTip("Simulation Status: Stopped")
             self.sim_info_label.setText("Stopped")
             self.clock_speed_label.setText("")
+            self.speed_label.setText("")
             
         if info:
             self.sim_info_label.setText(info)
@@ -353,6 +360,21 @@ class RetroEmulatorStatusBar(QStatusBar):
         """Set simulation clock speed"""
         self.clock_speed_label.setText(speed)
         
+    def set_speed_multiple(self, multiple: float, warp: bool = False):
+        """Set achieved emulation speed (1.0 = real time)"""
+        text = f"×{multiple:.1f}" if multiple < 10 else f"×{multiple:.0f}"
+        if warp:
+            self.speed_label.setText(f"⏩ {text}")
+            self.speed_label.setStyleSheet("color: #d08000; font-weight: bold;")
+        else:
+            self.speed_label.setText(text)
+            self.speed_label.setStyleSheet("")
+            
+    def update_simulation_statistics(self, stats: Dict[str, Any]):
+        """Update simulation section from SimulationEngine statistics"""
+        if stats.get('state') == 'running':
+            self.set_speed_multiple(stats.get('speed_multiple', 1.0), stats.get('warp_mode', False))
+        
     def show_progress(self, operation: str, maximum: int = 100):
         """Show progress bar for operation"""
         self.current_operation = operation
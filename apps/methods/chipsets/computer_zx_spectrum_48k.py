@@ -262,6 +262,13 @@ def add_zx_spectrum_48k_system(generator):
             'colors': '8 colors (3-bit)',
             'attributes': '8x8 character cells',
             'border': 'Programmable color'
+        },
+        'tape': {
+            'formats': ['TAP', 'TZX'],
+            'ear_input': 'Port 0xFE bit 6',
+            'mic_output': 'Port 0xFE bit 3',
+            'ld_bytes_trap': 0x0556,  # ROM LD-BYTES - used by core/tape.py fast loading
+            'default_mode': 'fast'    # 'fast' (ROM trap) or 'pulse' (edge-accurate)
         }
     }
     